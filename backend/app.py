@@ -1,158 +1,792 @@
-import easyocr
 import time
 import os
 import cv2
-import re
+import numpy as np
 import requests
 import json
 import base64
 from symspellpy.symspellpy import SymSpell, Verbosity 
-from typing import List, Optional, Tuple
-from flask import Flask, jsonify, request, Response
+from typing import TYPE_CHECKING, List, Optional, Tuple
+from flask import Flask, abort, g, jsonify, make_response, request, Response
 from flask_cors import CORS 
+from flask_sock import Sock
+from simple_websocket import ConnectionClosed
+import queue
 import threading 
+from concurrent.futures import Future, TimeoutError as FutureTimeoutError
+from scene_change import OcrScheduler, perceptual_hash
+from gemini_cache import GeminiCache
+from incremental_ocr import IncrementalOcr
+from gemini_client import GeminiClient
+from events import format_sse
+from batched_recognizer import BATCH_PRESETS, BatchedRecognizer
+from layout import analyze_layout
+from ocr_core import (
+    BATCH_SIZE,
+    DECODER_TYPE,
+    TARGET_WIDTH,
+    correct_and_segment_text,
+    initialize_ocr_reader,
+    initialize_sym_spell,
+    process_frame_for_ocr,
+    resize_for_ocr,
+    sort_results_by_location,
+    spell_stats,
+)
+from startup import ComponentLoader
+from metrics import FrameTracer, MetricsRegistry
+from sessions import FairOcrQueue, Session, parse_camera_sources
+from roi_ocr import RegionOcr, parse_region, pointed_result
+from frame_ring import read_only
+from text_tracker import TextTracker, locate
+from gemini_payload import PayloadShaper
+from tts import VOICE_PATTERN, AudioCache, EspeakEngine, SpeechRenderer
+
+if TYPE_CHECKING:
+    import easyocr
 
 
 
 # --- Gemini API Configuration ---
 API_KEY = "" 
-API_URL = f"https://generativelanguage.googleapis.com/v1beta/models/gemini-2.5-flash-preview-05-20:generateContent?key={API_KEY}"
+# GEMINI_API_URL points the client at a local stub server (see gemini_stub.py)
+API_URL = os.environ.get(
+    "GEMINI_API_URL",
+    f"https://generativelanguage.googleapis.com/v1beta/models/gemini-2.5-flash-preview-05-20:generateContent?key={API_KEY}",
+)
+
+# Upper bound on concurrent Gemini calls; also the keep-alive connection pool size
+GEMINI_MAX_CONCURRENCY = 4
+GEMINI_MAX_RETRIES = 3
+GEMINI_TIMEOUT = 20
+
+# Stands in for the image data in the payload until the base64 is spliced into the request body
+GEMINI_IMAGE_PLACEHOLDER = "<image>"
 
 RESPONSE_SCHEMA = {
     "type": "ARRAY",
     "items": { "type": "STRING" }
 }
 
-# --- EasyOCR Configuration ---
-LANGUAGE_LIST = ['en'] 
-USE_GPU = False  
-
-BATCH_SIZE = 1 
-DECODER_TYPE = 'greedy' 
+GEMINI_WORDS_PROMPT = (
+    "Analyze this image and extract all visible words. "
+    "Return the result as a strict JSON array of strings, "
+    "ordered left-to-right, line-by-line."
+)
+GEMINI_SENTENCE_PROMPT = (
+    "Analyze this image of written text and return logical groupings "
+    "of contextual sentences or headers. Return a JSON array of strings."
+)
+RESULT_PROMPTS = {"words": GEMINI_WORDS_PROMPT, "sentences": GEMINI_SENTENCE_PROMPT}
+
+# Seconds a /data request waits for a refresh triggered by a scene change
+RESULT_REFRESH_WAIT = 30.0
+# Upper bound on the ?wait= long-poll of /data/words and /data/sentences
+RESULT_MAX_LONG_POLL = 30.0
+
+# --- Commands (/data POST, /ws) ---
+# Commands waiting for the render loop before new ones are rejected with 429
+COMMAND_QUEUE_SIZE = 32
+
+# --- Event Streaming (/events SSE, /ws WebSocket) ---
+# Events buffered per client before its oldest ones are dropped
+EVENT_QUEUE_SIZE = 64
+# Seconds between keep-alives on an idle event stream
+EVENT_KEEPALIVE_INTERVAL = 15.0
+
+# --- Server-side Speech (/speech) ---
+# Optional: needs espeak-ng or espeak on the PATH (or TTS_ENGINE_BINARY); the browser's own
+# speech synthesis stays the default
+TTS_ENGINE_BINARY = os.environ.get("TTS_ENGINE_BINARY") or None
+TTS_DEFAULT_VOICE = "en-us"
+# Words per minute, and the range accepted from ?rate=
+TTS_DEFAULT_RATE = 175
+TTS_RATE_RANGE = (80, 450)
+# Phrases rendered in parallel; each is one engine process
+TTS_WORKERS = 2
+# Rendered phrase audio kept across requests (LRU by PCM bytes)
+TTS_CACHE_BYTES = 32_000_000
+# Silence between phrases, in seconds
+TTS_PHRASE_PAUSE = 0.15
+
+# --- MJPEG Feed ---
+MJPEG_DEFAULT_QUALITY = 80
+# Floor for ?quality= and for adaptive clients that keep dropping frames
+MJPEG_MIN_QUALITY = 30
+
+# --- Gemini Upload Shaping ---
+# Text prompts upload the greyscale frame, scaled to about GEMINI_TEXT_HEIGHT px per line of the
+# locally detected text, at the best JPEG quality within GEMINI_TEXT_BYTE_BUDGET. Only a frame
+# that cannot fit is cropped to the detected text, padded by a couple of line heights
+GEMINI_TEXT_BYTE_BUDGET = 60_000
+GEMINI_TEXT_HEIGHT = 28
+# When cropping, blank everything outside the padded text boxes too; off, since Gemini is the fallback for text EasyOCR missed
+GEMINI_MASK_NON_TEXT = False
+# Scene descriptions ('v') need the whole frame in colour
+GEMINI_SCENE_BYTE_BUDGET = 150_000
+GEMINI_MAX_SIDE = 1600
+GEMINI_JPEG_QUALITY_RANGE = (40, 90)
+
+# --- Gemini Result Cache ---
+# Near-duplicate frames (perceptual hash within GEMINI_CACHE_MAX_DISTANCE bits)
+# with the same prompt reuse the previous answer instead of calling the API
+GEMINI_CACHE_SIZE = 64
+GEMINI_CACHE_TTL = 300.0
+GEMINI_CACHE_MAX_DISTANCE = 10
+GEMINI_CACHE_HASH_SIZE = 16
 
-# How many frames to skip between EasyOCR runs 
-SKIP_FRAMES = 30  
-TARGET_WIDTH = 700 
+# --- EasyOCR Configuration ---
+# Languages, GPU, BATCH_SIZE, DECODER_TYPE and TARGET_WIDTH live in ocr_core.py, shared with offline_ocr.py
+
+# Batched OCR across frames: "latency" runs plain readtext per frame, "balanced" and
+# "throughput" share detection (and, on GPU, recognition) between frames submitted together
+# (see BATCH_PRESETS). It needs INCREMENTAL_OCR off and OCR_WORKERS > 1 to ever see more than
+# one frame at a time, and is not created otherwise
+OCR_BATCH_MODE = os.environ.get("OCR_BATCH_MODE", "latency")
+# Override the preset's frames per batch / seconds to wait for a batch to fill (None keeps it)
+OCR_BATCH_MAX_FRAMES = None
+OCR_BATCH_MAX_WAIT = None
+
+# Incremental mode re-recognizes only boxes whose pixels changed since the last pass
+INCREMENTAL_OCR = True
+INCREMENTAL_IOU_THRESHOLD = 0.6
+INCREMENTAL_CHANGE_THRESHOLD = 8.0
+# Re-recognize every box on every Nth pass
+INCREMENTAL_FULL_REFRESH_EVERY = 10
+
+# --- Text Tracking (fusion across OCR passes) ---
+# Boxes overlapping a tracked line by this IoU are readings of the same line
+TRACK_IOU_THRESHOLD = 0.4
+# Weight left on older readings each pass; lower lets changed text win sooner
+TRACK_VOTE_DECAY = 0.6
+# New text this confident is spoken at once; anything else waits for TRACK_CONFIRM_HITS readings,
+# on a new page too
+TRACK_EARLY_CONFIDENCE = 0.8
+TRACK_CONFIRM_HITS = 2
+# Passes a line may go unseen (blur, a hand in the way) before it is dropped
+TRACK_MAX_MISSED = 2
+
+# --- OCR Scheduling (scene-change driven) ---
+# EasyOCR runs when the page settles after its content changed, never more often
+# than OCR_MIN_INTERVAL and at least every OCR_MAX_INTERVAL seconds (None disables)
+OCR_MIN_INTERVAL = 0.5
+OCR_MAX_INTERVAL = 10.0
+# Mean grey-level difference (0-255) of the thumbnail vs. the last OCR'd frame
+CHANGE_THRESHOLD = 6.0
+# Frame-to-frame difference above which the scene counts as moving
+MOTION_THRESHOLD = 3.0
+# Consecutive still frames required before OCR fires on a changed scene
+SETTLE_FRAMES = 3
+CHANGE_THUMB_WIDTH = 64
+
+# --- Pointer OCR (/data/roi) ---
+# Window of the full-resolution frame read around a fingertip, in pixels
+ROI_WINDOW_WIDTH = 640
+ROI_WINDOW_HEIGHT = 240
+# Share of the window above the fingertip, which usually sits just below the line it points at
+ROI_ABOVE_FRACTION = 0.7
+
+# --- Pipeline Configuration ---
+# Each stage hands frames to the next through a latest-wins queue of this size
+PIPELINE_QUEUE_SIZE = 1
+# Seconds between pipeline fps / queue depth reports on the console
+PIPELINE_STATS_INTERVAL = 5.0
+# Pooled camera frames per session. Each frame is held by the queues, the latest capture,
+# the render loop and in-flight Gemini/pointer requests; past this, frames are allocated
+FRAME_RING_SLOTS = 10
+
+# --- Metrics and Tracing (/metrics, /trace) ---
+# Recent samples per histogram behind the p50/p95/p99 gauges
+METRICS_QUANTILE_WINDOW = 1024
+# TRACE_FRAMES=1 records per-frame stage spans for the last TRACE_MAX_FRAMES frames
+TRACE_ENABLED = os.environ.get("TRACE_FRAMES") == "1"
+TRACE_MAX_FRAMES = 300
+# When set (and tracing is on), the trace is also written here on shutdown
+TRACE_DUMP_PATH = os.environ.get("TRACE_DUMP_PATH", "")
 
 # OpenCV configuration
 CAMERA_INDEX = 1
 WINDOW_NAME = "Scanner change title later"
 
-# --- SymSpell Dictionary Content (FALLBACK ONLY) ---
-DICTIONARY_CONTENT = """\
-the 10000000000
-of 1000000000
-and 100000000
-to 100000000
-a 100000000
-in 100000000
-is 10000000
-my 5000000
-name 4000000
-hello 3000000
-world 2000000
-arthur 1000000
-"""
+# --- Sessions (one per reading station) ---
+# SIGHTSPEECH_CAMERAS="desk=0,door=rtsp://..." runs one named session per capture source;
+# unset, a single "default" session uses CAMERA_INDEX
+DEFAULT_SESSION = "default"
+CAMERA_SOURCES = parse_camera_sources(os.environ.get("SIGHTSPEECH_CAMERAS", ""), DEFAULT_SESSION, CAMERA_INDEX)
+# Threads taking frames from the sessions in turn; more than one only pays off with a
+# batching OCR_BATCH_MODE, where frames from several sessions then share a batch
+OCR_WORKERS = 1
 
 # ----------------------------------------------------
 # 2. FLASK APP AND DATA MANAGEMENT
 # ----------------------------------------------------
 app = Flask(__name__) 
 CORS(app) 
-data = "g" 
-
-# --- Global storage ---
-latest_words = []  # will hold the last Gemini array
-latest_frame = None
-frame_lock = threading.Lock()
-
-def gen_mjpeg():
-    global latest_frame
-    while True:
-        with frame_lock:
-            frame = None if latest_frame is None else latest_frame.copy()
-        if frame is None:
-            time.sleep(0.02)
-            continue
-        ok, jpeg = cv2.imencode('.jpg', frame)
-        if not ok:
-            continue
-        frame_bytes = jpeg.tobytes()
-        yield (b'--frame\r\n'
-               b'Content-Type: image/jpeg\r\n\r\n' + frame_bytes + b'\r\n')
-        time.sleep(0.03)  # throttle to ~30 fps (adjust as needed)
-
-@app.route('/video_feed')
-def video_feed():
-    return Response(gen_mjpeg(),
-                    mimetype='multipart/x-mixed-replace; boundary=frame')
-
-@app.route('/data/words', methods=['GET'])
-def get_data_words():
-    global latest_words
-    # Capture a frame from the camera here, or reuse last frame
-    ret, frame = cap.read()
-    if not ret:
-        return jsonify({"words": []})
-
-    GEMINI_STRUCTURED_PROMPT = (
-        "Analyze this image and extract all visible words. "
-        "Return the result as a strict JSON array of strings, "
-        "ordered left-to-right, line-by-line."
+sock = Sock(app)
+
+metrics = MetricsRegistry(
+    quantile_window=METRICS_QUANTILE_WINDOW,
+    tracer=FrameTracer(TRACE_MAX_FRAMES, enabled=TRACE_ENABLED),
+)
+metrics.describe("stage_seconds", "Latency of each pipeline stage.")
+metrics.describe("http_request_seconds", "Flask handler latency; for streaming responses, only until the response object is returned, not while the body streams.")
+metrics.describe("http_requests_total", "Flask requests by endpoint and status.")
+metrics.describe("gemini_calls_total", "Gemini API calls by outcome.")
+metrics.describe("gemini_payload_bytes", "JPEG bytes uploaded per Gemini call.",
+                 buckets=(4e3, 8e3, 16e3, 32e3, 64e3, 128e3, 256e3, 512e3, 1e6))
+
+# --- Shared by all sessions ---
+gemini_cache = GeminiCache(
+    max_entries=GEMINI_CACHE_SIZE,
+    ttl=GEMINI_CACHE_TTL,
+    max_distance=GEMINI_CACHE_MAX_DISTANCE,
+)
+
+gemini_client = GeminiClient(
+    API_URL,
+    max_concurrency=GEMINI_MAX_CONCURRENCY,
+    max_retries=GEMINI_MAX_RETRIES,
+    timeout=GEMINI_TIMEOUT,
+)
+
+# Set in __main__ when OCR_BATCH_MODE is not "latency"
+ocr_batcher = None
+text_payload_shaper = PayloadShaper(
+    byte_budget=GEMINI_TEXT_BYTE_BUDGET,
+    min_quality=GEMINI_JPEG_QUALITY_RANGE[0],
+    max_quality=GEMINI_JPEG_QUALITY_RANGE[1],
+    target_text_height=GEMINI_TEXT_HEIGHT,
+    max_side=GEMINI_MAX_SIDE,
+    mask=GEMINI_MASK_NON_TEXT,
+)
+scene_payload_shaper = PayloadShaper(
+    byte_budget=GEMINI_SCENE_BYTE_BUDGET,
+    min_quality=GEMINI_JPEG_QUALITY_RANGE[0],
+    max_quality=GEMINI_JPEG_QUALITY_RANGE[1],
+    max_side=GEMINI_MAX_SIDE,
+    grayscale=False,
+)
+
+speech_renderer = SpeechRenderer(
+    EspeakEngine(TTS_ENGINE_BINARY),
+    AudioCache(TTS_CACHE_BYTES),
+    workers=TTS_WORKERS,
+    pause=TTS_PHRASE_PAUSE,
+    on_render=lambda seconds: metrics.observe("stage_seconds", seconds, stage="tts"),
+)
+
+# Pointer requests run on the request thread and pause the full-frame OCR workers
+region_ocr = RegionOcr(batch_size=BATCH_SIZE, decoder=DECODER_TYPE)
+
+# OCR model and spell dictionary load in the background; /ready reports their state
+component_loader = ComponentLoader()
+
+def create_session(name: str, source) -> Session:
+    scheduler = OcrScheduler(
+        min_interval=OCR_MIN_INTERVAL,
+        max_interval=OCR_MAX_INTERVAL,
+        change_threshold=CHANGE_THRESHOLD,
+        motion_threshold=MOTION_THRESHOLD,
+        settle_frames=SETTLE_FRAMES,
+        thumb_width=CHANGE_THUMB_WIDTH,
     )
-    words = capture_and_send_to_gemini(frame, GEMINI_STRUCTURED_PROMPT, is_structured_output=True)
-    if words:
-        latest_words = words
-    return jsonify({"words": latest_words})
-
-
-@app.route('/data/sentences', methods=['GET'])
-def get_data_sentences():
-    global latest_words
-    # Capture a frame from the camera here, or reuse last frame
-    ret, frame = cap.read()
-    if not ret:
-        return jsonify({"words": []})
-
-    GEMINI_SENTENCE_PROMPT = (
-        "Analyze this image of written text and return logical groupings "
-        "of contextual sentences or headers. Return a JSON array of strings."
+    return Session(
+        name,
+        source,
+        queue_size=PIPELINE_QUEUE_SIZE,
+        scheduler=scheduler,
+        event_queue_size=EVENT_QUEUE_SIZE,
+        command_queue_size=COMMAND_QUEUE_SIZE,
+        mjpeg_quality=MJPEG_DEFAULT_QUALITY,
+        mjpeg_min_quality=MJPEG_MIN_QUALITY,
+        frame_slots=FRAME_RING_SLOTS,
+        on_encode=lambda seconds: metrics.observe("stage_seconds", seconds, stage="mjpeg_encode", session=name),
     )
-    sentences = capture_and_send_to_gemini(frame, GEMINI_SENTENCE_PROMPT, is_structured_output=True)
-    if sentences:
-        latest_words = sentences
-    return jsonify({"words": latest_words})
-
-@app.route('/data', methods=['POST'])
-def receive_data():
-    global data
-    
-    received_json = request.json
-    
-    if received_json and 'key' in received_json:
+
+# --- Per-session state: capture -> fair OCR queue -> shared OCR workers, capture -> render ---
+sessions = {name: create_session(name, source) for name, source in CAMERA_SOURCES.items()}
+ocr_work = FairOcrQueue()
+for _session in sessions.values():
+    ocr_work.add(_session)
+
+def get_session(name: Optional[str]) -> Session:
+    # Routes without a /sessions/<name> prefix address the first configured session
+    if name is None:
+        return next(iter(sessions.values()))
+    session = sessions.get(name)
+    if session is None:
+        abort(make_response(jsonify({"error": f"Unknown session '{name}'."}), 404))
+    return session
+
+@app.before_request
+def start_request_timer():
+    g.request_start = time.perf_counter()
+
+@app.after_request
+def record_request_metrics(response):
+    start = g.pop('request_start', None)
+    if start is not None:
+        endpoint = request.endpoint or "unmatched"
+        metrics.observe("http_request_seconds", time.perf_counter() - start, endpoint=endpoint)
+        metrics.inc("http_requests_total", endpoint=endpoint, status=response.status_code)
+    return response
+
+@app.route('/metrics', methods=['GET'])
+def get_metrics():
+    return Response(metrics.render(), mimetype='text/plain; version=0.0.4')
+
+@app.route('/trace', methods=['GET'])
+def get_trace():
+    # Chrome trace event JSON of recent frames; load it in chrome://tracing or ui.perfetto.dev
+    if not metrics.tracer.enabled:
+        return jsonify({"error": "Tracing is off. Start the server with TRACE_FRAMES=1."}), 404
+    return jsonify(metrics.tracer.chrome_trace())
+
+@app.route('/sessions', methods=['GET'])
+def list_sessions():
+    return jsonify({name: {"source": str(session.source), "ocr_version": session.ocr_results["version"]}
+                    for name, session in sessions.items()})
+
+@app.route('/video_feed', defaults={'session_name': None})
+@app.route('/sessions/<session_name>/video_feed')
+def video_feed(session_name):
+    # ?width=<px> downscales, ?quality=<MJPEG_MIN_QUALITY-95> or ?quality=auto adapts to the client's speed
+    mjpeg_broadcaster = get_session(session_name).mjpeg_broadcaster
+    quality = request.args.get('quality', '')
+    adaptive = quality == 'auto'
+    client = mjpeg_broadcaster.subscribe(
+        width=request.args.get('width', type=int),
+        quality=int(quality) if quality.isdigit() else None,
+        adaptive=adaptive,
+    )
+    return Response(mjpeg_broadcaster.stream(client),
+                    mimetype='multipart/x-mixed-replace; boundary=frame')
+
+@app.route('/pipeline/stats', methods=['GET'])
+def get_pipeline_stats():
+    return jsonify(pipeline_stats())
+
+def parse_client_version(kind: str) -> Optional[int]:
+    since = request.args.get('since', type=int)
+    if since is not None:
+        return since
+    etag = request.headers.get('If-None-Match', '').strip()
+    prefix = f'"{kind}-'
+    etag = etag[2:] if etag.startswith('W/') else etag
+    if etag.startswith(prefix) and etag.endswith('"'):
+        try:
+            return int(etag[len(prefix):-1])
+        except ValueError:
+            return None
+    return None
+
+def await_result_refresh(session: Session, kind: str) -> None:
+    # A refresh is only pending when the scene changed since the last result
+    pending = request_result_refresh(session, kind)
+    if pending is not None:
+        try:
+            pending.result(timeout=RESULT_REFRESH_WAIT)
+        except FutureTimeoutError:
+            pass
+
+def serve_result(session: Session, kind: str):
+    result_store = session.result_store
+    await_result_refresh(session, kind)
+
+    version, words = result_store.get(kind, [])
+    client_version = parse_client_version(kind)
+    if client_version is not None and client_version >= version:
+        wait_seconds = min(request.args.get('wait', default=0.0, type=float), RESULT_MAX_LONG_POLL)
+        if wait_seconds > 0:
+            version, words = result_store.wait(kind, client_version, wait_seconds, [])
+        if client_version >= version:
+            response = Response(status=304)
+            response.headers['ETag'] = f'"{kind}-{version}"'
+            return response
+
+    response = jsonify({"words": words, "version": version})
+    response.headers['ETag'] = f'"{kind}-{version}"'
+    return response
+
+@app.route('/ready', methods=['GET'])
+def get_ready():
+    # 200 once every component is loaded and warmed up, 503 until then
+    ready = component_loader.all_ready()
+    return jsonify({"ready": ready, "components": component_loader.snapshot()}), 200 if ready else 503
+
+
+@app.route('/data/words', methods=['GET'], defaults={'session_name': None})
+@app.route('/sessions/<session_name>/data/words', methods=['GET'])
+def get_data_words(session_name):
+    return serve_result(get_session(session_name), "words")
+
+
+@app.route('/data/sentences', methods=['GET'], defaults={'session_name': None})
+@app.route('/sessions/<session_name>/data/sentences', methods=['GET'])
+def get_data_sentences(session_name):
+    return serve_result(get_session(session_name), "sentences")
+
+def handle_command(session: Session, received_json) -> Tuple[dict, int]:
+    if isinstance(received_json, dict) and 'key' in received_json:
         command = received_json['key']
         if command in ['c', 'v', 'n', 'p']:
-            data = command 
-            print(f"Received and set global data to: '{data}'")
-            return jsonify({"status": "success", "data_received": data}), 200
+            # Queued rather than overwritten, so quick successive commands are all applied; a full
+            # queue means the render loop is not draining it, and dropping a move would misplace focus
+            try:
+                session.commands.put_nowait(command)
+            except queue.Full:
+                session.commands_rejected += 1
+                return {"status": "error", "message": "Too many pending commands."}, 429
+            print(f"[{session.name}] Received command: '{command}'")
+            session.event_hub.publish("ack", command=command, status="success")
+            return {"status": "success", "data_received": command}, 200
         else:
-             return jsonify({"status": "error", "message": f"Invalid command '{command}'. Expected 'c', 'v', 'n', or 'p'."}), 400
+             return {"status": "error", "message": f"Invalid command '{command}'. Expected 'c', 'v', 'n', or 'p'."}, 400
     else:
-        return jsonify({"status": "error", "message": "Invalid JSON format. Expected {'key': 'value'}"}), 400
+        return {"status": "error", "message": "Invalid JSON format. Expected {'key': 'value'}"}, 400
+
+@app.route('/data', methods=['POST'], defaults={'session_name': None})
+@app.route('/sessions/<session_name>/data', methods=['POST'])
+def receive_data(session_name):
+    body, status = handle_command(get_session(session_name), request.json)
+    return jsonify(body), status
+
+def read_region(session: Session, payload) -> Tuple[dict, int]:
+    # OCR of the window around a pointed-at spot, at full resolution and ahead of the full-frame pass
+    if not isinstance(payload, dict):
+        return {"status": "error", "message": "Expected a JSON object with 'x' and 'y' or 'roi'."}, 400
+    reader = component_loader.get("ocr_reader", timeout=0)
+    if reader is None:
+        return {"status": "error", "message": "The OCR model is not loaded yet."}, 503
+    with session.capture_lock:
+        snapshot = session.latest_capture
+    if snapshot is None:
+        return {"status": "error", "message": "No camera frame yet."}, 503
+    frame_index, frame, _ = snapshot
+    try:
+        region, point = parse_region(payload, frame.shape, ROI_WINDOW_WIDTH, ROI_WINDOW_HEIGHT, ROI_ABOVE_FRACTION)
+    except (TypeError, ValueError) as e:
+        return {"status": "error", "message": str(e)}, 400
+
+    frame_id = f"{session.name}#{frame_index}"
+    with region_ocr.priority():
+        with metrics.timed("roi_ocr", frame_id, session=session.name):
+            results, latency = region_ocr.read(reader, frame, region)
+    results = sort_results_by_location(results)
+    pointed = pointed_result(results, point)
+
+    text = [text for (bbox, text, conf) in results]
+    # Spelling is skipped rather than waited for while the dictionary is still loading
+    sym_spell = component_loader.get("sym_spell", timeout=0)
+    if sym_spell is not None:
+        with metrics.timed("roi_spell", frame_id, session=session.name):
+            phrases = correct_and_segment_text(text, sym_spell)
+            pointed_text = correct_and_segment_text([pointed[1]], sym_spell) if pointed is not None else []
+    else:
+        phrases = text
+        pointed_text = [pointed[1]] if pointed is not None else []
+
+    body = {
+        "frame_index": frame_index,
+        "region": list(region),
+        "phrases": phrases,
+        "text": pointed_text[0] if pointed_text else "",
+        "latency": round(latency, 4),
+    }
+    print(f"[{session.name}] Pointer OCR {region} in {latency:.3f}s: {body['text'] or '(None detected)'}")
+    session.event_hub.publish("roi", **body)
+    return {"status": "success", **body}, 200
+
+@app.route('/data/roi', methods=['POST'], defaults={'session_name': None})
+@app.route('/sessions/<session_name>/data/roi', methods=['POST'])
+def receive_region(session_name):
+    # {"x": 0.4, "y": 0.6} or {"roi": [x0, y0, x1, y1]}, normalized to the camera frame
+    body, status = read_region(get_session(session_name), request.get_json(silent=True))
+    return jsonify(body), status
+
+def speech_phrases(session: Session, source: str) -> Optional[List[str]]:
+    # The text /speech reads: a Gemini result or the session's corrected OCR phrases; None if unknown
+    if source in RESULT_PROMPTS:
+        await_result_refresh(session, source)
+        return session.result_store.get(source, [])[1]
+    if source == "ocr":
+        with session.ocr_lock:
+            return list(session.ocr_results["corrected"])
+    return None
+
+@app.route('/speech', methods=['GET'], defaults={'session_name': None})
+@app.route('/sessions/<session_name>/speech', methods=['GET'])
+def stream_speech(session_name):
+    # One WAV stream, phrase by phrase: ?source=words|sentences|ocr or ?text=... (repeatable),
+    # ?start=<phrase index>, ?voice=<espeak voice>, ?rate=<words per minute>
+    session = get_session(session_name)
+    if not speech_renderer.engine.available():
+        return jsonify({"error": "Server-side speech needs espeak-ng or espeak installed."}), 503
+
+    voice = request.args.get('voice', TTS_DEFAULT_VOICE)
+    if not VOICE_PATTERN.match(voice):
+        return jsonify({"error": f"Invalid voice '{voice}'."}), 400
+    rate = min(max(request.args.get('rate', default=TTS_DEFAULT_RATE, type=int), TTS_RATE_RANGE[0]), TTS_RATE_RANGE[1])
+
+    phrases = request.args.getlist('text')
+    if not phrases:
+        source = request.args.get('source', 'words')
+        phrases = speech_phrases(session, source)
+        if phrases is None:
+            return jsonify({"error": f"Invalid source '{source}'. Expected 'words', 'sentences' or 'ocr'."}), 400
+    phrases = phrases[max(0, request.args.get('start', default=0, type=int)):]
+    if not any(phrase.strip() for phrase in phrases):
+        return Response(status=204)
+
+    requested = time.perf_counter()
+    # Waits for the first phrase to render, so a failing engine is an error rather than an empty WAV
+    chunks = speech_renderer.stream(phrases, voice, rate)
+    if chunks is None:
+        return jsonify({"error": "Speech synthesis failed for every phrase."}), 500
+    metrics.observe("stage_seconds", time.perf_counter() - requested, stage="tts_first_audio")
+
+    return Response(chunks, mimetype='audio/wav',
+                    headers={'Cache-Control': 'no-cache', 'X-Phrase-Count': str(len(phrases))})
+
+def current_state_events(session: Session) -> List[dict]:
+    events = []
+    for kind in RESULT_PROMPTS:
+        payload = result_payload(session, kind)
+        if payload["version"]:
+            events.append({"type": "result", **payload})
+    with session.ocr_lock:
+        snapshot = session.ocr_results
+    if snapshot["version"]:
+        events.append({"type": "ocr", "version": snapshot["version"], "phrases": snapshot["corrected"]})
+    return events
+
+@app.route('/events', methods=['GET'], defaults={'session_name': None})
+@app.route('/sessions/<session_name>/events', methods=['GET'])
+def stream_events(session_name):
+    session = get_session(session_name)
+    event_hub = session.event_hub
+    subscriber = event_hub.subscribe()
+    for event in current_state_events(session):
+        subscriber.put(event)
+
+    def generate():
+        try:
+            while True:
+                yield format_sse(subscriber.get(timeout=EVENT_KEEPALIVE_INTERVAL))
+        finally:
+            event_hub.unsubscribe(subscriber)
+
+    return Response(generate(), mimetype='text/event-stream',
+                    headers={'Cache-Control': 'no-cache', 'X-Accel-Buffering': 'no'})
+
+@sock.route('/ws')
+def events_socket(ws):
+    serve_socket(ws, get_session(None))
+
+@sock.route('/sessions/<session_name>/ws')
+def session_events_socket(ws, session_name):
+    session = sessions.get(session_name)
+    if session is None:
+        ws.send(json.dumps({"type": "error", "message": f"Unknown session '{session_name}'."}))
+        return
+    serve_socket(ws, session)
+
+def serve_socket(ws, session: Session) -> None:
+    # Same events as /events, plus commands and refresh requests from the client
+    event_hub = session.event_hub
+    subscriber = event_hub.subscribe()
+    for event in current_state_events(session):
+        subscriber.put(event)
+
+    def pump():
+        while True:
+            event = subscriber.get(timeout=EVENT_KEEPALIVE_INTERVAL)
+            if event is None:
+                if not ws.connected:
+                    return
+                continue
+            try:
+                ws.send(json.dumps(event))
+            except Exception:
+                return
+
+    sender = threading.Thread(target=pump, daemon=True)
+    sender.start()
+    try:
+        while True:
+            try:
+                message = json.loads(ws.receive())
+            except json.JSONDecodeError:
+                subscriber.put({"type": "error", "message": "Invalid JSON message."})
+                continue
+            if not isinstance(message, dict):
+                subscriber.put({"type": "error", "message": "Expected a JSON object message."})
+                continue
+
+            if message.get("type") == "command":
+                body, status = handle_command(session, message)
+                if status != 200:
+                    subscriber.put({"type": "ack", "command": message.get("key"), **body})
+            elif message.get("type") == "roi":
+                # The result arrives as a "roi" event like for every other subscriber
+                body, status = read_region(session, message)
+                if status != 200:
+                    subscriber.put({"type": "roi", **body})
+            elif message.get("type") == "refresh" and message.get("kind") in RESULT_PROMPTS:
+                kind = message["kind"]
+                def reply(*_):
+                    subscriber.put({"type": "result", **result_payload(session, kind)})
+                pending = request_result_refresh(session, kind)
+                if pending is None:
+                    reply()
+                else:
+                    pending.add_done_callback(reply)
+            else:
+                subscriber.put({"type": "error", "message": "Expected a 'command', 'roi' or 'refresh' message."})
+    except ConnectionClosed:
+        pass
+    except Exception as e:
+        print(f"[{session.name}] WebSocket handler failed: {type(e).__name__}: {e}")
+    finally:
+        event_hub.unsubscribe(subscriber)
+
+def pipeline_stats() -> dict:
+    return {
+        "sessions": {name: session.snapshot() for name, session in sessions.items()},
+        "ocr_work": ocr_work.snapshot(),
+        "gemini_cache": gemini_cache.snapshot(),
+        "gemini_client": gemini_client.snapshot(),
+        "ocr_batcher": ocr_batcher.snapshot() if ocr_batcher is not None else None,
+        "spell": spell_stats(),
+        "region_ocr": region_ocr.snapshot(),
+        "gemini_payload": {"text": text_payload_shaper.snapshot(), "scene": scene_payload_shaper.snapshot()},
+        "tts": speech_renderer.snapshot(),
+    }
+
+metrics.add_collector(
+    pipeline_stats,
+    labels={"sessions": "session", "ocr_work_served": "session", "gemini_payload": "payload"},
+    counters=[
+        *(f"sessions_{stage}_{field}" for stage in ("capture", "ocr", "render") for field in ("count", "dropped")),
+        *(f"sessions_{ring}_{field}" for ring in ("frames", "display_frames")
+          for field in ("allocated", "reused", "exhausted")),
+        "sessions_scheduler_checked", "sessions_scheduler_fired", "sessions_events_published",
+        "sessions_mjpeg_encoded", "sessions_rejected_commands",
+        "sessions_tracker_passes", "sessions_tracker_scenes", "sessions_tracker_emitted_early",
+        "sessions_tracker_refined", "sessions_tracker_dropped", "ocr_work_served",
+        "gemini_cache_hits", "gemini_cache_misses", "gemini_cache_evictions",
+        "gemini_client_submitted", "gemini_client_coalesced", "gemini_client_retries",
+        "ocr_batcher_batches", "ocr_batcher_frames",
+        "spell_phrases", "spell_hits", "spell_misses", "spell_deduped", "spell_dictionary_hits",
+        "region_ocr_requests", "gemini_payload_calls", "gemini_payload_text_region_calls",
+        "tts_rendered", "tts_failed", "tts_cache_hits", "tts_cache_misses", "tts_cache_evictions",
+    ],
+)
+metrics.add_collector(lambda: {"component_ready": {
+    name: component["state"] == "ready" for name, component in component_loader.snapshot().items()
+}}, labels={"component_ready": "component"})
+
+def format_pipeline_stats(stats: dict) -> str:
+    lines = []
+    for session_name, session_stats in stats["sessions"].items():
+        parts = []
+        for name, stage in session_stats.items():
+            if not isinstance(stage, dict) or "fps" not in stage:
+                continue
+            part = f"{name} {stage['fps']:.1f} fps"
+            if "queue_depth" in stage:
+                part += f" (q={stage['queue_depth']}, dropped={stage['dropped']})"
+            parts.append(part)
+        prefix = f"[Pipeline {session_name}] " if len(stats["sessions"]) > 1 else "[Pipeline] "
+        lines.append(prefix + " | ".join(parts))
+    return "\n".join(lines)
+
+def result_payload(session: Session, kind: str) -> dict:
+    version, words = session.result_store.get(kind, [])
+    return {"kind": kind, "version": version, "words": words}
+
+def publish_result(session: Session, kind: str, gemini_future: Future) -> None:
+    words = gemini_future.result()
+    if words is None:
+        return
+    previous_version = session.result_store.get(kind)[0]
+    if session.result_store.publish(kind, words) != previous_version:
+        session.event_hub.publish("result", **result_payload(session, kind))
+
+def request_result_refresh(session: Session, kind: str) -> Optional[Future]:
+    with session.capture_lock:
+        snapshot = session.latest_capture
+    if snapshot is None:
+        return None
+    _, frame, scene_version = snapshot
+
+    with session.refresh_lock:
+        pending = session.result_refreshes.get(kind)
+        if pending is not None and not pending.done():
+            return pending
+        if session.result_scene_versions.get(kind, 0) >= scene_version:
+            return None
+        # Recorded up front so a failed call is not retried until the scene changes again
+        session.result_scene_versions[kind] = scene_version
+
+        refreshed = Future()
+        def publish(gemini_future: Future) -> None:
+            try:
+                publish_result(session, kind, gemini_future)
+            finally:
+                refreshed.set_result(None)
+
+        boxes = text_boxes(session, frame, scene_version)
+        submit_to_gemini(frame, RESULT_PROMPTS[kind], is_structured_output=True, boxes=boxes).add_done_callback(publish)
+        session.result_refreshes[kind] = refreshed
+        return refreshed
 
 def run_flask_app():
     app.run(host='0.0.0.0', port=5000, debug=False, use_reloader=False) 
 
-def array_buffer_to_base64(buffer) -> str:
-    return base64.b64encode(buffer).decode('utf-8')
+def gemini_request_body(payload: dict, jpeg) -> bytes:
+    # Serializes the payload with the JPEG's base64 spliced in as bytes, skipping the str round
+    # trip and json.dumps copy of a multi-megabyte string. rsplit: a prompt could contain the placeholder
+    head, tail = json.dumps(payload).encode('utf-8').rsplit(f'"{GEMINI_IMAGE_PLACEHOLDER}"'.encode('ascii'), 1)
+    return b''.join((head, b'"', base64.b64encode(jpeg), b'"', tail))
+
+def text_boxes(session: Session, frame, scene_version: int) -> Optional[List[List[List[int]]]]:
+    # Every box the last OCR pass detected, in camera pixels, if it ran on this scene; else None.
+    # Not just the tracker's emitted lines: the ones read too poorly to emit are what Gemini is for
+    with session.ocr_lock:
+        snapshot = session.ocr_results
+    if snapshot["scene_version"] != scene_version or not snapshot["detected"]:
+        return None
+    scale = frame.shape[1] / TARGET_WIDTH
+    return [[[int(x * scale), int(y * scale)] for x, y in bbox] for bbox in snapshot["detected"]]
 
-def capture_and_send_to_gemini(frame, user_prompt: str, is_structured_output: bool = True) -> Optional[List[str]]:
-    global latest_words
+def submit_to_gemini(frame, user_prompt: str, is_structured_output: bool = True,
+                     boxes: Optional[List[List[List[int]]]] = None) -> Future:
+    # boxes (camera pixels) let text prompts upload just the text regions
+    start_time = time.time()
+    frame_hash = perceptual_hash(frame, GEMINI_CACHE_HASH_SIZE)
+    cached = gemini_cache.get(frame_hash, user_prompt, is_structured_output)
+    if cached is not None:
+        metrics.inc("gemini_calls_total", outcome="cache_hit")
+        print(f"\n--- Gemini cache hit in {time.time() - start_time:.3f} seconds. ---")
+        print(cached)
+        future = Future()
+        future.set_result(cached if is_structured_output else None)
+        return future
+
+    # Simultaneous requests for the same frame and prompt share one upstream call
+    key = (frame_hash, user_prompt, is_structured_output)
+    future = gemini_client.submit(key, send_to_gemini, frame, frame_hash, user_prompt, is_structured_output, boxes)
+    submitted = time.perf_counter()
+    # End to end, including the wait for a free slot in the client's pool
+    future.add_done_callback(lambda _: metrics.observe("stage_seconds", time.perf_counter() - submitted,
+                                                       stage="gemini_total"))
+    return future
+
+def send_to_gemini(frame, frame_hash: int, user_prompt: str, is_structured_output: bool,
+                   boxes: Optional[List[List[List[int]]]] = None) -> Optional[List[str]]:
     print("\n--- Sending Image to Gemini API...---")
     start_time = time.time()
-    encode_param = [int(cv2.IMWRITE_JPEG_QUALITY), 90]
-    _, buffer = cv2.imencode('.jpeg', frame, encode_param)
-    base64_image = array_buffer_to_base64(buffer)
     payload = {
         "contents": [
             {
@@ -162,7 +796,7 @@ def capture_and_send_to_gemini(frame, user_prompt: str, is_structured_output: bo
                     {
                         "inlineData": {
                             "mimeType": "image/jpeg",
-                            "data": base64_image
+                            "data": GEMINI_IMAGE_PLACEHOLDER
                         }
                     }
                 ]
@@ -173,32 +807,21 @@ def capture_and_send_to_gemini(frame, user_prompt: str, is_structured_output: bo
             "responseSchema": RESPONSE_SCHEMA if is_structured_output else None
         }
     }
+    with metrics.timed("gemini_encode"):
+        # Structured calls read text; the free-form call describes the whole scene
+        if is_structured_output:
+            jpeg, shaped = text_payload_shaper.shape(frame, boxes)
+        else:
+            jpeg, shaped = scene_payload_shaper.shape(frame)
+        body = gemini_request_body(payload, jpeg)
+    metrics.observe("gemini_payload_bytes", shaped["bytes"], source=shaped["source"])
+    print(f"--- Payload: {shaped['bytes'] / 1024:.1f} KB, {shaped['width']}x{shaped['height']} "
+          f"q{shaped['quality']} from {shaped['source']} ---")
     
     try:
-        max_retries = 3
-        retry_delay = 1 
-        
-        for attempt in range(max_retries):
-            try:
-                config_headers = {'Content-Type': 'application/json'}
-                
-                response = requests.post(
-                    API_URL, 
-                    headers=config_headers, 
-                    data=json.dumps(payload),
-                    timeout=20
-                )
-                response.raise_for_status() 
-                break 
-            except requests.exceptions.HTTPError as e:
-                if response.status_code >= 500 and attempt < max_retries - 1:
-                    print(f"Server error ({response.status_code}). Retrying in {retry_delay}s...")
-                    time.sleep(retry_delay)
-                    retry_delay *= 2
-                    continue
-                raise e
-
-        result = response.json()
+        with metrics.timed("gemini"):
+            result = gemini_client.post_json(body)
+        metrics.inc("gemini_calls_total", outcome="ok")
         
         end_time = time.time()
         print(f"--- API call finished in {end_time - start_time:.2f} seconds. ---")
@@ -207,15 +830,15 @@ def capture_and_send_to_gemini(frame, user_prompt: str, is_structured_output: bo
         if text_response:
             if is_structured_output:
                 word_array = json.loads(text_response)
+                gemini_cache.put(frame_hash, user_prompt, True, word_array)
                 print(f"Gemini Success (Structured)! Recognized {len(word_array)} words:")
                 print("----------------- GEMINI OCR RESULT (C) -----------------")
                 print(word_array)
-                latest_words.clear()
-                latest_words.extend(word_array)
 
                 print("---------------------------------------------------------")
                 return word_array
             else:
+                gemini_cache.put(frame_hash, user_prompt, False, text_response)
                 print("Gemini Success (Custom)! Analysis:")
                 print("----------------- GEMINI CUSTOM RESULT (V) -----------------")
                 print(text_response)
@@ -226,6 +849,7 @@ def capture_and_send_to_gemini(frame, user_prompt: str, is_structured_output: bo
             return None
 
     except requests.exceptions.RequestException as e:
+        metrics.inc("gemini_calls_total", outcome="error")
         print(f"Network or API Error (Check connection/API enablement): {e}")
         return None
     except json.JSONDecodeError:
@@ -235,102 +859,166 @@ def capture_and_send_to_gemini(frame, user_prompt: str, is_structured_output: bo
         print(f"An unexpected error occurred during Gemini call: {e}")
         return None
 
-def initialize_ocr_reader() -> Optional[easyocr.Reader]:
-    print("Initializing EasyOCR Reader (One-Time Setup)...")
-    try:
-        start_init_time = time.time()
-        reader = easyocr.Reader(LANGUAGE_LIST, gpu=USE_GPU)
-        end_init_time = time.time()
-        print(f"EasyOCR Reader initialized in {end_init_time - start_init_time:.2f} seconds.")
-        return reader
-    except Exception as e:
-        print(f"An error occurred during EasyOCR Reader initialization: {e}")
-        return None
+def warm_up_ocr_reader(reader: "easyocr.Reader") -> None:
+    # One full pass at the live frame size, so the first real frame doesn't pay for
+    # lazy initialization and buffer allocation inside torch
+    image = np.full((TARGET_WIDTH * 3 // 4, TARGET_WIDTH, 3), 255, dtype=np.uint8)
+    cv2.putText(image, "Sight to Speech", (40, 120), cv2.FONT_HERSHEY_SIMPLEX, 1.5, (0, 0, 0), 3)
+    cv2.putText(image, "warm up 123", (40, 220), cv2.FONT_HERSHEY_SIMPLEX, 1.0, (0, 0, 0), 2)
+    _, latency = process_frame_for_ocr(reader, image)
+    print(f"EasyOCR Reader warmed up in {latency:.2f} seconds.")
 
 
-def initialize_sym_spell() -> Optional[SymSpell]:
-    print("Initializing SymSpell Checker...")
-    try:
-        sym_spell = SymSpell(max_dictionary_edit_distance=2, prefix_length=7)
-        dictionary_path = "frequency_dictionary_en_82_765.txt"
-        
-        if sym_spell.load_dictionary(dictionary_path, term_index=0, count_index=1):
-            print(f"SymSpell Checker initialized from external file: {dictionary_path}.")
-        else:
-            print(f"Warning: Could not find '{dictionary_path}'. Falling back to embedded dictionary.")
-            for line in DICTIONARY_CONTENT.splitlines():
-                if line:
-                    key, count = line.split()
-                    sym_spell.create_dictionary_entry(key.lower(), int(count))
-            print("SymSpell Checker initialized with embedded dictionary.")
-        
-        return sym_spell
-    except Exception as e:
-        print(f"Could not initialize SymSpell Checker: {e}")
-        return None
-
-
-def process_frame_for_ocr(reader: easyocr.Reader, frame) -> Tuple[List[Tuple[List[List[int]], str, float]], float]:
-    if frame is None:
-        return [], 0.0
-
-    try:
-        start_ocr_time = time.time()
-        results_detailed = reader.readtext(frame, detail=1, batch_size=BATCH_SIZE, decoder=DECODER_TYPE)
-        end_ocr_time = time.time()
-        frame_latency = end_ocr_time - start_ocr_time
-        
-        return results_detailed, frame_latency
-
-    except Exception as e:
-        print(f"An error occurred during frame processing: {e}")
-        return [], 0.0
+def warm_up_sym_spell(sym_spell: SymSpell) -> None:
+    # Pages in the parts of a memory-mapped index that every lookup touches
+    sym_spell.word_segmentation("sighttospeech", max_edit_distance=2, max_segmentation_word_length=25)
 
 
-def sort_results_by_location(results_detailed: List[Tuple[List[List[int]], str, float]]) -> List[Tuple[List[List[int]], str, float]]:
-    if not results_detailed:
-        return []
+def create_ocr_batcher(reader: "easyocr.Reader", mode: str = OCR_BATCH_MODE) -> Optional[BatchedRecognizer]:
+    if mode == "latency":
+        return None
+    if INCREMENTAL_OCR or OCR_WORKERS < 2:
+        # One producer never fills a batch; the batcher would only add max_wait to every pass
+        print(f"Warning: OCR_BATCH_MODE={mode} needs INCREMENTAL_OCR off and OCR_WORKERS > 1. Using plain readtext.")
+        return None
+    settings = dict(BATCH_PRESETS[mode])
+    if OCR_BATCH_MAX_FRAMES is not None:
+        settings["max_batch_frames"] = OCR_BATCH_MAX_FRAMES
+    if OCR_BATCH_MAX_WAIT is not None:
+        settings["max_wait"] = OCR_BATCH_MAX_WAIT
+    print(f"Batched OCR enabled ({mode}): {settings}")
+    return BatchedRecognizer(reader, decoder=DECODER_TYPE, **settings)
 
-    first_bbox = results_detailed[0][0]
-    y_coords = [p[1] for p in first_bbox]
-    avg_line_height = max(y_coords) - min(y_coords)
-    
-    LINE_Y_TOLERANCE = max(10, avg_line_height * 0.5) 
-    
-    lines = [] 
-    
-    sorted_by_y = sorted(results_detailed, key=lambda res: res[0][0][1])
-    
-    for res in sorted_by_y:
-        y_top = res[0][0][1] 
-        
-        if lines and abs(y_top - lines[-1][-1][0][0][1]) < LINE_Y_TOLERANCE:
-            lines[-1].append(res)
-        else:
-            lines.append([res])
 
-    final_sorted_results = []
-    for line in lines:
-        line_sorted_by_x = sorted(line, key=lambda res: res[0][0][0])
-        final_sorted_results.extend(line_sorted_by_x)
-        
-    return final_sorted_results
+def capture_loop(session: Session, stop_event: threading.Event) -> None:
+    frame_count = 0
+    frame_shape = None
+    while not stop_event.is_set():
+        with metrics.timed("capture", f"{session.name}#{frame_count}", session=session.name):
+            # Decoded straight into a pooled buffer once the frame size is known
+            buffer = session.frames.acquire(frame_shape) if frame_shape is not None else None
+            ret, frame = session.cap.read(buffer)
+            buffer = None
+        if not ret:
+            # Only this session stops; the other stations keep running
+            print(f"Error: [{session.name}] Failed to grab frame.")
+            break
+        frame_shape = frame.shape
+        # Every stage shares this one copy, so nothing may draw on it
+        frame = read_only(frame)
+
+        session.capture_stats.tick()
+        if session.ocr_scheduler.should_run(frame):
+            session.ocr_queue.put((frame_count, frame, session.ocr_scheduler.scene_version))
+            ocr_work.notify()
+        with session.capture_lock:
+            session.latest_capture = (frame_count, frame, session.ocr_scheduler.scene_version)
+        session.render_queue.put((frame_count, frame))
+        render_ready.set()
+        frame_count += 1
 
+    session.ocr_queue.close()
+    session.render_queue.close()
 
-def correct_and_segment_text(text_list: List[str], sym_spell: SymSpell) -> List[str]:
-    corrected_phrases = []
-    pattern_strip = re.compile(r'[^a-zA-Z0-9]+')
 
-    for phrase in text_list:
-        cleaned_phrase = pattern_strip.sub('', phrase).lower()
-        
-        if not cleaned_phrase:
+def ocr_worker(reader: "easyocr.Reader", sym_spell: SymSpell, stop_event: threading.Event) -> None:
+    while not stop_event.is_set():
+        # Pointer requests go first; the next full-frame pass waits for them
+        if not region_ocr.wait_idle(timeout=0.1):
             continue
-        
-        result = sym_spell.word_segmentation(cleaned_phrase, max_edit_distance=2, max_segmentation_word_length=25)
-        corrected_phrases.append(result.corrected_string.capitalize())
+        taken = ocr_work.get(timeout=0.1)
+        if taken is None:
+            continue
+        session, (frame_index, frame, scene_version) = taken
+        try:
+            run_ocr_pass(session, reader, sym_spell, frame_index, frame, scene_version)
+        finally:
+            ocr_work.release(session)
+
+def run_ocr_pass(session: Session, reader: "easyocr.Reader", sym_spell: SymSpell, frame_index: int, frame,
+                 scene_version: int = 0) -> None:
+    if INCREMENTAL_OCR and session.incremental is None:
+        session.incremental = IncrementalOcr(
+            reader,
+            batch_size=BATCH_SIZE,
+            decoder=DECODER_TYPE,
+            iou_threshold=INCREMENTAL_IOU_THRESHOLD,
+            change_threshold=INCREMENTAL_CHANGE_THRESHOLD,
+            full_refresh_every=INCREMENTAL_FULL_REFRESH_EVERY,
+        )
+    incremental = session.incremental
+    if session.text_tracker is None:
+        session.text_tracker = TextTracker(
+            iou_threshold=TRACK_IOU_THRESHOLD,
+            vote_decay=TRACK_VOTE_DECAY,
+            early_confidence=TRACK_EARLY_CONFIDENCE,
+            confirm_hits=TRACK_CONFIRM_HITS,
+            max_missed=TRACK_MAX_MISSED,
+        )
+    tracker = session.text_tracker
+    frame_id = f"{session.name}#{frame_index}"
+
+    with metrics.timed("resize", frame_id, session=session.name):
+        ocr_frame = resize_for_ocr(frame, session.ocr_frames)
+    with metrics.timed("ocr", frame_id, session=session.name):
+        results_unsorted, latency = process_frame_for_ocr(reader, ocr_frame, incremental, ocr_batcher)
+    # Fused text of the lines tracked across passes, instead of this pass's raw readings
+    with metrics.timed("track", frame_id, session=session.name):
+        previous_version = tracker.version
+        tracks = tracker.update(results_unsorted, scene_version)
+    with metrics.timed("sort", frame_id, session=session.name):
+        order = analyze_layout([track.result() for track in tracks])["order"] if tracks else []
+        tracks = [tracks[i] for i in order]
+    results_detailed = [track.result() for track in tracks]
+    recognized_text = [text for (bbox, text, conf) in results_detailed]
+    with metrics.timed("spell", frame_id, session=session.name):
+        corrected_phrases = correct_and_segment_text(recognized_text, sym_spell)
+
+    with session.ocr_lock:
+        session.ocr_results = {
+            "version": tracker.version,
+            "pass": session.ocr_results["pass"] + 1,
+            "frame_index": frame_index,
+            "scene_version": scene_version,
+            "results": results_detailed,
+            "track_ids": [track.id for track in tracks],
+            "detected": [bbox for bbox, _, _ in results_unsorted],
+            "text": recognized_text,
+            "corrected": corrected_phrases,
+            "latency": latency,
+        }
+    session.ocr_stats.tick(latency)
+    # Listeners only hear about text that changed: new lines, refined readings, dropped lines
+    if tracker.version != previous_version:
+        session.event_hub.publish("ocr", version=tracker.version, phrases=corrected_phrases)
+
+    reuse_note = ""
+    if incremental is not None:
+        reuse_note = f" | Reused {incremental.last_reused}/{incremental.last_reused + incremental.last_recognized} boxes"
+
+    label = f"EasyOCR {frame_index:04d}" if len(sessions) == 1 else f"EasyOCR {session.name} {frame_index:04d}"
+    if corrected_phrases:
+        print(f"[{label}] Latency: {latency:.3f}s{reuse_note} | Text: {' | '.join(corrected_phrases[:3])}...")
+    else:
+        print(f"[{label}] Latency: {latency:.3f}s{reuse_note} | Text: (None detected)")
 
-    return corrected_phrases
+def start_ocr_when_ready(stop_event: threading.Event) -> None:
+    global ocr_batcher
+    ocr_reader = component_loader.get("ocr_reader")
+    sym_spell_checker = component_loader.get("sym_spell")
+    if ocr_reader is None or sym_spell_checker is None:
+        print("Error: OCR is unavailable because a component failed to load. The camera feed keeps running.")
+        return
+    ocr_batcher = create_ocr_batcher(ocr_reader)
+    print(f"OCR components ready; starting {OCR_WORKERS} OCR worker(s) for {len(sessions)} session(s).")
+    # One shared reader: extra workers only overlap their frames inside the batcher
+    for i in range(1, OCR_WORKERS):
+        threading.Thread(target=ocr_worker, args=(ocr_reader, sym_spell_checker, stop_event),
+                         name=f"ocr-worker-{i}", daemon=True).start()
+    ocr_worker(ocr_reader, sym_spell_checker, stop_event)
+
+# Set by capture loops after queueing a frame for rendering, so the main loop can sleep in between
+render_ready = threading.Event()
 
 if __name__ == "__main__":
     print("Starting Flask server in a separate thread...")
@@ -345,111 +1033,142 @@ if __name__ == "__main__":
     )
     GEMINI_CUSTOM_PROMPT = "describe this image as descriptive as possible as if you are trying to describe a scene to a blind person so they could imagine it. A blind person cannot read, so you must describe it to them as if you were talking to them. Do it in 2-3 sentences and always start with: \"You are currently looking at\". You should always be using their relative position like: your left." 
 
-    ocr_reader = initialize_ocr_reader()
-    sym_spell_checker = initialize_sym_spell()
-    if ocr_reader is None or sym_spell_checker is None:
-        exit()
-
-
-    cap = cv2.VideoCapture(CAMERA_INDEX)
+    # Both load in parallel while the camera, render loop and /video_feed are already running
+    component_loader.start("ocr_reader", initialize_ocr_reader, warm_up_ocr_reader)
+    component_loader.start("sym_spell", initialize_sym_spell, warm_up_sym_spell)
 
-    if not cap.isOpened():
-        print(f"Error: Could not open camera at index {CAMERA_INDEX}. Exiting.")
+    active_sessions = []
+    for session in sessions.values():
+        session.cap = cv2.VideoCapture(session.source)
+        if session.cap.isOpened():
+            active_sessions.append(session)
+        else:
+            print(f"Error: [{session.name}] Could not open capture source {session.source!r}. Skipping this session.")
+    if not active_sessions:
+        print(f"Error: Could not open any camera (CAMERA_INDEX={CAMERA_INDEX}). Exiting.")
         print("Hint: If using an external USB camera, try changing CAMERA_INDEX (e.g., to 0 or 1).")
         exit()
 
     print("\n--- Hybrid OCR Scanner Started (API Mode) ---")
     print(f"API Endpoint: http://127.0.0.1:5000/data")
+    if len(sessions) > 1:
+        print(f"Sessions: {', '.join(s.name for s in active_sessions)} (http://127.0.0.1:5000/sessions/<name>/...)")
     print("Commands: 'c', 'v', 'n', 'p'. Press 'q' key in video window to quit.")
     
-    last_results_detailed = []
-    last_latency = 0.0
-    last_recognized_text = []
-    last_corrected_phrases = [] 
-    focused_box_index = -1 
-    
-    frame_count = 0
-    while cap.isOpened():
-        ret, frame = cap.read()
-        
-        if not ret:
-            print("Error: Failed to grab frame.")
-            break
-
-        
+    stop_event = threading.Event()
+    capture_threads = [
+        threading.Thread(target=capture_loop, args=(session, stop_event), name=f"capture-{session.name}", daemon=True)
+        for session in active_sessions
+    ]
+    ocr_thread = threading.Thread(target=start_ocr_when_ready, args=(stop_event,), daemon=True)
+    for capture_thread in capture_threads:
+        capture_thread.start()
+    ocr_thread.start()
+
+    last_stats_time = time.time()
+
+    # Render stage: stays on the main thread because cv2.imshow/waitKey need it
+    while not stop_event.is_set() and any(thread.is_alive() for thread in capture_threads):
+        render_ready.wait(timeout=0.1)
+        render_ready.clear()
+
+        for session in active_sessions:
+            item = session.render_queue.get(timeout=0)
+            if item is None:
+                continue
+            frame_index, frame = item
+            render_start = time.time()
+            # Raw frames are shared with OCR and Gemini, so draw on a pooled copy
+            display = session.display_frames.acquire(frame.shape)
+            np.copyto(display, frame)
+
+            height, width, _ = frame.shape
+            scale_factor = width / TARGET_WIDTH 
+
+            with session.ocr_lock:
+                snapshot = session.ocr_results
+            if snapshot["pass"] != session.shown_pass:
+                session.shown_pass = snapshot["pass"]
+                session.shown_results = snapshot["results"]
+                session.shown_track_ids = snapshot["track_ids"]
+                # Indices shift as lines appear and vanish; focus stays on its line, or the nearest one
+                session.focused_box_index = locate(session.focused_track_id, session.focused_bbox,
+                                                   session.shown_track_ids, session.shown_results)
+                if session.focused_box_index != -1:
+                    session.focused_track_id = session.shown_track_ids[session.focused_box_index]
+                    session.focused_bbox = session.shown_results[session.focused_box_index][0]
+
+            if session.pending_gemini is not None and session.pending_gemini.done():
+                session.pending_gemini = None
+
+            for command in session.pop_commands():
+                # Gemini calls run on the client's pool; the render loop keeps going
+                if command == "c":
+                    boxes = text_boxes(session, frame, session.ocr_scheduler.scene_version)
+                    session.pending_gemini = submit_to_gemini(frame, GEMINI_STRUCTURED_PROMPT, is_structured_output=True,
+                                                              boxes=boxes)
+                    session.pending_gemini.add_done_callback(lambda f, s=session: publish_result(s, "words", f))
+                elif command == "v":
+                    session.pending_gemini = submit_to_gemini(frame, GEMINI_CUSTOM_PROMPT, is_structured_output=False)
+                elif session.shown_results and command in ("n", "p"):
+                    num_boxes = len(session.shown_results)
+                    if command == "n":
+                        if session.focused_box_index == -1: session.focused_box_index = 0
+                        else: session.focused_box_index = (session.focused_box_index + 1) % num_boxes
+                        print(f"-> [{session.name}] EasyOCR Focused box {session.focused_box_index+1}/{num_boxes}")
+                    else:
+                        if session.focused_box_index == -1: session.focused_box_index = num_boxes - 1
+                        else: session.focused_box_index = (session.focused_box_index - 1 + num_boxes) % num_boxes
+                        print(f"<- [{session.name}] EasyOCR Focused box {session.focused_box_index+1}/{num_boxes}")
+                    session.focused_track_id = session.shown_track_ids[session.focused_box_index]
+                    session.focused_bbox = session.shown_results[session.focused_box_index][0]
+                    session.event_hub.publish("focus", index=session.focused_box_index, count=num_boxes,
+                                              line=session.focused_track_id,
+                                              text=session.shown_results[session.focused_box_index][1])
+
+            for i, (bbox, original_text, conf) in enumerate(session.shown_results):
+                top_left_scaled = tuple(map(lambda x: int(x * scale_factor), bbox[0]))
+                bottom_right_scaled = tuple(map(lambda x: int(x * scale_factor), bbox[2]))
+                
+                box_color = (160, 32, 240) if i == session.focused_box_index else (0, 255, 0) 
 
-        height, width, _ = frame.shape
-        scale_factor = width / TARGET_WIDTH 
+                cv2.rectangle(display, top_left_scaled, bottom_right_scaled, box_color, 2)
+                
+            cv2.putText(display, "", (20, 30), 
+                        cv2.FONT_HERSHEY_SIMPLEX, 0.6, (255, 255, 255), 2)
+            cv2.putText(display, "", (20, 55), 
+                        cv2.FONT_HERSHEY_SIMPLEX, 0.6, (255, 255, 255), 2)
 
-        if frame_count % SKIP_FRAMES == 0:
-            target_height = int(height * (TARGET_WIDTH / width))
-            ocr_frame = cv2.resize(frame, (TARGET_WIDTH, target_height), interpolation=cv2.INTER_AREA)
 
-            results_unsorted, last_latency = process_frame_for_ocr(ocr_reader, ocr_frame)
-            last_results_detailed = sort_results_by_location(results_unsorted)
-            last_recognized_text = [text for (bbox, text, conf) in last_results_detailed]
-            last_corrected_phrases = correct_and_segment_text(last_recognized_text, sym_spell_checker)
+            cv2.imshow(WINDOW_NAME if len(sessions) == 1 else f"{WINDOW_NAME} - {session.name}", display)
 
-            if not last_results_detailed:
-                focused_box_index = -1
-            elif focused_box_index >= len(last_results_detailed):
-                focused_box_index = 0
+            session.mjpeg_broadcaster.publish(read_only(display))
+            display = None
 
-            if last_corrected_phrases:
-                print(f"[EasyOCR {frame_count:04d}] Latency: {last_latency:.3f}s | Text: {' | '.join(last_corrected_phrases[:3])}...")
-            else:
-                print(f"[EasyOCR {frame_count:04d}] Latency: {last_latency:.3f}s | Text: (None detected)")
+            render_latency = time.time() - render_start
+            session.render_stats.tick(render_latency)
+            metrics.observe("stage_seconds", render_latency, stage="render", session=session.name)
+            if metrics.tracer.enabled:
+                metrics.tracer.span(f"{session.name}#{frame_index}", "render", render_start, render_latency)
 
-        
         key = cv2.waitKey(1) & 0xFF
         if key == ord('q'):
             break
 
-
-        command_to_process = data 
-
-        if command_to_process == "c":
-            capture_and_send_to_gemini(frame, GEMINI_STRUCTURED_PROMPT, is_structured_output=True)
-            data = "g"
-        elif command_to_process == "v":
-            capture_and_send_to_gemini(frame, GEMINI_CUSTOM_PROMPT, is_structured_output=False)
-            data = "g" 
-        elif last_results_detailed:
-            num_boxes = len(last_results_detailed)
-            
-            if command_to_process == "n": 
-                if focused_box_index == -1: focused_box_index = 0
-                else: focused_box_index = (focused_box_index + 1) % num_boxes
-                print(f"-> EasyOCR Focused box {focused_box_index+1}/{num_boxes}")
-                data = "g" 
-            elif command_to_process == "p":
-                if focused_box_index == -1: focused_box_index = num_boxes - 1
-                else: focused_box_index = (focused_box_index - 1 + num_boxes) % num_boxes
-                print(f"<- EasyOCR Focused box {focused_box_index+1}/{num_boxes}")
-                data = "g" 
-
-
-        for i, (bbox, original_text, conf) in enumerate(last_results_detailed):
-            top_left_scaled = tuple(map(lambda x: int(x * scale_factor), bbox[0]))
-            bottom_right_scaled = tuple(map(lambda x: int(x * scale_factor), bbox[2]))
-            
-            box_color = (160, 32, 240) if i == focused_box_index else (0, 255, 0) 
-
-            cv2.rectangle(frame, top_left_scaled, bottom_right_scaled, box_color, 2)
-            
-        cv2.putText(frame, "", (20, 30), 
-                    cv2.FONT_HERSHEY_SIMPLEX, 0.6, (255, 255, 255), 2)
-        cv2.putText(frame, "", (20, 55), 
-                    cv2.FONT_HERSHEY_SIMPLEX, 0.6, (255, 255, 255), 2)
-
-
-        cv2.imshow(WINDOW_NAME, frame)
-
-        with frame_lock:
-            latest_frame = frame.copy()
-
-        frame_count += 1
-        
-    cap.release()
+        if time.time() - last_stats_time >= PIPELINE_STATS_INTERVAL:
+            print(format_pipeline_stats(pipeline_stats()))
+            last_stats_time = time.time()
+
+    stop_event.set()
+    for capture_thread in capture_threads:
+        capture_thread.join(timeout=2)
+    ocr_thread.join(timeout=2)
+    gemini_client.close()
+    speech_renderer.close()
+    if metrics.tracer.enabled and TRACE_DUMP_PATH:
+        metrics.tracer.dump(TRACE_DUMP_PATH)
+        print(f"Frame trace written to {TRACE_DUMP_PATH}.")
+    for session in active_sessions:
+        session.cap.release()
     cv2.destroyAllWindows()
     print("\nHybrid OCR Scanner stopped. Thank you.")
@@ -0,0 +1,160 @@
+import queue
+from bisect import bisect_right
+import threading
+import time
+from concurrent.futures import Future
+from typing import List, Tuple
+
+import cv2
+import numpy as np
+
+OcrResult = Tuple[List[List[int]], str, float]
+
+# Throughput/latency trade-off presets for BatchedRecognizer
+BATCH_PRESETS = {
+    "latency": {"max_batch_frames": 1, "max_wait": 0.0, "batch_size": 1},
+    "balanced": {"max_batch_frames": 4, "max_wait": 0.05, "batch_size": 8},
+    "throughput": {"max_batch_frames": 16, "max_wait": 0.25, "batch_size": 32},
+}
+
+# Rows of padding between frames stacked on the recognition canvas
+CANVAS_GAP = 32
+
+
+class BatchedRecognizer:
+    """Collects frames from any number of producers and runs EasyOCR on them in batches.
+
+    A batch closes when `max_batch_frames` frames are waiting or `max_wait` seconds
+    have passed since its first frame. Same-sized frames share one detector forward
+    pass; that is the part batched on any device. The text crops of every frame also go
+    through a single recognizer call, by stacking the grey frames on one canvas, but
+    only a GPU runs `batch_size` crops per forward pass: on CPU, EasyOCR recognizes
+    them one at a time.
+
+    Frames are only batched when several producers submit at once (several OCR
+    workers, or concurrent callers of `submit`); with a single producer, each batch
+    holds one frame and `max_wait` is pure added latency.
+    """
+
+    def __init__(self, reader, max_batch_frames: int = 4, max_wait: float = 0.05,
+                 batch_size: int = 8, decoder: str = 'greedy'):
+        self.reader = reader
+        self.max_batch_frames = max_batch_frames
+        self.max_wait = max_wait
+        self.batch_size = batch_size
+        self.decoder = decoder
+
+        self.batches = 0
+        self.frames = 0
+        self.last_batch_frames = 0
+        self.last_batch_latency = 0.0
+
+        # Unbounded: unlike the live pipeline queues, every submitted frame is owed a result
+        self._pending = queue.Queue()
+        self._thread = threading.Thread(target=self._run, name="ocr-batcher", daemon=True)
+        self._thread.start()
+
+    @classmethod
+    def from_preset(cls, reader, mode: str, decoder: str = 'greedy') -> "BatchedRecognizer":
+        return cls(reader, decoder=decoder, **BATCH_PRESETS[mode])
+
+    def submit(self, frame) -> Future:
+        future = Future()
+        self._pending.put((frame, future))
+        return future
+
+    def readtext(self, frame) -> List[OcrResult]:
+        return self.submit(frame).result()
+
+    def _collect(self) -> list:
+        batch = [self._pending.get()]
+        deadline = time.time() + self.max_wait
+        while len(batch) < self.max_batch_frames:
+            remaining = deadline - time.time()
+            if remaining <= 0:
+                break
+            try:
+                batch.append(self._pending.get(timeout=remaining))
+            except queue.Empty:
+                break
+        return batch
+
+    def _detect(self, frames: list) -> Tuple[list, list]:
+        horizontal = [None] * len(frames)
+        free = [None] * len(frames)
+        by_shape = {}
+        for index, frame in enumerate(frames):
+            by_shape.setdefault(frame.shape, []).append(index)
+        for indices in by_shape.values():
+            stacked = np.stack([frames[i] for i in indices])
+            horizontal_agg, free_agg = self.reader.detect(stacked, reformat=False)
+            for i, h_list, f_list in zip(indices, horizontal_agg, free_agg):
+                horizontal[i], free[i] = h_list, f_list
+        return horizontal, free
+
+    def _recognize(self, frames: list, horizontal: list, free: list) -> List[List[OcrResult]]:
+        greys = [cv2.cvtColor(f, cv2.COLOR_BGR2GRAY) if f.ndim == 3 else f for f in frames]
+        width = max(g.shape[1] for g in greys)
+        offsets = []
+        y = 0
+        for grey in greys:
+            offsets.append(y)
+            y += grey.shape[0] + CANVAS_GAP
+        canvas = np.zeros((y, width), dtype=np.uint8)
+
+        canvas_horizontal, canvas_free = [], []
+        for grey, offset, h_list, f_list in zip(greys, offsets, horizontal, free):
+            canvas[offset:offset + grey.shape[0], :grey.shape[1]] = grey
+            canvas_horizontal.extend([x0, x1, y0 + offset, y1 + offset] for x0, x1, y0, y1 in h_list)
+            canvas_free.extend([[p[0], p[1] + offset] for p in box] for box in f_list)
+
+        results: List[List[OcrResult]] = [[] for _ in frames]
+        if not canvas_horizontal and not canvas_free:
+            return results
+
+        recognized = self.reader.recognize(
+            canvas,
+            horizontal_list=canvas_horizontal,
+            free_list=canvas_free,
+            detail=1,
+            batch_size=self.batch_size,
+            decoder=self.decoder,
+        )
+        for bbox, text, conf in recognized:
+            # The detector's margin can push a box's top edge above its frame's band (into the gap or
+            # the previous frame), so the box belongs to the frame holding its vertical centre
+            center = (min(p[1] for p in bbox) + max(p[1] for p in bbox)) / 2
+            index = max(0, bisect_right(offsets, center) - 1)
+            offset, height = offsets[index], greys[index].shape[0]
+            results[index].append(([[p[0], min(max(p[1] - offset, 0), height)] for p in bbox], text, conf))
+        return results
+
+    def _run(self) -> None:
+        while True:
+            batch = self._collect()
+            frames = [frame for frame, _ in batch]
+            start_time = time.time()
+            try:
+                horizontal, free = self._detect(frames)
+                results = self._recognize(frames, horizontal, free)
+            except Exception as e:
+                for _, future in batch:
+                    future.set_exception(e)
+                continue
+
+            self.batches += 1
+            self.frames += len(batch)
+            self.last_batch_frames = len(batch)
+            self.last_batch_latency = time.time() - start_time
+            for (_, future), frame_results in zip(batch, results):
+                future.set_result(frame_results)
+
+    def snapshot(self) -> dict:
+        return {
+            "batches": self.batches,
+            "frames": self.frames,
+            "avg_batch_frames": round(self.frames / self.batches, 2) if self.batches else 0.0,
+            "last_batch_frames": self.last_batch_frames,
+            "last_batch_latency": round(self.last_batch_latency, 4),
+            "pending": self._pending.qsize(),
+        }
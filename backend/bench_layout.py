@@ -0,0 +1,101 @@
+import argparse
+import math
+import random
+import time
+
+from layout import analyze_boxes, boxes_from_results, reading_order
+
+# Benchmarks the reading-order engine against the original sort_results_by_location
+# on synthetic pages with known order (columns, slight tilt, mixed font sizes), e.g.
+#   python bench_layout.py --sizes 10 100 1000 5000
+
+
+def legacy_sort(results_detailed):
+    # sort_results_by_location as it was before layout.py, kept for comparison
+    if not results_detailed:
+        return []
+    first_bbox = results_detailed[0][0]
+    y_coords = [p[1] for p in first_bbox]
+    avg_line_height = max(y_coords) - min(y_coords)
+    LINE_Y_TOLERANCE = max(10, avg_line_height * 0.5)
+    lines = []
+    sorted_by_y = sorted(results_detailed, key=lambda res: res[0][0][1])
+    for res in sorted_by_y:
+        y_top = res[0][0][1]
+        if lines and abs(y_top - lines[-1][-1][0][0][1]) < LINE_Y_TOLERANCE:
+            lines[-1].append(res)
+        else:
+            lines.append([res])
+    final_sorted_results = []
+    for line in lines:
+        final_sorted_results.extend(sorted(line, key=lambda res: res[0][0][0]))
+    return final_sorted_results
+
+
+def synthetic_page(num_boxes: int, columns: int, tilt_degrees: float, seed: int):
+    rng = random.Random(seed)
+    column_width, gutter = 400, 60
+    # The page is rotated as a whole, like a tilted sheet under the camera; each word box is then
+    # the axis-aligned bounds of its rotated corners, as EasyOCR reports near-horizontal text
+    cos, sin = math.cos(math.radians(tilt_degrees)), math.sin(math.radians(tilt_degrees))
+
+    def rotated_bbox(x0, y0, x1, y1):
+        xs = [x * cos - y * sin for x, y in ((x0, y0), (x1, y0), (x1, y1), (x0, y1))]
+        ys = [x * sin + y * cos for x, y in ((x0, y0), (x1, y0), (x1, y1), (x0, y1))]
+        left, top, right, bottom = int(min(xs)), int(min(ys)), int(max(xs)), int(max(ys))
+        return [[left, top], [right, top], [right, bottom], [left, bottom]]
+
+    boxes = []
+    for column in range(columns):
+        x_start = column * (column_width + gutter)
+        y = 20.0
+        while len(boxes) < num_boxes * (column + 1) // columns:
+            height = rng.choice([14, 16, 18, 28]) if rng.random() < 0.2 else 16
+            x = x_start
+            while x < x_start + column_width - 40 and len(boxes) < num_boxes * (column + 1) // columns:
+                width = rng.randint(20, 70)
+                boxes.append((rotated_bbox(x, y, x + width, y + height), f"w{len(boxes)}", 1.0))
+                x += width + rng.randint(6, 12)
+            y += height * 1.6
+    truth = [box[1] for box in boxes]
+    rng.shuffle(boxes)
+    return boxes, truth
+
+
+def order_accuracy(ordered, truth) -> float:
+    # Fraction of consecutive ground-truth pairs that are also consecutive in the output
+    position = {box[1]: i for i, box in enumerate(ordered)}
+    pairs = list(zip(truth, truth[1:]))
+    if not pairs:
+        return 1.0
+    return sum(position[b] == position[a] + 1 for a, b in pairs) / len(pairs)
+
+
+def time_call(fn, boxes, repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn(boxes)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark reading-order engines on synthetic pages.")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10, 100, 500, 1000, 5000])
+    parser.add_argument("--columns", type=int, nargs="+", default=[1, 2])
+    parser.add_argument("--tilt", type=float, default=1.0, help="Page tilt in degrees.")
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    # "arrays ms" times analyze_boxes alone, for callers that already hold a box array
+    print(f"{'boxes':>6} {'cols':>4} | {'legacy ms':>10} {'acc':>6} | {'layout ms':>10} {'acc':>6} | {'arrays ms':>10}")
+    for size in args.sizes:
+        for columns in args.columns:
+            boxes, truth = synthetic_page(size, columns, args.tilt, seed=size * 10 + columns)
+            legacy_ms = time_call(legacy_sort, boxes, args.repeat) * 1000
+            layout_ms = time_call(reading_order, boxes, args.repeat) * 1000
+            arrays_ms = time_call(analyze_boxes, boxes_from_results(boxes), args.repeat) * 1000
+            legacy_acc = order_accuracy(legacy_sort(boxes), truth)
+            layout_acc = order_accuracy(reading_order(boxes), truth)
+            print(f"{size:>6} {columns:>4} | {legacy_ms:>10.2f} {legacy_acc:>6.3f} | {layout_ms:>10.2f} {layout_acc:>6.3f} | {arrays_ms:>10.2f}")
@@ -0,0 +1,396 @@
+import argparse
+import json
+import logging
+import os
+import platform
+import random
+import resource
+import subprocess
+import threading
+import time
+from typing import Dict, List, Optional
+
+import cv2
+import numpy as np
+
+from gemini_stub import start_stub_server
+
+# End-to-end benchmark: replays frames through the OCR path and drives the Flask
+# endpoints under concurrent load against the local Gemini stub, e.g.
+#   python bench_pipeline.py --frames scans/ lecture.mp4 --save-baseline main
+#   python bench_pipeline.py --frames scans/ lecture.mp4 --compare main
+# Without --frames, synthetic text frames are used. app.py is imported only after the
+# stub is running, so its Gemini client points at the stub.
+
+BASELINE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "bench_baselines")
+
+# Relative change that counts as a regression when comparing against a baseline
+DEFAULT_TOLERANCE = 0.15
+
+# Share of load-generator requests per endpoint
+ENDPOINT_WEIGHTS = {"data_words": 0.4, "data_sentences": 0.3, "post_data": 0.3}
+
+SYNTHETIC_LINES = [
+    "Project Titan Kick-off", "Key Objectives", "Define MVP features", "Review Q3 budget.",
+    "Reminder: Get sign-off by EOD.", "1. Deploy Staging", "Weekly Status Report", "Hello my name is Arthur",
+]
+
+
+def percentiles(values: List[float]) -> dict:
+    if not values:
+        return {"p50_ms": 0.0, "p95_ms": 0.0, "p99_ms": 0.0, "max_ms": 0.0, "mean_ms": 0.0}
+    ms = np.asarray(values) * 1000
+    p50, p95, p99 = np.percentile(ms, [50, 95, 99])
+    return {"p50_ms": round(float(p50), 3), "p95_ms": round(float(p95), 3), "p99_ms": round(float(p99), 3),
+            "max_ms": round(float(ms.max()), 3), "mean_ms": round(float(ms.mean()), 3)}
+
+
+def memory_usage() -> dict:
+    # ru_maxrss is KiB on Linux and bytes on macOS
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    peak_mb = peak / (1024 * 1024) if platform.system() == "Darwin" else peak / 1024
+    usage = {"peak_rss_mb": round(peak_mb, 1)}
+    try:
+        with open("/proc/self/status") as f:
+            for line in f:
+                if line.startswith("VmRSS:"):
+                    usage["rss_mb"] = round(int(line.split()[1]) / 1024, 1)
+    except OSError:
+        pass
+    return usage
+
+
+def synthetic_frames(count: int, width: int = 960, height: int = 720, seed: int = 0) -> List[np.ndarray]:
+    rng = random.Random(seed)
+    frames = []
+    for _ in range(count):
+        frame = np.full((height, width, 3), 255, dtype=np.uint8)
+        for row, line in enumerate(rng.sample(SYNTHETIC_LINES, 5)):
+            cv2.putText(frame, line, (40 + rng.randint(0, 40), 90 + row * 120),
+                        cv2.FONT_HERSHEY_SIMPLEX, 1.4, (0, 0, 0), 3)
+        frames.append(frame)
+    return frames
+
+
+def load_frames(paths: List[str], every: int, limit: int) -> List[np.ndarray]:
+    from offline_ocr import VIDEO_EXTENSIONS, iter_sources
+
+    frames = []
+    for source in iter_sources(paths):
+        if os.path.splitext(source)[1].lower() in VIDEO_EXTENSIONS:
+            cap = cv2.VideoCapture(source)
+            frame_index = 0
+            while len(frames) < limit and cap.grab():
+                if frame_index % every == 0:
+                    ret, frame = cap.retrieve()
+                    if ret:
+                        frames.append(frame)
+                frame_index += 1
+            cap.release()
+        else:
+            frame = cv2.imread(source)
+            if frame is not None:
+                frames.append(frame)
+        if len(frames) >= limit:
+            break
+    return frames[:limit]
+
+
+def bench_ocr(app, frames: List[np.ndarray], passes: int) -> Optional[dict]:
+    reader = app.initialize_ocr_reader()
+    sym_spell = app.initialize_sym_spell()
+    if reader is None or sym_spell is None:
+        print("OCR replay skipped: the EasyOCR reader or SymSpell failed to initialize.")
+        return None
+    app.warm_up_ocr_reader(reader)
+
+    stage_times = {"resize": [], "ocr": [], "sort": [], "spell": [], "total": []}
+    start_time = time.perf_counter()
+    for _ in range(passes):
+        for frame in frames:
+            t0 = time.perf_counter()
+            ocr_frame = app.resize_for_ocr(frame)
+            t1 = time.perf_counter()
+            results_unsorted, _ = app.process_frame_for_ocr(reader, ocr_frame)
+            t2 = time.perf_counter()
+            results_detailed = app.sort_results_by_location(results_unsorted)
+            t3 = time.perf_counter()
+            app.correct_and_segment_text([text for (_, text, _) in results_detailed], sym_spell)
+            t4 = time.perf_counter()
+            for stage, seconds in zip(stage_times, (t1 - t0, t2 - t1, t3 - t2, t4 - t3, t4 - t0)):
+                stage_times[stage].append(seconds)
+    elapsed = time.perf_counter() - start_time
+
+    processed = passes * len(frames)
+    return {
+        "frames": processed,
+        "fps": round(processed / elapsed, 3) if elapsed else 0.0,
+        "stages": {stage: percentiles(times) for stage, times in stage_times.items()},
+    }
+
+
+def feed_frames(app, frames: List[np.ndarray], fps: float, scene_seconds: float, stop: threading.Event) -> None:
+    # Stands in for capture_loop + render loop: a new scene every scene_seconds drives Gemini refreshes
+    session = app.get_session(None)
+    frame_index = 0
+    scene_version = 0
+    scene_started = 0.0
+    while not stop.is_set():
+        now = time.time()
+        if now - scene_started >= scene_seconds:
+            scene_version += 1
+            scene_started = now
+        frame = frames[(scene_version - 1) % len(frames)]
+        with session.capture_lock:
+            session.latest_capture = (frame_index, frame, scene_version)
+        session.mjpeg_broadcaster.publish(frame)
+        # Drained like the render loop does, so POST /data measures accepted commands, not a full queue
+        session.pop_commands()
+        frame_index += 1
+        time.sleep(1.0 / fps)
+
+
+def video_client(base_url: str, width: Optional[int], stop: threading.Event, results: list) -> None:
+    import requests
+
+    frames = 0
+    received = 0
+    tail = b""
+    start_time = time.perf_counter()
+    query = f"?width={width}" if width else ""
+    try:
+        with requests.get(f"{base_url}/video_feed{query}", stream=True, timeout=10) as response:
+            for chunk in response.iter_content(chunk_size=65536):
+                received += len(chunk)
+                # Keep a few bytes so a boundary split across chunks is still counted once
+                frames += (tail + chunk).count(b'--frame')
+                tail = chunk[-6:]
+                if stop.is_set():
+                    break
+    except Exception as e:
+        print(f"Video client error: {e}")
+    results.append({"frames": frames, "bytes": received, "seconds": time.perf_counter() - start_time})
+
+
+def load_worker(base_url: str, stop: threading.Event, seed: int, latencies: Dict[str, list],
+                errors: Dict[str, int], lock: threading.Lock) -> None:
+    import requests
+
+    rng = random.Random(seed)
+    session = requests.Session()
+    names = list(ENDPOINT_WEIGHTS)
+    weights = [ENDPOINT_WEIGHTS[name] for name in names]
+    while not stop.is_set():
+        name = rng.choices(names, weights)[0]
+        start = time.perf_counter()
+        try:
+            if name == "post_data":
+                response = session.post(f"{base_url}/data", json={"key": rng.choice("np")}, timeout=60)
+            else:
+                kind = "words" if name == "data_words" else "sentences"
+                response = session.get(f"{base_url}/data/{kind}", timeout=60)
+            failed = response.status_code >= 500
+        except Exception:
+            failed = True
+        elapsed = time.perf_counter() - start
+        with lock:
+            latencies[name].append(elapsed)
+            errors[name] += failed
+
+
+def bench_endpoints(app, frames: List[np.ndarray], args) -> dict:
+    from werkzeug.serving import make_server
+
+    # One access-log line per request would dominate the run
+    logging.getLogger('werkzeug').setLevel(logging.ERROR)
+    server = make_server('127.0.0.1', 0, app.app, threaded=True)
+    base_url = f"http://127.0.0.1:{server.server_port}"
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+
+    stop = threading.Event()
+    # The feed outlives the clients so blocked /video_feed readers still get a frame to notice stop on
+    feed_stop = threading.Event()
+    threading.Thread(target=feed_frames, args=(app, frames, args.feed_fps, args.scene_seconds, feed_stop),
+                     daemon=True).start()
+
+    video_results = []
+    video_threads = [
+        threading.Thread(target=video_client, args=(base_url, args.video_width if i % 2 else None, stop, video_results),
+                         daemon=True)
+        for i in range(args.video_clients)
+    ]
+    latencies = {name: [] for name in ENDPOINT_WEIGHTS}
+    errors = {name: 0 for name in ENDPOINT_WEIGHTS}
+    lock = threading.Lock()
+    load_threads = [
+        threading.Thread(target=load_worker, args=(base_url, stop, i, latencies, errors, lock), daemon=True)
+        for i in range(args.concurrency)
+    ]
+    for thread in video_threads + load_threads:
+        thread.start()
+    time.sleep(args.duration)
+    stop.set()
+    for thread in load_threads + video_threads:
+        thread.join(timeout=max(5.0, args.stub_latency * 4))
+    feed_stop.set()
+    server.shutdown()
+
+    endpoints = {}
+    for name, times in latencies.items():
+        endpoints[name] = {
+            "requests": len(times),
+            "errors": errors[name],
+            "rps": round(len(times) / args.duration, 2),
+            **percentiles(times),
+        }
+    total_seconds = sum(r["seconds"] for r in video_results) or 1.0
+    return {
+        "endpoints": endpoints,
+        "video_feed": {
+            "clients": len(video_results),
+            "fps_per_client": round(sum(r["frames"] for r in video_results) / total_seconds, 2),
+            "mb_per_s": round(sum(r["bytes"] for r in video_results) / total_seconds / 1e6 * len(video_results), 3),
+        },
+    }
+
+
+def git_revision() -> str:
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True,
+                              cwd=os.path.dirname(os.path.abspath(__file__))).stdout.strip()
+    except OSError:
+        return ""
+
+
+def flatten(report: dict, prefix: str = "") -> Dict[str, float]:
+    flat = {}
+    for key, value in report.items():
+        path = f"{prefix}.{key}" if prefix else key
+        if isinstance(value, dict):
+            flat.update(flatten(value, path))
+        elif isinstance(value, (int, float)) and not isinstance(value, bool):
+            flat[path] = value
+    return flat
+
+
+def lower_is_better(metric: str) -> Optional[bool]:
+    name = metric.rsplit(".", 1)[-1]
+    if name.endswith("_ms") or name.endswith("_mb") or name == "errors":
+        return True
+    if name in ("fps", "rps", "fps_per_client", "mb_per_s"):
+        return False
+    # Counts (requests, frames) depend on the run length, not on speed
+    return None
+
+
+def compare(report: dict, baseline: dict, tolerance: float) -> int:
+    current, previous = flatten(report["results"]), flatten(baseline["results"])
+    regressions = 0
+    print(f"\nComparison with baseline '{baseline['meta']['name']}' ({baseline['meta'].get('git', '?')}):")
+    print(f"{'metric':<42} {'baseline':>12} {'current':>12} {'change':>8}")
+    for metric in sorted(current.keys() & previous.keys()):
+        direction = lower_is_better(metric)
+        if direction is None:
+            continue
+        old, new = previous[metric], current[metric]
+        change = (new - old) / old if old else (0.0 if new == old else float("inf"))
+        worse = change > tolerance if direction else change < -tolerance
+        # Sub-millisecond latencies are mostly noise
+        if worse and metric.endswith("_ms") and abs(new - old) < 1.0:
+            worse = False
+        regressions += worse
+        flag = "  REGRESSION" if worse else ""
+        print(f"{metric:<42} {old:>12.3f} {new:>12.3f} {change:>+7.1%}{flag}")
+    print(f"\n{regressions} regression(s) beyond {tolerance:.0%}.")
+    return regressions
+
+
+def print_report(results: dict) -> None:
+    if results.get("ocr"):
+        ocr = results["ocr"]
+        print(f"\nOCR replay: {ocr['frames']} frames at {ocr['fps']:.2f} fps")
+        for stage, stats in ocr["stages"].items():
+            print(f"  {stage:<8} p50 {stats['p50_ms']:>9.2f} ms  p95 {stats['p95_ms']:>9.2f} ms  p99 {stats['p99_ms']:>9.2f} ms")
+    if results.get("endpoints"):
+        print(f"\n{'endpoint':<16} {'reqs':>6} {'err':>5} {'rps':>8} {'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9} {'max ms':>9}")
+        for name, stats in results["endpoints"].items():
+            print(f"{name:<16} {stats['requests']:>6} {stats['errors']:>5} {stats['rps']:>8.1f} {stats['p50_ms']:>9.2f} "
+                  f"{stats['p95_ms']:>9.2f} {stats['p99_ms']:>9.2f} {stats['max_ms']:>9.2f}")
+        video = results["video_feed"]
+        print(f"video_feed: {video['clients']} clients, {video['fps_per_client']:.1f} fps each, {video['mb_per_s']:.2f} MB/s total")
+    if results.get("gemini_stub"):
+        print(f"Gemini stub: {results['gemini_stub']['requests']} requests, {results['gemini_stub']['failures']} failed")
+    print(f"Memory: {results['memory']}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark the OCR path and Flask endpoints against a stub Gemini.")
+    parser.add_argument("--frames", nargs="*", default=[], help="Images, videos or directories to replay.")
+    parser.add_argument("--every", type=int, default=30, help="Use every Nth video frame.")
+    parser.add_argument("--limit", type=int, default=50, help="Maximum number of frames to load.")
+    parser.add_argument("--ocr-passes", type=int, default=2, help="Replays of the frame set through the OCR path.")
+    parser.add_argument("--skip-ocr", action="store_true", help="Only benchmark the endpoints.")
+    parser.add_argument("--skip-endpoints", action="store_true", help="Only benchmark the OCR path.")
+    parser.add_argument("--duration", type=float, default=15.0, help="Seconds of endpoint load.")
+    parser.add_argument("--concurrency", type=int, default=8, help="Concurrent /data clients.")
+    parser.add_argument("--video-clients", type=int, default=4, help="Concurrent /video_feed viewers.")
+    parser.add_argument("--video-width", type=int, default=480, help="Width requested by every other viewer.")
+    parser.add_argument("--feed-fps", type=float, default=30.0, help="Rate frames are published to the feed.")
+    parser.add_argument("--scene-seconds", type=float, default=2.0, help="Seconds per replayed scene (Gemini refresh).")
+    parser.add_argument("--stub-latency", type=float, default=0.5, help="Gemini stub response time in seconds.")
+    parser.add_argument("--stub-jitter", type=float, default=0.1)
+    parser.add_argument("--stub-failure-rate", type=float, default=0.05)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--save-baseline", metavar="NAME", help=f"Store the results in {BASELINE_DIR}/NAME.json.")
+    parser.add_argument("--compare", metavar="NAME", help="Compare against a stored baseline; exit 1 on regressions.")
+    parser.add_argument("--tolerance", type=float, default=DEFAULT_TOLERANCE)
+    args = parser.parse_args()
+
+    random.seed(args.seed)
+    stub = start_stub_server(0, latency=args.stub_latency, failure_rate=args.stub_failure_rate, jitter=args.stub_jitter)
+    threading.Thread(target=stub.serve_forever, daemon=True).start()
+    os.environ["GEMINI_API_URL"] = f"http://127.0.0.1:{stub.server_address[1]}/generate"
+    import app
+
+    frames = load_frames(args.frames, max(1, args.every), args.limit) if args.frames else synthetic_frames(8, seed=args.seed)
+    if not frames:
+        print("No frames could be loaded.")
+        raise SystemExit(1)
+    print(f"Loaded {len(frames)} frames; Gemini stub at {os.environ['GEMINI_API_URL']}.")
+
+    results = {}
+    if not args.skip_ocr:
+        results["ocr"] = bench_ocr(app, frames, args.ocr_passes)
+    if not args.skip_endpoints:
+        results.update(bench_endpoints(app, frames, args))
+        results["gemini_stub"] = {"requests": stub.requests, "failures": stub.failures}
+    results["memory"] = memory_usage()
+    app.gemini_client.close()
+    stub.shutdown()
+
+    print_report(results)
+    report = {
+        "meta": {
+            "name": args.save_baseline or "",
+            "git": git_revision(),
+            "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            "python": platform.python_version(),
+            "machine": platform.machine(),
+            "args": vars(args),
+            "frames": len(frames),
+        },
+        "results": results,
+    }
+
+    exit_code = 0
+    if args.compare:
+        with open(os.path.join(BASELINE_DIR, f"{args.compare}.json"), encoding='utf-8') as f:
+            exit_code = 1 if compare(report, json.load(f), args.tolerance) else 0
+    if args.save_baseline:
+        os.makedirs(BASELINE_DIR, exist_ok=True)
+        path = os.path.join(BASELINE_DIR, f"{args.save_baseline}.json")
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(report, f, indent=2)
+        print(f"Baseline saved to {path}.")
+    # Streaming clients and the stub leave non-daemon sockets behind; don't wait on them
+    os._exit(exit_code)
@@ -0,0 +1,53 @@
+import json
+import threading
+from typing import Optional
+
+from pipeline import LatestQueue
+
+
+class EventHub:
+    """Fans events out to every connected /events or /ws client.
+
+    Each subscriber gets its own bounded queue; a client that stops reading loses its
+    oldest events instead of holding memory or slowing down publishers.
+    """
+
+    def __init__(self, max_pending: int = 64):
+        self.max_pending = max_pending
+        self.published = 0
+        self._subscribers = set()
+        self._lock = threading.Lock()
+
+    def subscribe(self) -> LatestQueue:
+        subscriber = LatestQueue(self.max_pending)
+        with self._lock:
+            self._subscribers.add(subscriber)
+        return subscriber
+
+    def unsubscribe(self, subscriber: LatestQueue) -> None:
+        with self._lock:
+            self._subscribers.discard(subscriber)
+        subscriber.close()
+
+    def publish(self, event_type: str, **payload) -> None:
+        event = {"type": event_type, **payload}
+        with self._lock:
+            subscribers = list(self._subscribers)
+            self.published += 1
+        for subscriber in subscribers:
+            subscriber.put(event)
+
+    def subscriber_count(self) -> int:
+        with self._lock:
+            return len(self._subscribers)
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            return {"subscribers": len(self._subscribers), "published": self.published}
+
+
+def format_sse(event: Optional[dict]) -> str:
+    if event is None:
+        # Comment line keeps proxies and the browser from timing the stream out
+        return ": keep-alive\n\n"
+    return f"event: {event['type']}\ndata: {json.dumps(event)}\n\n"
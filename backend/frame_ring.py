@@ -0,0 +1,74 @@
+import sys
+import threading
+from typing import Tuple
+
+import numpy as np
+
+
+def read_only(array: np.ndarray) -> np.ndarray:
+    # A view that cannot be written through; it keeps the underlying buffer alive
+    view = array.view()
+    view.flags.writeable = False
+    return view
+
+
+class FrameRing:
+    """Preallocated frame buffers that are reused once nothing refers to them any more.
+
+    `acquire` returns a writable buffer for the producer to fill in place (e.g.
+    `cap.read(buffer)`, `cv2.resize(..., dst=buffer)`); consumers get `read_only` views
+    of it. A buffer is only handed out again when no view of it is alive anywhere, so
+    consumers never release anything: Python's own reference count is the handle count,
+    and a frame dropped from a queue frees its slot automatically.
+
+    The ring grows to `slots` buffers as needed. When every one is still referenced,
+    a fresh, unpooled array is returned so the producer never blocks.
+    """
+
+    def __init__(self, slots: int = 8):
+        self.slots = slots
+        self._buffers = []
+        self._lock = threading.Lock()
+        # References an idle buffer has in `sys.getrefcount(self._buffers[i])`: the list and the call
+        probe = [np.empty(0)]
+        self._free_refcount = sys.getrefcount(probe[0])
+
+        self.allocated = 0
+        self.reused = 0
+        self.exhausted = 0
+
+    def acquire(self, shape: Tuple[int, ...], dtype=np.uint8) -> np.ndarray:
+        dtype = np.dtype(dtype)
+        with self._lock:
+            replaceable = None
+            for i in range(len(self._buffers)):
+                if sys.getrefcount(self._buffers[i]) != self._free_refcount:
+                    continue
+                if self._buffers[i].shape == shape and self._buffers[i].dtype == dtype:
+                    self.reused += 1
+                    return self._buffers[i]
+                replaceable = i
+
+            buffer = np.empty(shape, dtype)
+            if len(self._buffers) < self.slots:
+                self._buffers.append(buffer)
+            elif replaceable is not None:
+                # The frame size changed (new camera mode); retire an idle buffer of the old size
+                self._buffers[replaceable] = buffer
+            else:
+                self.exhausted += 1
+                return buffer
+            self.allocated += 1
+            return buffer
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            in_use = sum(sys.getrefcount(self._buffers[i]) != self._free_refcount for i in range(len(self._buffers)))
+            return {
+                "buffers": len(self._buffers),
+                "in_use": in_use,
+                "mb": round(sum(buffer.nbytes for buffer in self._buffers) / 1e6, 1),
+                "allocated": self.allocated,
+                "reused": self.reused,
+                "exhausted": self.exhausted,
+            }
@@ -0,0 +1,81 @@
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Optional
+
+from scene_change import hash_distance
+
+
+class GeminiCache:
+    """LRU/TTL cache of Gemini results keyed by (perceptual frame hash, prompt, structured flag).
+
+    A lookup hits when a stored entry with the same prompt and flag has a frame hash
+    within `max_distance` bits of the query, so near-duplicate frames of the same
+    page share one API call.
+    """
+
+    def __init__(self, max_entries: int = 64, ttl: float = 300.0, max_distance: int = 10):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.max_distance = max_distance
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def _expire(self, now: float) -> None:
+        expired = [key for key, (_, stored_at) in self._entries.items() if now - stored_at > self.ttl]
+        for key in expired:
+            del self._entries[key]
+
+    def _find(self, frame_hash: int, prompt: str, structured: bool) -> Optional[tuple]:
+        key = (frame_hash, prompt, structured)
+        if key in self._entries:
+            return key
+        best_key, best_distance = None, self.max_distance + 1
+        for cached_hash, cached_prompt, cached_structured in self._entries:
+            if cached_prompt != prompt or cached_structured != structured:
+                continue
+            distance = hash_distance(frame_hash, cached_hash)
+            if distance < best_distance:
+                best_key, best_distance = (cached_hash, cached_prompt, cached_structured), distance
+        return best_key
+
+    def get(self, frame_hash: int, prompt: str, structured: bool) -> Optional[Any]:
+        with self._lock:
+            self._expire(time.time())
+            key = self._find(frame_hash, prompt, structured)
+            if key is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            value = self._entries[key][0]
+        return list(value) if isinstance(value, list) else value
+
+    def put(self, frame_hash: int, prompt: str, structured: bool, value: Any) -> None:
+        if isinstance(value, list):
+            value = list(value)
+        with self._lock:
+            key = (frame_hash, prompt, structured)
+            self._entries[key] = (value, time.time())
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "size": len(self._entries),
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "hit_rate": round(self.hits / lookups, 3) if lookups else 0.0,
+            }
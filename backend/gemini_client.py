@@ -0,0 +1,99 @@
+import json
+import random
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, Callable, Hashable, Union
+
+import requests
+from requests.adapters import HTTPAdapter
+
+RETRY_STATUS_CODES = {429, 500, 502, 503, 504}
+
+
+class GeminiClient:
+    """Pooled, non-blocking client for the Gemini REST endpoint.
+
+    Calls run on a bounded thread pool sharing one keep-alive `requests.Session`, so
+    callers get a Future instead of blocking. Submissions with the same key while one
+    is still in flight share its Future rather than making a second upstream call.
+    """
+
+    def __init__(self, api_url: str, max_concurrency: int = 4, max_retries: int = 3,
+                 base_delay: float = 1.0, max_delay: float = 8.0, timeout: float = 20):
+        self.api_url = api_url
+        self.max_retries = max_retries
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.timeout = timeout
+
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=max_concurrency)
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
+        self.session.headers.update({'Content-Type': 'application/json'})
+
+        self._executor = ThreadPoolExecutor(max_workers=max_concurrency, thread_name_prefix="gemini")
+        self._inflight = {}
+        self._lock = threading.Lock()
+
+        self.submitted = 0
+        self.coalesced = 0
+        self.retries = 0
+
+    def _backoff(self, attempt: int) -> float:
+        # Full jitter: spreads retries from concurrent callers apart
+        return random.uniform(0, min(self.max_delay, self.base_delay * (2 ** attempt)))
+
+    def post_json(self, payload: Union[dict, bytes]) -> dict:
+        # An already serialized body is sent as is
+        body = payload if isinstance(payload, bytes) else json.dumps(payload)
+        for attempt in range(self.max_retries):
+            last_attempt = attempt == self.max_retries - 1
+            try:
+                response = self.session.post(self.api_url, data=body, timeout=self.timeout)
+            except (requests.exceptions.ConnectionError, requests.exceptions.Timeout) as e:
+                if last_attempt:
+                    raise
+                delay = self._backoff(attempt)
+                print(f"Gemini connection error ({e.__class__.__name__}). Retrying in {delay:.2f}s...")
+            else:
+                if response.status_code not in RETRY_STATUS_CODES or last_attempt:
+                    response.raise_for_status()
+                    return response.json()
+                delay = self._backoff(attempt)
+                print(f"Server error ({response.status_code}). Retrying in {delay:.2f}s...")
+            self.retries += 1
+            time.sleep(delay)
+        raise RuntimeError("Gemini request retries exhausted")
+
+    def submit(self, key: Hashable, fn: Callable[..., Any], *args) -> Future:
+        with self._lock:
+            future = self._inflight.get(key)
+            if future is not None:
+                self.coalesced += 1
+                return future
+            future = self._executor.submit(fn, *args)
+            self._inflight[key] = future
+            self.submitted += 1
+        future.add_done_callback(lambda _: self._release(key, future))
+        return future
+
+    def _release(self, key: Hashable, future: Future) -> None:
+        with self._lock:
+            if self._inflight.get(key) is future:
+                del self._inflight[key]
+
+    def close(self) -> None:
+        self._executor.shutdown(wait=False, cancel_futures=True)
+        self.session.close()
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            inflight = len(self._inflight)
+        return {
+            "submitted": self.submitted,
+            "coalesced": self.coalesced,
+            "retries": self.retries,
+            "inflight": inflight,
+        }
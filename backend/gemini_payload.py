@@ -0,0 +1,143 @@
+import threading
+import time
+from statistics import median
+from typing import List, Optional, Tuple
+
+import cv2
+import numpy as np
+
+from incremental_ocr import bbox_to_rect
+
+
+class PayloadShaper:
+    """Turns a camera frame into the smallest JPEG that still lets Gemini read its text.
+
+    The frame is converted to greyscale and, given local OCR boxes, downscaled until
+    their median text height is `target_text_height`, capped at `max_side`. The JPEG
+    quality is then searched to fit `byte_budget`. The whole frame is sent whenever it
+    fits, since Gemini is the fallback for text EasyOCR missed. Only when it does not is
+    the frame cropped to the union of the boxes, padded by `padding` line heights (and,
+    with `mask`, everything outside the padded boxes blanked). If even `min_quality`
+    does not fit, the image shrinks further.
+    """
+
+    def __init__(self, byte_budget: int = 60_000, min_quality: int = 40, max_quality: int = 90,
+                 target_text_height: int = 28, max_side: int = 1600, padding: float = 2.0,
+                 grayscale: bool = True, mask: bool = False):
+        self.byte_budget = byte_budget
+        self.min_quality = min_quality
+        self.max_quality = max_quality
+        self.target_text_height = target_text_height
+        self.max_side = max_side
+        self.padding = padding
+        self.grayscale = grayscale
+        self.mask = mask
+
+        self.calls = 0
+        self.text_region_calls = 0
+        self.total_bytes = 0
+        self.total_source_pixels = 0
+        self.total_sent_pixels = 0
+        self.last = {}
+        self._lock = threading.Lock()
+
+    def _crop(self, frame, rects: List[Tuple[int, int, int, int]],
+              text_height: float) -> Tuple[np.ndarray, Tuple[int, int, int, int]]:
+        height, width = frame.shape[:2]
+        pad = max(8, int(text_height * self.padding))
+        padded = [(max(0, x0 - pad), max(0, y0 - pad), min(width, x1 + pad), min(height, y1 + pad))
+                  for x0, y0, x1, y1 in rects]
+        region = (min(r[0] for r in padded), min(r[1] for r in padded),
+                  max(r[2] for r in padded), max(r[3] for r in padded))
+        crop = frame[region[1]:region[3], region[0]:region[2]]
+        if self.mask:
+            masked = np.full_like(crop, 255)
+            for x0, y0, x1, y1 in padded:
+                x0, y0, x1, y1 = x0 - region[0], y0 - region[1], x1 - region[0], y1 - region[1]
+                masked[y0:y1, x0:x1] = crop[y0:y1, x0:x1]
+            crop = masked
+        return crop, region
+
+    def _encode(self, image, scale: float, attempts: int) -> Tuple[np.ndarray, int, np.ndarray]:
+        # JPEG, quality and resized image at `scale`, shrinking by the overshoot while even the
+        # lowest quality is over budget (up to `attempts` sizes in all)
+        scale = min(scale, self.max_side / max(image.shape[:2]))
+        for _ in range(attempts):
+            size = (max(1, int(image.shape[1] * scale)), max(1, int(image.shape[0] * scale)))
+            resized = cv2.resize(image, size, interpolation=cv2.INTER_AREA) if scale < 1.0 else image
+            jpeg, quality = self._fit_quality(resized)
+            if jpeg.size <= self.byte_budget:
+                break
+            scale *= 0.9 * (self.byte_budget / jpeg.size) ** 0.5
+        return jpeg, quality, resized
+
+    def shape(self, frame, boxes: Optional[List] = None) -> Tuple[np.ndarray, dict]:
+        # boxes are EasyOCR bboxes in frame pixels; returns the encoded JPEG and what was done to it
+        start_time = time.perf_counter()
+        height, width = frame.shape[:2]
+        image = frame
+        if self.grayscale and image.ndim == 3:
+            image = cv2.cvtColor(image, cv2.COLOR_BGR2GRAY)
+
+        region, source = (0, 0, width, height), "full_frame"
+        if boxes:
+            rects = [bbox_to_rect(bbox) for bbox in boxes]
+            text_height = max(1.0, median(y1 - y0 for _, y0, _, y1 in rects))
+            scale = min(1.0, self.target_text_height / text_height)
+            jpeg, quality, resized = self._encode(image, scale, attempts=1)
+            if jpeg.size > self.byte_budget:
+                # The whole frame at a readable size is over budget: keep only the text EasyOCR found
+                crop, region = self._crop(image, rects, text_height)
+                jpeg, quality, resized = self._encode(crop, scale, attempts=4)
+                source = "text_regions"
+        else:
+            jpeg, quality, resized = self._encode(image, 1.0, attempts=4)
+
+        info = {
+            "bytes": int(jpeg.size),
+            "quality": quality,
+            "width": resized.shape[1],
+            "height": resized.shape[0],
+            "source": source,
+            "region": list(region),
+            "shape_ms": round((time.perf_counter() - start_time) * 1000, 2),
+        }
+        with self._lock:
+            self.calls += 1
+            self.text_region_calls += source == "text_regions"
+            self.total_bytes += jpeg.size
+            self.total_source_pixels += width * height
+            self.total_sent_pixels += resized.shape[0] * resized.shape[1]
+            self.last = info
+        return jpeg, info
+
+    def _fit_quality(self, image) -> Tuple[np.ndarray, int]:
+        # Highest quality within the budget (binary search), else the lowest quality
+        def encode(quality: int) -> np.ndarray:
+            return cv2.imencode('.jpg', image, [int(cv2.IMWRITE_JPEG_QUALITY), quality])[1]
+
+        best = encode(self.max_quality)
+        if best.size <= self.byte_budget:
+            return best, self.max_quality
+        low, high, best_quality = self.min_quality, self.max_quality - 1, None
+        while low <= high:
+            quality = (low + high) // 2
+            jpeg = encode(quality)
+            if jpeg.size <= self.byte_budget:
+                best, best_quality, low = jpeg, quality, quality + 1
+            else:
+                high = quality - 1
+        if best_quality is None:
+            return encode(self.min_quality), self.min_quality
+        return best, best_quality
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            return {
+                "calls": self.calls,
+                "text_region_calls": self.text_region_calls,
+                "avg_bytes": round(self.total_bytes / self.calls) if self.calls else 0,
+                "pixel_ratio": round(self.total_sent_pixels / self.total_source_pixels, 3)
+                if self.total_source_pixels else 0.0,
+                "last": dict(self.last),
+            }
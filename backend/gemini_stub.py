@@ -0,0 +1,72 @@
+import argparse
+import json
+import random
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+# Local stand-in for the Gemini generateContent endpoint.
+# Run it, then start app.py with GEMINI_API_URL=http://127.0.0.1:8765/generate
+
+DEFAULT_WORDS = ["My", "name", "is", "Arthur"]
+
+
+def make_handler(words, latency: float, failure_rate: float, jitter: float = 0.0):
+    class GeminiStubHandler(BaseHTTPRequestHandler):
+        def do_POST(self):
+            length = int(self.headers.get('Content-Length', 0))
+            body = json.loads(self.rfile.read(length) or b"{}")
+            time.sleep(max(0.0, latency + random.uniform(-jitter, jitter)))
+
+            failed = random.random() < failure_rate
+            with self.server.stats_lock:
+                self.server.requests += 1
+                self.server.failures += failed
+            if failed:
+                self.send_response(503)
+                self.end_headers()
+                return
+
+            structured = body.get("generationConfig", {}).get("responseMimeType") == "application/json"
+            text = json.dumps(words) if structured else "You are currently looking at a stub image."
+            reply = {"candidates": [{"content": {"parts": [{"text": text}]}}]}
+            encoded = json.dumps(reply).encode('utf-8')
+
+            self.send_response(200)
+            self.send_header('Content-Type', 'application/json')
+            self.send_header('Content-Length', str(len(encoded)))
+            self.end_headers()
+            self.wfile.write(encoded)
+
+        def log_message(self, format, *args):
+            pass
+
+    return GeminiStubHandler
+
+
+def start_stub_server(port: int = 8765, words=None, latency: float = 0.0, failure_rate: float = 0.0,
+                      jitter: float = 0.0) -> ThreadingHTTPServer:
+    # port=0 picks a free port; read it back from server.server_address
+    handler = make_handler(words or DEFAULT_WORDS, latency, failure_rate, jitter)
+    server = ThreadingHTTPServer(('127.0.0.1', port), handler)
+    server.requests = 0
+    server.failures = 0
+    server.stats_lock = threading.Lock()
+    return server
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Fake Gemini endpoint for local testing.")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--latency", type=float, default=0.5, help="Seconds to wait before answering.")
+    parser.add_argument("--jitter", type=float, default=0.0, help="Latency varies uniformly by +/- this many seconds.")
+    parser.add_argument("--failure-rate", type=float, default=0.0, help="Fraction of requests answered with 503.")
+    parser.add_argument("--words", nargs="*", default=DEFAULT_WORDS)
+    args = parser.parse_args()
+
+    server = start_stub_server(args.port, args.words, args.latency, args.failure_rate, args.jitter)
+    print(f"Gemini stub listening on http://127.0.0.1:{args.port}/generate")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        server.server_close()
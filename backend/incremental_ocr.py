@@ -0,0 +1,116 @@
+from typing import List, Optional, Tuple
+
+import cv2
+
+OcrResult = Tuple[List[List[int]], str, float]
+
+
+def bbox_to_rect(bbox) -> Tuple[int, int, int, int]:
+    xs = [p[0] for p in bbox]
+    ys = [p[1] for p in bbox]
+    return int(min(xs)), int(min(ys)), int(max(xs)), int(max(ys))
+
+
+def rect_iou(a: Tuple[int, int, int, int], b: Tuple[int, int, int, int]) -> float:
+    inter_w = min(a[2], b[2]) - max(a[0], b[0])
+    inter_h = min(a[3], b[3]) - max(a[1], b[1])
+    if inter_w <= 0 or inter_h <= 0:
+        return 0.0
+    inter = inter_w * inter_h
+    union = (a[2] - a[0]) * (a[3] - a[1]) + (b[2] - b[0]) * (b[3] - b[1]) - inter
+    return inter / union if union > 0 else 0.0
+
+
+class IncrementalOcr:
+    """Runs EasyOCR detection every pass but recognition only on boxes whose pixels changed.
+
+    Each detected box is matched to a previous result by IoU. If the grey pixels inside
+    it differ from the previous frame by less than `change_threshold`, the cached text
+    and confidence are reused. Every `full_refresh_every` passes all boxes are
+    re-recognized so a bad read cannot stick forever.
+    """
+
+    def __init__(self, reader, batch_size: int = 1, decoder: str = 'greedy',
+                 iou_threshold: float = 0.6, change_threshold: float = 8.0,
+                 full_refresh_every: int = 10):
+        self.reader = reader
+        self.batch_size = batch_size
+        self.decoder = decoder
+        self.iou_threshold = iou_threshold
+        self.change_threshold = change_threshold
+        self.full_refresh_every = full_refresh_every
+
+        self.passes = 0
+        self.last_reused = 0
+        self.last_recognized = 0
+
+        self._previous_grey = None
+        self._previous_results: List[OcrResult] = []
+
+    def reset(self) -> None:
+        self._previous_grey = None
+        self._previous_results = []
+
+    def _match_previous(self, rect, grey) -> Optional[OcrResult]:
+        best, best_iou = None, self.iou_threshold
+        for result in self._previous_results:
+            iou = rect_iou(rect, bbox_to_rect(result[0]))
+            if iou >= best_iou:
+                best, best_iou = result, iou
+        if best is None:
+            return None
+
+        x0, y0, x1, y1 = rect
+        x0, y0 = max(0, x0), max(0, y0)
+        region = grey[y0:y1, x0:x1]
+        previous_region = self._previous_grey[y0:y1, x0:x1]
+        if region.size == 0 or cv2.absdiff(region, previous_region).mean() > self.change_threshold:
+            return None
+        return best
+
+    def readtext(self, frame) -> List[OcrResult]:
+        grey = cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY) if frame.ndim == 3 else frame
+        if self._previous_grey is not None and self._previous_grey.shape != grey.shape:
+            self.reset()
+
+        horizontal_list, free_list = self.reader.detect(frame)
+        horizontal_list, free_list = horizontal_list[0], free_list[0]
+
+        full_refresh = self._previous_grey is None or self.passes % self.full_refresh_every == 0
+        self.passes += 1
+
+        reused: List[OcrResult] = []
+        to_recognize = []
+        for x_min, x_max, y_min, y_max in horizontal_list:
+            rect = (int(x_min), int(y_min), int(x_max), int(y_max))
+            match = None if full_refresh else self._match_previous(rect, grey)
+            if match is None:
+                to_recognize.append([x_min, x_max, y_min, y_max])
+            else:
+                bbox = [[rect[0], rect[1]], [rect[2], rect[1]], [rect[2], rect[3]], [rect[0], rect[3]]]
+                reused.append((bbox, match[1], match[2]))
+
+        recognized: List[OcrResult] = []
+        if to_recognize or free_list:
+            recognized = self.reader.recognize(
+                grey,
+                horizontal_list=to_recognize,
+                free_list=free_list,
+                detail=1,
+                batch_size=self.batch_size,
+                decoder=self.decoder,
+            )
+
+        results = reused + [tuple(r) for r in recognized]
+        self.last_reused = len(reused)
+        self.last_recognized = len(recognized)
+        self._previous_grey = grey
+        self._previous_results = results
+        return results
+
+    def snapshot(self) -> dict:
+        return {
+            "passes": self.passes,
+            "last_reused": self.last_reused,
+            "last_recognized": self.last_recognized,
+        }
@@ -0,0 +1,204 @@
+from itertools import chain
+from operator import itemgetter
+from typing import List, Tuple
+
+import numpy as np
+
+OcrResult = Tuple[List[List[int]], str, float]
+
+# Top-left and bottom-right corners of a four-point box
+DIAGONAL = itemgetter(0, 2)
+
+# Two boxes sit on the same line when their vertical overlap covers this fraction of the shorter one
+LINE_OVERLAP = 0.5
+# Minimum gutter width between columns, in median box heights
+COLUMN_GAP = 1.5
+# Boxes allowed to cross a gutter (spanning titles), as a fraction of all boxes
+GUTTER_TOLERANCE = 0.02
+# A column needs at least this many boxes to count
+MIN_COLUMN_BOXES = 2
+# Vertical gap between lines, in median heights, that starts a new paragraph
+PARAGRAPH_GAP = 0.8
+# Indent of a line past the previous line's left edge, in median heights, that starts a new paragraph
+PARAGRAPH_INDENT = 1.0
+# Tilts below this many degrees are left alone; fewer boxes than MIN_SKEW_BOXES give no usable estimate
+MIN_SKEW_DEGREES = 0.3
+MIN_SKEW_SLOPE = float(np.tan(np.radians(MIN_SKEW_DEGREES)))
+MIN_SKEW_BOXES = 6
+# Neighbours used for the tilt estimate: centres at most this many median heights apart, on
+# lines no steeper than MAX_SKEW_SLOPE (about 15 degrees)
+SKEW_NEIGHBOUR_DISTANCE = 6.0
+MAX_SKEW_SLOPE = 0.27
+
+
+def boxes_from_results(results: List[OcrResult]) -> np.ndarray:
+    # (n, 4) array of x0, y0, x1, y1 from EasyOCR's four-point boxes, taken from the first and
+    # third corners (top-left, bottom-right). That halves the per-box Python work, the one cost
+    # here that grows with the page, and for a tilted quad gives its centre exactly and a size
+    # closer to the text's own than the quad's bounds. fromiter over one flat stream is several
+    # times faster than asarray on the nested lists.
+    corners = map(DIAGONAL, map(itemgetter(0), results))
+    points = np.fromiter(chain.from_iterable(chain.from_iterable(corners)), dtype=np.float64,
+                         count=len(results) * 4).reshape(len(results), 2, 2)
+    boxes = np.empty((len(results), 4))
+    np.minimum(points[:, 0], points[:, 1], out=boxes[:, :2])
+    np.maximum(points[:, 0], points[:, 1], out=boxes[:, 2:])
+    return boxes
+
+
+def sorted_median(values: np.ndarray) -> float:
+    # np.median's overhead dominates at the sizes a page has
+    ordered = np.sort(values)
+    return float(ordered[(len(ordered) - 1) // 2] + ordered[len(ordered) // 2]) / 2
+
+
+def group_order(group: np.ndarray, value: np.ndarray) -> np.ndarray:
+    # np.lexsort((value, group)) as one stable argsort over a combined key; several times faster.
+    # group holds whole numbers, so each group gets its own span of keys wider than value's range
+    low = value.min()
+    return np.argsort(group * (value.max() - low + 1) + (value - low), kind='stable')
+
+
+def estimate_skew(cx: np.ndarray, cy: np.ndarray, median_height: float) -> float:
+    # Page tilt in radians (positive when lines run down to the right): the median slope between
+    # each box and the next one along its line. Neighbours are consecutive boxes, by x, within a
+    # band one line high. If the first estimate is a real tilt, the bands are tilted to follow it
+    # and the estimate repeated, so pairs a steep line carried across a band edge count too.
+    if len(cx) < MIN_SKEW_BOXES:
+        return 0.0
+    slope = 0.0
+    for _ in range(2):
+        row = np.floor((cy - cx * slope) / median_height if slope else cy / median_height)
+        by_row = group_order(row, cx)
+        sx, sy, srow = cx[by_row], cy[by_row], row[by_row]
+        dx, dy = sx[1:] - sx[:-1], sy[1:] - sy[:-1]
+        pairs = ((srow[1:] == srow[:-1]) & (dx > 0) & (dx < SKEW_NEIGHBOUR_DISTANCE * median_height)
+                 & (np.abs(dy) < dx * MAX_SKEW_SLOPE))
+        if np.count_nonzero(pairs) < MIN_SKEW_BOXES // 2:
+            return 0.0
+        slope = sorted_median(dy[pairs] / dx[pairs])
+        if abs(slope) < MIN_SKEW_SLOPE:
+            return 0.0
+    return float(np.arctan(slope))
+
+
+def find_column_splits(x0: np.ndarray, x1: np.ndarray, median_height: float) -> np.ndarray:
+    n = len(x0)
+    left, right = x0.min(), x1.max()
+    bins = int(min(4096, max(1, right - left)))
+    scale = bins / max(1e-9, right - left)
+
+    # Difference array: how many boxes cover each x bin
+    starts = np.minimum(((x0 - left) * scale).astype(np.int64), bins - 1)
+    ends = np.maximum(np.ceil((x1 - left) * scale).astype(np.int64), 1)
+    delta = np.bincount(starts, minlength=bins + 1) - np.bincount(ends, minlength=bins + 1)
+    coverage = np.cumsum(delta[:bins])
+
+    sparse = coverage <= max(0, int(GUTTER_TOLERANCE * n))
+    # Runs of sparse bins that have content on both sides
+    edges = np.flatnonzero(np.diff(np.concatenate([[0], sparse.astype(np.int8), [0]])))
+    run_starts, run_ends = edges[0::2], edges[1::2]
+    keep = (run_starts > 0) & (run_ends < bins) & ((run_ends - run_starts) / scale >= COLUMN_GAP * median_height)
+    if not keep.any():
+        return np.zeros(0)
+    splits = left + (run_starts[keep] + run_ends[keep]) / 2 / scale
+
+    # Drop splits that would leave a column with too few boxes
+    while len(splits):
+        counts = np.bincount(np.searchsorted(splits, (x0 + x1) / 2), minlength=len(splits) + 1)
+        if counts.min() >= MIN_COLUMN_BOXES:
+            break
+        thin = int(np.argmin(counts))
+        splits = np.delete(splits, min(thin, len(splits) - 1))
+    return splits
+
+
+def analyze_boxes(boxes: np.ndarray) -> dict:
+    """Reading order plus line, column and paragraph grouping for an (n, 4) box array.
+
+    A tilted page is first rotated back: the tilt is estimated from how neighbouring
+    boxes line up (`estimate_skew`), and the grouping below runs on the box centres
+    rotated by it. Columns come from gutters in the x coverage of all boxes; boxes that
+    cross a gutter (titles) split the page into bands read top to bottom. Within a band,
+    columns are read left to right, lines are clusters of vertically overlapping boxes
+    and words in a line go left to right. All per-box arrays are indexed like `boxes`;
+    "skew" is in radians.
+    """
+    n = len(boxes)
+    if n == 0:
+        empty = np.zeros(0, dtype=np.int64)
+        return {"order": empty, "line": empty, "column": empty, "paragraph": empty, "band": empty, "skew": 0.0}
+
+    x0, y0, x1, y1 = boxes.T
+    heights = np.maximum(y1 - y0, 1.0)
+    median_height = sorted_median(heights)
+    cx, cy = (x0 + x1) / 2, (y0 + y1) / 2
+    skew = estimate_skew(cx, cy, median_height)
+    if skew:
+        # Rotate the centres back (about the origin; only relative positions matter) and keep the sizes
+        cos, sin = np.cos(skew), np.sin(skew)
+        cx, cy = cx * cos + cy * sin, cy * cos - cx * sin
+        half_width, half_height = (x1 - x0) / 2, (y1 - y0) / 2
+        x0, y0, x1, y1 = cx - half_width, cy - half_height, cx + half_width, cy + half_height
+
+    splits = find_column_splits(x0, x1, median_height)
+    if len(splits):
+        column = np.searchsorted(splits, cx)
+        spanning = ((x0[:, None] < splits[None, :]) & (x1[:, None] > splits[None, :])).any(axis=1)
+        # Bands: even ids between spanning boxes, odd ids for the spanning boxes themselves
+        span_index = np.flatnonzero(spanning)
+        span_cy = np.sort(cy[span_index])
+        band = 2 * np.searchsorted(span_cy, cy)
+        band[span_index] = 2 * np.searchsorted(span_cy, cy[span_index]) + 1
+        column[spanning] = 0
+        by_y = group_order(band * (len(splits) + 1) + column, cy)
+    else:
+        column = np.zeros(n, dtype=np.int64)
+        band = np.zeros(n, dtype=np.int64)
+        by_y = np.argsort(cy, kind='stable')
+
+    # Lines: walk each (band, column) group top to bottom, break where neighbours stop overlapping
+    sy0, sy1, sh = y0[by_y], y1[by_y], heights[by_y]
+    overlap = np.minimum(sy1[1:], sy1[:-1]) - np.maximum(sy0[1:], sy0[:-1])
+    same_line = overlap >= LINE_OVERLAP * np.minimum(sh[1:], sh[:-1])
+    if len(splits):
+        sband, scolumn = band[by_y], column[by_y]
+        same_line &= (sband[1:] == sband[:-1]) & (scolumn[1:] == scolumn[:-1])
+    line_start = np.concatenate([[True], ~same_line])
+    line_sorted = np.cumsum(line_start) - 1
+    line = np.empty(n, dtype=np.int64)
+    line[by_y] = line_sorted
+
+    order = group_order(line, x0)
+
+    # Paragraphs: compare each line's extent with the previous line in the same group. Lines are
+    # contiguous runs of by_y, so their extents are one reduceat each
+    starts = np.flatnonzero(line_start)
+    line_top = np.minimum.reduceat(sy0, starts)
+    line_bottom = np.maximum.reduceat(sy1, starts)
+    line_left = np.minimum.reduceat(x0[by_y], starts)
+    breaks = ((line_top[1:] - line_bottom[:-1] > PARAGRAPH_GAP * median_height)
+              | (line_left[1:] - line_left[:-1] > PARAGRAPH_INDENT * median_height))
+    if len(splits):
+        first = by_y[starts]
+        breaks |= (band[first][1:] != band[first][:-1]) | (column[first][1:] != column[first][:-1])
+    line_paragraph = np.concatenate([[0], np.cumsum(breaks)])
+
+    return {
+        "order": order,
+        "line": line,
+        "column": column,
+        "paragraph": line_paragraph[line],
+        "band": band,
+        "skew": skew,
+    }
+
+
+def analyze_layout(results: List[OcrResult]) -> dict:
+    if not results:
+        return analyze_boxes(np.zeros((0, 4)))
+    return analyze_boxes(boxes_from_results(results))
+
+
+def reading_order(results: List[OcrResult]) -> List[OcrResult]:
+    return [results[i] for i in analyze_layout(results)["order"].tolist()]
@@ -0,0 +1,100 @@
+import re
+from typing import List
+
+import numpy as np
+
+from layout import analyze_boxes
+
+# Labels match JSON_SCHEMA in test_gemini.py
+LINE_TYPES = ["header", "bullet", "sentence", "note", "todo"]
+
+TODO_PATTERN = re.compile(r'^\s*(\d+[.)]|\[[ xX]?\]|todo\b|to-do\b)', re.IGNORECASE)
+BULLET_PATTERN = re.compile(r'^\s*[-*•·▪‣o]\s+')
+NOTE_PATTERN = re.compile(r'^\s*(reminder|note|nb|n\.b\.|fyi|remember|important|don\'t forget)\b', re.IGNORECASE)
+SENTENCE_END = re.compile(r'[.!?]["\')\]]?\s*$')
+
+# Left-edge offset from the column edge, in median line heights, that counts as indented
+INDENT_RATIO = 0.5
+# Vertical gap, in median line heights, under which indented neighbours form a list
+LIST_GAP_RATIO = 0.75
+
+
+def line_features(data: List[dict]) -> List[dict]:
+    # data items are {"text", "bbox": [Ymin, Xmin, Ymax, Xmax]}, as sent to Gemini
+    bboxes = np.asarray([item["bbox"] for item in data], dtype=np.float64).reshape(len(data), 4)
+    boxes = bboxes[:, [1, 0, 3, 2]]
+    layout = analyze_boxes(boxes)
+    x0, y0, x1, y1 = boxes.T
+    heights = np.maximum(y1 - y0, 1.0)
+    median_height = float(np.median(heights)) if len(data) else 1.0
+
+    group = layout["band"] * 1000 + layout["column"]
+    column_left = {g: x0[group == g].min() for g in np.unique(group)}
+
+    columns = {}
+    for index in layout["order"]:
+        columns.setdefault(group[index], []).append(int(index))
+
+    features = [None] * len(data)
+    for g, same_column in columns.items():
+        for k, index in enumerate(same_column):
+            previous = same_column[k - 1] if k > 0 else None
+            following = same_column[k + 1] if k + 1 < len(same_column) else None
+            gap_above = None if previous is None else (y0[index] - y1[previous]) / median_height
+            gap_below = None if following is None else (y0[following] - y1[index]) / median_height
+            text = data[index]["text"].strip()
+
+            features[index] = {
+                "words": len(text.split()),
+                "indent": (x0[index] - column_left[g]) / median_height,
+                "gap_above": gap_above,
+                "height": heights[index] / median_height,
+                # (indent, gap) of the lines directly above and below in the same column
+                "neighbours": [
+                    ((x0[j] - column_left[g]) / median_height, gap)
+                    for j, gap in ((previous, gap_above), (following, gap_below)) if j is not None
+                ],
+                "numbered": bool(TODO_PATTERN.match(text)),
+                "bullet_marker": bool(BULLET_PATTERN.match(text)),
+                "note_keyword": bool(NOTE_PATTERN.match(text)),
+                "sentence_end": bool(SENTENCE_END.search(text)),
+                "title_case": all(w[:1].isupper() or not w[:1].isalpha() for w in text.split()),
+                "first_in_column": previous is None,
+            }
+    return features
+
+
+def classify_line(f: dict) -> tuple:
+    if f["numbered"]:
+        return "todo", 0.95
+    if f["note_keyword"]:
+        return "note", 0.9
+    if f["bullet_marker"]:
+        return "bullet", 0.9
+
+    indented = f["indent"] >= INDENT_RATIO
+    if indented and not f["sentence_end"]:
+        listed = any(indent >= INDENT_RATIO and gap <= LIST_GAP_RATIO for indent, gap in f["neighbours"])
+        return "bullet", 0.85 if listed else 0.65
+
+    if f["sentence_end"]:
+        return "sentence", 0.9 if f["words"] >= 3 else 0.7
+    if f["words"] <= 6:
+        header_votes = sum([f["title_case"], f["first_in_column"] or (f["gap_above"] or 0) > 1.0, f["height"] > 1.2])
+        return "header", 0.6 + 0.1 * header_votes
+    return "sentence", 0.6
+
+
+def classify_lines(data: List[dict]) -> List[dict]:
+    """Labels OCR lines as header/bullet/sentence/note/todo from geometry and text.
+
+    Returns JSON_SCHEMA-shaped items plus a `confidence` in [0, 1]; callers can send
+    only the low-confidence lines to Gemini.
+    """
+    if not data:
+        return []
+    results = []
+    for item, features in zip(data, line_features(data)):
+        line_type, confidence = classify_line(features)
+        results.append({"text": item["text"], "type": line_type, "confidence": round(float(confidence), 2)})
+    return results
@@ -0,0 +1,260 @@
+import json
+import re
+import threading
+import time
+from collections import OrderedDict, deque
+from contextlib import contextmanager
+from typing import Callable, Dict, Hashable, Iterable, Optional
+
+# Latency buckets in seconds, from a sub-millisecond cache hit to a slow Gemini call
+DEFAULT_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+QUANTILES = (0.5, 0.95, 0.99)
+
+METRIC_NAME_INVALID = re.compile(r'[^a-zA-Z0-9_]')
+
+
+def format_labels(labels: tuple, extra: Optional[tuple] = None) -> str:
+    pairs = list(labels) + ([extra] if extra else [])
+    if not pairs:
+        return ""
+    escaped = (str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n') for _, value in pairs)
+    return "{" + ",".join(f'{key}="{value}"' for (key, _), value in zip(pairs, escaped)) + "}"
+
+
+def format_value(value: float) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+class Histogram:
+    """Cumulative-bucket histogram plus a window of recent samples for quantiles."""
+
+    def __init__(self, buckets: tuple = DEFAULT_BUCKETS, window: int = 1024):
+        self.buckets = buckets
+        self.bucket_counts = [0] * len(buckets)
+        self.count = 0
+        self.total = 0.0
+        self.recent = deque(maxlen=window)
+
+    def observe(self, value: float) -> None:
+        for i, bound in enumerate(self.buckets):
+            if value <= bound:
+                self.bucket_counts[i] += 1
+                break
+        self.count += 1
+        self.total += value
+        self.recent.append(value)
+
+    def quantiles(self) -> Dict[float, float]:
+        samples = sorted(self.recent)
+        if not samples:
+            return {q: 0.0 for q in QUANTILES}
+        return {q: samples[min(len(samples) - 1, int(q * len(samples)))] for q in QUANTILES}
+
+
+class FrameTracer:
+    """Spans of the last `max_frames` frames, exportable in Chrome trace event format.
+
+    Open the JSON in chrome://tracing or ui.perfetto.dev to see where a slow frame
+    spent its time.
+    """
+
+    def __init__(self, max_frames: int = 300, enabled: bool = False):
+        self.max_frames = max_frames
+        self.enabled = enabled
+        self._frames = OrderedDict()
+        self._threads = {}
+        self._lock = threading.Lock()
+
+    def span(self, frame_id: Hashable, stage: str, start: float, duration: float) -> None:
+        thread = threading.current_thread()
+        with self._lock:
+            self._threads[thread.native_id] = thread.name
+            spans = self._frames.get(frame_id)
+            if spans is None:
+                spans = self._frames[frame_id] = []
+                while len(self._frames) > self.max_frames:
+                    self._frames.popitem(last=False)
+            spans.append((stage, start, duration, thread.native_id))
+
+    def chrome_trace(self) -> dict:
+        with self._lock:
+            frames = [(frame_id, list(spans)) for frame_id, spans in self._frames.items()]
+            threads = dict(self._threads)
+        events = [
+            {"name": "thread_name", "ph": "M", "pid": 1, "tid": tid, "args": {"name": name}}
+            for tid, name in threads.items()
+        ]
+        for frame_id, spans in frames:
+            for stage, start, duration, tid in spans:
+                events.append({
+                    "name": stage, "cat": "pipeline", "ph": "X", "pid": 1, "tid": tid,
+                    "ts": round(start * 1e6), "dur": round(duration * 1e6),
+                    "args": {"frame": str(frame_id)},
+                })
+        return {"traceEvents": events, "displayTimeUnit": "ms"}
+
+    def dump(self, path: str) -> None:
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(self.chrome_trace(), f)
+
+
+class MetricsRegistry:
+    """Counters, latency histograms and collected gauges, rendered as Prometheus text.
+
+    Histograms and counters are created on first use and keyed by name plus labels.
+    Collectors are callables returning nested dicts (such as the `snapshot()` of a
+    pipeline component); their numeric leaves become gauges at render time, named by
+    their path. Dicts keyed by something dynamic (session or component names) are
+    declared as labels instead, so each camera does not add its own metric family, and
+    leaves that only ever grow are declared as counters.
+    """
+
+    def __init__(self, prefix: str = "sightspeech", quantile_window: int = 1024,
+                 tracer: Optional[FrameTracer] = None):
+        self.prefix = prefix
+        self.quantile_window = quantile_window
+        self.tracer = tracer or FrameTracer()
+        self._histograms = {}
+        self._counters = {}
+        self._help = {}
+        self._buckets = {}
+        self._collectors = []
+        self._collected_labels = {}
+        self._collected_counters = set()
+        self._lock = threading.Lock()
+
+    def describe(self, name: str, help_text: str, buckets: Optional[tuple] = None) -> None:
+        # buckets: histogram bounds for metrics that are not latencies in seconds
+        self._help[name] = help_text
+        if buckets is not None:
+            self._buckets[name] = buckets
+
+    def add_collector(self, collect: Callable[[], dict], labels: Optional[Dict[str, str]] = None,
+                      counters: Iterable[str] = ()) -> None:
+        # labels: {path: label}, e.g. {"sessions": "session"} exports sessions.desk.capture.fps as
+        # sessions_capture_fps{session="desk"}; counters: flattened names of monotonic leaves, exported
+        # with a _total suffix (sessions_capture_count -> sessions_capture_count_total)
+        self._collectors.append(collect)
+        self._collected_labels.update(labels or {})
+        self._collected_counters.update(counters)
+
+    def observe(self, name: str, value: float, **labels) -> None:
+        key = (name, tuple(sorted(labels.items())))
+        with self._lock:
+            histogram = self._histograms.get(key)
+            if histogram is None:
+                histogram = self._histograms[key] = Histogram(self._buckets.get(name, DEFAULT_BUCKETS),
+                                                              window=self.quantile_window)
+            histogram.observe(value)
+
+    def inc(self, name: str, amount: float = 1, **labels) -> None:
+        key = (name, tuple(sorted(labels.items())))
+        with self._lock:
+            self._counters[key] = self._counters.get(key, 0) + amount
+
+    @contextmanager
+    def timed(self, stage: str, frame_id: Optional[Hashable] = None, **labels):
+        # Observes stage_seconds{stage=..., **labels} and, when tracing, records a span for the frame
+        start_time = time.time()
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            duration = time.perf_counter() - start
+            self.observe("stage_seconds", duration, stage=stage, **labels)
+            if frame_id is not None and self.tracer.enabled:
+                self.tracer.span(frame_id, stage, start_time, duration)
+
+    def quantiles(self, name: str) -> dict:
+        # {label value(s): {"p50": ms, "p95": ms, "p99": ms}} for the console and /pipeline/stats
+        with self._lock:
+            items = [(labels, h.quantiles()) for (n, labels), h in self._histograms.items() if n == name]
+        return {
+            ",".join(str(value) for _, value in labels) or name: {
+                f"p{int(q * 100)}": round(v * 1000, 2) for q, v in quantiles.items()
+            }
+            for labels, quantiles in items
+        }
+
+    def _flatten(self, value, path: str, labels: tuple, out: dict, labelled: bool = False) -> None:
+        # out: {name: {labels: value}}, names without the prefix; labelled: value's key already became a label
+        if isinstance(value, bool):
+            out.setdefault(path, {})[labels] = int(value)
+        elif isinstance(value, (int, float)):
+            out.setdefault(path, {})[labels] = value
+        elif isinstance(value, dict):
+            label = None if labelled else self._collected_labels.get(path)
+            for key, child in value.items():
+                if label is not None:
+                    self._flatten(child, path, labels + ((label, key),), out, labelled=True)
+                else:
+                    name = METRIC_NAME_INVALID.sub('_', str(key))
+                    self._flatten(child, f"{path}_{name}" if path else name, labels, out)
+
+    def render(self) -> str:
+        lines = []
+
+        def header(full_name: str, name: str, metric_type: str) -> None:
+            if name in self._help:
+                lines.append(f"# HELP {full_name} {self._help[name]}")
+            lines.append(f"# TYPE {full_name} {metric_type}")
+
+        with self._lock:
+            counters = sorted(self._counters.items())
+            histograms = sorted(self._histograms.items(), key=lambda item: item[0])
+            histogram_data = [
+                (key, list(h.buckets), list(h.bucket_counts), h.count, h.total, h.quantiles())
+                for key, h in histograms
+            ]
+
+        last_name = None
+        for (name, labels), value in counters:
+            full_name = f"{self.prefix}_{name}"
+            if name != last_name:
+                header(full_name, name, "counter")
+                last_name = name
+            lines.append(f"{full_name}{format_labels(labels)} {format_value(value)}")
+
+        last_name = None
+        for (name, labels), buckets, bucket_counts, count, total, _ in histogram_data:
+            full_name = f"{self.prefix}_{name}"
+            if name != last_name:
+                header(full_name, name, "histogram")
+                last_name = name
+            cumulative = 0
+            for bound, bucket_count in zip(buckets, bucket_counts):
+                cumulative += bucket_count
+                lines.append(f"{full_name}_bucket{format_labels(labels, ('le', format_value(bound)))} {cumulative}")
+            lines.append(f"{full_name}_bucket{format_labels(labels, ('le', '+Inf'))} {count}")
+            lines.append(f"{full_name}_sum{format_labels(labels)} {format_value(total)}")
+            lines.append(f"{full_name}_count{format_labels(labels)} {count}")
+
+        # Recent-window quantiles as gauges; a histogram family cannot also carry quantile series
+        last_name = None
+        for (name, labels), _, _, _, _, quantiles in histogram_data:
+            full_name = f"{self.prefix}_{name}_recent"
+            if name != last_name:
+                lines.append(f"# HELP {full_name} Quantiles of the last {self.quantile_window} {name} samples.")
+                lines.append(f"# TYPE {full_name} gauge")
+                last_name = name
+            for q, value in quantiles.items():
+                lines.append(f"{full_name}{format_labels(labels, ('quantile', q))} {format_value(value)}")
+
+        collected = {}
+        for collect in self._collectors:
+            try:
+                self._flatten(collect(), "", (), collected)
+            except Exception as e:
+                print(f"Warning: metrics collector failed: {e}")
+        for name, series in collected.items():
+            counter = name in self._collected_counters
+            # Prometheus convention: counter names end in _total; snapshot() keys do not
+            suffix = "_total" if counter and not name.endswith("_total") else ""
+            full_name = f"{self.prefix}_{name}{suffix}"
+            header(full_name, name, "counter" if counter else "gauge")
+            for labels, value in series.items():
+                lines.append(f"{full_name}{format_labels(labels)} {format_value(value)}")
+
+        return "\n".join(lines) + "\n"
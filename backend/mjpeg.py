@@ -0,0 +1,179 @@
+import threading
+import time
+from typing import Callable, Optional
+
+import cv2
+
+from pipeline import LatestQueue
+
+MJPEG_PART_HEADER = b'--frame\r\nContent-Type: image/jpeg\r\n\r\n'
+
+
+class MjpegClient:
+    """One /video_feed viewer: its requested size/quality and a one-slot frame queue.
+
+    The queue keeps only the newest JPEG, so a client that reads slower than the
+    camera drops frames instead of buffering them. With `adaptive` set, quality
+    steps down while frames are being dropped and back up once the client keeps up.
+    """
+
+    def __init__(self, width: Optional[int], quality: int, adaptive: bool,
+                 min_quality: int = 30, quality_step: int = 10, recover_after: int = 30):
+        self.queue = LatestQueue(1)
+        self.width = width
+        self.max_quality = quality
+        self.quality = quality
+        self.adaptive = adaptive
+        self.min_quality = min_quality
+        self.quality_step = quality_step
+        self.recover_after = recover_after
+
+        self.sent = 0
+        self.lag = 0.0
+        self._seen_dropped = 0
+        self._clean_sends = 0
+
+    def profile(self) -> tuple:
+        return self.width, self.quality
+
+    def record_send(self, frame_time: float) -> None:
+        self.sent += 1
+        self.lag = time.time() - frame_time
+        if not self.adaptive:
+            return
+
+        dropped = self.queue.dropped
+        if dropped > self._seen_dropped:
+            self.quality = max(self.min_quality, self.quality - self.quality_step)
+            self._clean_sends = 0
+        else:
+            self._clean_sends += 1
+            if self._clean_sends >= self.recover_after and self.quality < self.max_quality:
+                self.quality = min(self.max_quality, self.quality + self.quality_step)
+                self._clean_sends = 0
+        self._seen_dropped = dropped
+
+    def snapshot(self) -> dict:
+        return {
+            "width": self.width,
+            "quality": self.quality,
+            "adaptive": self.adaptive,
+            "sent": self.sent,
+            "dropped": self.queue.dropped,
+            "lag_ms": round(self.lag * 1000, 1),
+        }
+
+
+class MjpegBroadcaster:
+    """Encodes each new display frame once per (width, quality) and fans the bytes out.
+
+    Frames are only encoded when a new one was published and at least one client is
+    connected, so an idle feed or an unchanged frame costs nothing.
+    """
+
+    def __init__(self, default_quality: int = 80, min_quality: int = 30,
+                 on_encode: Optional[Callable[[float], None]] = None):
+        self.default_quality = default_quality
+        self.min_quality = min_quality
+        # Called with the seconds each resize + JPEG encode took
+        self.on_encode = on_encode
+        self.encoded = 0
+        # Downscaled frames per (width, height), reused by the encoder thread
+        self._resized = {}
+
+        self._cond = threading.Condition()
+        self._frame = None
+        self._frame_time = 0.0
+        self._version = 0
+        self._clients = set()
+
+        self._thread = threading.Thread(target=self._run, name="mjpeg-encoder", daemon=True)
+        self._thread.start()
+
+    def publish(self, frame) -> None:
+        with self._cond:
+            self._frame = frame
+            self._frame_time = time.time()
+            self._version += 1
+            self._cond.notify()
+
+    def subscribe(self, width: Optional[int] = None, quality: Optional[int] = None,
+                  adaptive: bool = False) -> MjpegClient:
+        quality = self.default_quality if quality is None else max(self.min_quality, min(95, quality))
+        width = None if width is None or width <= 0 else width
+        client = MjpegClient(width, quality, adaptive, min_quality=self.min_quality)
+        with self._cond:
+            self._clients.add(client)
+            # A new viewer should get the current frame right away
+            self._cond.notify()
+        return client
+
+    def unsubscribe(self, client: MjpegClient) -> None:
+        with self._cond:
+            self._clients.discard(client)
+        client.queue.close()
+
+    def stream(self, client: MjpegClient):
+        try:
+            while True:
+                item = client.queue.get(timeout=1.0)
+                if item is None:
+                    continue
+                chunk, frame_time = item
+                yield chunk
+                client.record_send(frame_time)
+        finally:
+            self.unsubscribe(client)
+
+    def _encode(self, frame, width: Optional[int], quality: int) -> Optional[bytes]:
+        start_time = time.perf_counter()
+        height, frame_width = frame.shape[:2]
+        if width is not None and width < frame_width:
+            size = (width, int(height * (width / frame_width)))
+            resized = self._resized.get(size)
+            if resized is None or resized.shape[2:] != frame.shape[2:]:
+                resized = self._resized[size] = cv2.resize(frame, size, interpolation=cv2.INTER_AREA)
+            else:
+                cv2.resize(frame, size, dst=resized, interpolation=cv2.INTER_AREA)
+            frame = resized
+        ok, jpeg = cv2.imencode('.jpg', frame, [int(cv2.IMWRITE_JPEG_QUALITY), quality])
+        if not ok:
+            return None
+        self.encoded += 1
+        if self.on_encode is not None:
+            self.on_encode(time.perf_counter() - start_time)
+        # One copy of the JPEG into the part, straight from the encoder's array
+        return b''.join((MJPEG_PART_HEADER, jpeg, b'\r\n'))
+
+    def _run(self) -> None:
+        last_version = 0
+        served = set()
+        while True:
+            with self._cond:
+                self._cond.wait_for(lambda: self._clients and self._frame is not None
+                                    and (self._version != last_version or not self._clients <= served))
+                frame, frame_time, version = self._frame, self._frame_time, self._version
+                clients = list(self._clients)
+
+            if version != last_version:
+                served = set()
+            last_version = version
+
+            chunks = {}
+            for client in clients:
+                if client in served:
+                    continue
+                profile = client.profile()
+                if profile not in chunks:
+                    chunks[profile] = self._encode(frame, *profile)
+                if chunks[profile] is not None:
+                    client.queue.put((chunks[profile], frame_time))
+                served.add(client)
+
+    def snapshot(self) -> dict:
+        with self._cond:
+            clients = list(self._clients)
+        return {
+            "encoded": self.encoded,
+            "clients": [client.snapshot() for client in clients],
+        }
@@ -0,0 +1,154 @@
+import os
+import time
+from typing import TYPE_CHECKING, List, Optional, Tuple
+
+import cv2
+from symspellpy.symspellpy import SymSpell
+
+from batched_recognizer import BatchedRecognizer
+from frame_ring import FrameRing
+from incremental_ocr import IncrementalOcr
+from layout import reading_order
+from spell_cache import SpellCorrector
+from symspell_index import load_index
+
+if TYPE_CHECKING:
+    import easyocr
+
+# OCR and spell-correction helpers shared by the live app and offline_ocr.py. Kept apart from
+# app.py so offline worker processes (spawned, so they re-import what they use) do not start the
+# Flask app, Gemini client, sessions and speech pool that app.py sets up at import.
+
+# --- EasyOCR Configuration ---
+LANGUAGE_LIST = ['en']
+USE_GPU = False
+
+BATCH_SIZE = 1
+DECODER_TYPE = 'greedy'
+
+TARGET_WIDTH = 700
+
+# --- SymSpell Configuration ---
+SYMSPELL_DICTIONARY_PATH = "frequency_dictionary_en_82_765.txt"
+# Prebuilt with `python symspell_index.py`; memory-mapped read-only, so every process shares one copy
+SYMSPELL_INDEX_PATH = os.environ.get("SYMSPELL_INDEX_PATH", "symspell_index.bin")
+
+# Corrected phrases remembered across OCR passes (LRU, keyed by the cleaned phrase)
+SPELL_CACHE_SIZE = 4096
+
+# --- SymSpell Dictionary Content (FALLBACK ONLY) ---
+DICTIONARY_CONTENT = """\
+the 10000000000
+of 1000000000
+and 100000000
+to 100000000
+a 100000000
+in 100000000
+is 10000000
+my 5000000
+name 4000000
+hello 3000000
+world 2000000
+arthur 1000000
+"""
+
+# Created on first use for whichever SymSpell instance the caller passes in
+spell_corrector = None
+
+
+def initialize_ocr_reader() -> Optional["easyocr.Reader"]:
+    print("Initializing EasyOCR Reader (One-Time Setup)...")
+    try:
+        start_init_time = time.time()
+        # Imported here rather than at module level: easyocr pulls in torch, which takes seconds
+        import easyocr
+        reader = easyocr.Reader(LANGUAGE_LIST, gpu=USE_GPU)
+        end_init_time = time.time()
+        print(f"EasyOCR Reader initialized in {end_init_time - start_init_time:.2f} seconds.")
+        return reader
+    except Exception as e:
+        print(f"An error occurred during EasyOCR Reader initialization: {e}")
+        return None
+
+
+def initialize_sym_spell() -> Optional[SymSpell]:
+    print("Initializing SymSpell Checker...")
+    if os.path.exists(SYMSPELL_INDEX_PATH):
+        try:
+            start_time = time.time()
+            sym_spell = load_index(SYMSPELL_INDEX_PATH)
+            print(f"SymSpell Checker mapped from prebuilt index {SYMSPELL_INDEX_PATH} in {time.time() - start_time:.3f}s.")
+            return sym_spell
+        except (OSError, ValueError, KeyError) as e:
+            print(f"Warning: Could not load SymSpell index '{SYMSPELL_INDEX_PATH}' ({e}). Building from dictionary.")
+
+    try:
+        sym_spell = SymSpell(max_dictionary_edit_distance=2, prefix_length=7)
+        dictionary_path = SYMSPELL_DICTIONARY_PATH
+
+        if sym_spell.load_dictionary(dictionary_path, term_index=0, count_index=1):
+            print(f"SymSpell Checker initialized from external file: {dictionary_path}.")
+        else:
+            print(f"Warning: Could not find '{dictionary_path}'. Falling back to embedded dictionary.")
+            for line in DICTIONARY_CONTENT.splitlines():
+                if line:
+                    key, count = line.split()
+                    sym_spell.create_dictionary_entry(key.lower(), int(count))
+            print("SymSpell Checker initialized with embedded dictionary.")
+
+        return sym_spell
+    except Exception as e:
+        print(f"Could not initialize SymSpell Checker: {e}")
+        return None
+
+
+def resize_for_ocr(frame, buffers: Optional[FrameRing] = None):
+    # With buffers, the result is written into a pooled array instead of a new one
+    height, width = frame.shape[:2]
+    target_height = int(height * (TARGET_WIDTH / width))
+    dst = buffers.acquire((target_height, TARGET_WIDTH) + frame.shape[2:], frame.dtype) if buffers is not None else None
+    return cv2.resize(frame, (TARGET_WIDTH, target_height), dst=dst, interpolation=cv2.INTER_AREA)
+
+
+def process_frame_for_ocr(reader: "easyocr.Reader", frame, incremental: Optional[IncrementalOcr] = None, batcher: Optional[BatchedRecognizer] = None,
+                          raise_errors: bool = False) -> Tuple[List[Tuple[List[List[int]], str, float]], float]:
+    # The live pipeline logs a failed frame and moves on; raise_errors lets batch callers record the failure
+    if frame is None:
+        return [], 0.0
+
+    try:
+        start_ocr_time = time.time()
+        if incremental is not None:
+            results_detailed = incremental.readtext(frame)
+        elif batcher is not None:
+            results_detailed = batcher.readtext(frame)
+        else:
+            results_detailed = reader.readtext(frame, detail=1, batch_size=BATCH_SIZE, decoder=DECODER_TYPE)
+        end_ocr_time = time.time()
+        frame_latency = end_ocr_time - start_ocr_time
+
+        return results_detailed, frame_latency
+
+    except Exception as e:
+        if raise_errors:
+            raise
+        print(f"An error occurred during frame processing: {e}")
+        return [], 0.0
+
+
+def sort_results_by_location(results_detailed: List[Tuple[List[List[int]], str, float]]) -> List[Tuple[List[List[int]], str, float]]:
+    # Column-aware reading order; layout.analyze_layout also returns line/column/paragraph ids
+    if not results_detailed:
+        return []
+    return reading_order(results_detailed)
+
+
+def correct_and_segment_text(text_list: List[str], sym_spell: SymSpell) -> List[str]:
+    global spell_corrector
+    if spell_corrector is None or spell_corrector.sym_spell is not sym_spell:
+        spell_corrector = SpellCorrector(sym_spell, max_entries=SPELL_CACHE_SIZE)
+    return spell_corrector.correct(text_list)
+
+
+def spell_stats() -> Optional[dict]:
+    return spell_corrector.snapshot() if spell_corrector is not None else None
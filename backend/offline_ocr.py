@@ -0,0 +1,189 @@
+import argparse
+import json
+import multiprocessing
+import os
+import time
+from collections import deque
+from typing import Iterator, Optional, Set
+
+import cv2
+
+# Not from app: spawned workers re-import this, and app.py starts the whole server at import
+from ocr_core import (
+    correct_and_segment_text,
+    initialize_ocr_reader,
+    initialize_sym_spell,
+    process_frame_for_ocr,
+    resize_for_ocr,
+    sort_results_by_location,
+)
+
+# Headless batch OCR over image directories and video files, e.g.
+#   python offline_ocr.py scans/ lecture.mp4 --output results.jsonl --workers 4
+# Re-running with the same --output skips everything already written to it and retries failed items.
+
+IMAGE_EXTENSIONS = {'.png', '.jpg', '.jpeg', '.bmp', '.tif', '.tiff', '.webp'}
+VIDEO_EXTENSIONS = {'.mp4', '.avi', '.mov', '.mkv', '.webm', '.m4v'}
+
+# Per-process state, set once by init_worker
+worker_reader = None
+worker_sym_spell = None
+
+
+def init_worker() -> None:
+    global worker_reader, worker_sym_spell
+    worker_reader = initialize_ocr_reader()
+    worker_sym_spell = initialize_sym_spell()
+
+
+def process_item(item: tuple) -> dict:
+    item_id, source, frame_index, frame = item
+    if worker_reader is None or worker_sym_spell is None:
+        # Raising from the pool initializer would make the pool respawn workers forever
+        return {"id": item_id, "source": source, "frame": frame_index, "error": "OCR worker failed to initialize."}
+    if frame is None:
+        frame = cv2.imread(source)
+        if frame is None:
+            return {"id": item_id, "source": source, "frame": frame_index, "error": "Could not read image."}
+        frame = resize_for_ocr(frame)
+
+    try:
+        results_unsorted, latency = process_frame_for_ocr(worker_reader, frame, raise_errors=True)
+    except Exception as e:
+        # Recorded as an error, not as a frame with no text, so a re-run retries it
+        return {"id": item_id, "source": source, "frame": frame_index, "error": f"OCR failed: {e}"}
+    results_detailed = sort_results_by_location(results_unsorted)
+    recognized_text = [text for (bbox, text, conf) in results_detailed]
+    corrected_phrases = correct_and_segment_text(recognized_text, worker_sym_spell)
+
+    return {
+        "id": item_id,
+        "source": source,
+        "frame": frame_index,
+        "text": recognized_text,
+        "corrected": corrected_phrases,
+        "boxes": [
+            {"bbox": [[int(x), int(y)] for x, y in bbox], "text": text, "conf": round(float(conf), 4)}
+            for (bbox, text, conf) in results_detailed
+        ],
+        "latency": round(latency, 4),
+    }
+
+
+def load_checkpoint(output_path: str) -> Set[str]:
+    # Ids already done. Errored records are retried, so the file is rewritten without them (and
+    # without a partial last line) rather than collecting another copy on every run
+    done = set()
+    if not os.path.exists(output_path):
+        return done
+    kept = []
+    dropped = 0
+    with open(output_path, encoding='utf-8') as f:
+        for line in f:
+            try:
+                record = json.loads(line)
+            except json.JSONDecodeError:
+                # A run killed mid-write leaves a partial last line
+                dropped += 1
+                continue
+            if "error" in record or record["id"] in done:
+                dropped += 1
+                continue
+            done.add(record["id"])
+            kept.append(line if line.endswith("\n") else line + "\n")
+    if dropped:
+        temp_path = output_path + ".tmp"
+        with open(temp_path, 'w', encoding='utf-8') as f:
+            f.writelines(kept)
+        os.replace(temp_path, output_path)
+        print(f"Dropped {dropped} errored or partial records from {output_path}; they will be retried.")
+    return done
+
+
+def iter_sources(paths) -> Iterator[str]:
+    for path in paths:
+        if os.path.isdir(path):
+            for name in sorted(os.listdir(path)):
+                full_path = os.path.join(path, name)
+                if os.path.splitext(name)[1].lower() in IMAGE_EXTENSIONS | VIDEO_EXTENSIONS:
+                    yield full_path
+        else:
+            yield path
+
+
+def iter_items(paths, done: Set[str], every: int) -> Iterator[tuple]:
+    for source in iter_sources(paths):
+        if os.path.splitext(source)[1].lower() not in VIDEO_EXTENSIONS:
+            if source not in done:
+                yield source, source, None, None
+            continue
+
+        cap = cv2.VideoCapture(source)
+        if not cap.isOpened():
+            print(f"Warning: Could not open video '{source}'. Skipping.")
+            continue
+        frame_index = 0
+        while True:
+            # grab() skips decoding for frames we are not going to OCR
+            if not cap.grab():
+                break
+            item_id = f"{source}#{frame_index}"
+            if frame_index % every == 0 and item_id not in done:
+                ret, frame = cap.retrieve()
+                if ret:
+                    # Resized here so only TARGET_WIDTH frames cross the process boundary
+                    yield item_id, source, frame_index, resize_for_ocr(frame)
+            frame_index += 1
+        cap.release()
+
+
+def run_batch(paths, output_path: str, workers: int, every: int, max_inflight: Optional[int] = None) -> None:
+    done = load_checkpoint(output_path)
+    if done:
+        print(f"Resuming: {len(done)} items already in {output_path}.")
+
+    max_inflight = max_inflight or workers * 2
+    context = multiprocessing.get_context("spawn")
+    start_time = time.time()
+    written = errors = 0
+
+    with context.Pool(workers, initializer=init_worker) as pool, \
+            open(output_path, 'a', encoding='utf-8') as output:
+        pending = deque()
+
+        def write_next() -> None:
+            nonlocal written, errors
+            record = pending.popleft().get()
+            output.write(json.dumps(record) + "\n")
+            output.flush()
+            written += 1
+            if "error" in record:
+                errors += 1
+                print(f"[Offline OCR] {record['id']}: {record['error']}")
+            if written % 50 == 0:
+                elapsed = time.time() - start_time
+                print(f"[Offline OCR] {written} items in {elapsed:.1f}s ({written / elapsed:.2f} items/s)")
+
+        # Bounded in-flight window: video frames are decoded only as fast as workers consume them
+        for item in iter_items(paths, done, every):
+            pending.append(pool.apply_async(process_item, (item,)))
+            if len(pending) >= max_inflight:
+                write_next()
+        while pending:
+            write_next()
+
+    elapsed = time.time() - start_time
+    rate = written / elapsed if elapsed > 0 else 0.0
+    print(f"\nOffline OCR finished: {written} items ({errors} errors) in {elapsed:.1f}s, {rate:.2f} items/s.")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="OCR image directories and video files to JSONL.")
+    parser.add_argument("paths", nargs="+", help="Image files, video files or directories of them.")
+    parser.add_argument("--output", "-o", default="ocr_results.jsonl", help="JSONL output, also the resume checkpoint.")
+    parser.add_argument("--workers", "-w", type=int, default=max(1, (os.cpu_count() or 2) // 2),
+                        help="Worker processes, each with its own EasyOCR Reader.")
+    parser.add_argument("--every", type=int, default=30, help="OCR every Nth video frame.")
+    args = parser.parse_args()
+
+    run_batch(args.paths, args.output, args.workers, max(1, args.every))
@@ -0,0 +1,76 @@
+import threading
+import time
+from collections import deque
+from typing import Any, Optional
+
+
+class LatestQueue:
+    """Bounded queue where a full queue drops its oldest item instead of blocking the producer."""
+
+    def __init__(self, maxsize: int = 1):
+        self._items = deque(maxlen=maxsize)
+        self._cond = threading.Condition()
+        self._closed = False
+        self.dropped = 0
+
+    def put(self, item: Any) -> None:
+        with self._cond:
+            if len(self._items) == self._items.maxlen:
+                self.dropped += 1
+            self._items.append(item)
+            self._cond.notify()
+
+    def get(self, timeout: Optional[float] = None) -> Optional[Any]:
+        with self._cond:
+            self._cond.wait_for(lambda: self._items or self._closed, timeout)
+            if not self._items:
+                return None
+            return self._items.popleft()
+
+    def depth(self) -> int:
+        with self._cond:
+            return len(self._items)
+
+    def close(self) -> None:
+        with self._cond:
+            self._closed = True
+            self._cond.notify_all()
+
+
+class StageStats:
+    """Rolling fps and latency for one pipeline stage."""
+
+    def __init__(self, name: str, window: float = 2.0):
+        self.name = name
+        self.window = window
+        self.count = 0
+        self.last_latency = 0.0
+        self._ticks = deque()
+        self._lock = threading.Lock()
+
+    def tick(self, latency: float = 0.0) -> None:
+        now = time.time()
+        with self._lock:
+            self.count += 1
+            self.last_latency = latency
+            self._ticks.append(now)
+            while self._ticks and now - self._ticks[0] > self.window:
+                self._ticks.popleft()
+
+    def fps(self) -> float:
+        now = time.time()
+        with self._lock:
+            while self._ticks and now - self._ticks[0] > self.window:
+                self._ticks.popleft()
+            return len(self._ticks) / self.window
+
+    def snapshot(self, queue: Optional[LatestQueue] = None) -> dict:
+        stats = {
+            "fps": round(self.fps(), 2),
+            "count": self.count,
+            "last_latency": round(self.last_latency, 4),
+        }
+        if queue is not None:
+            stats["queue_depth"] = queue.depth()
+            stats["dropped"] = queue.dropped
+        return stats
@@ -0,0 +1,33 @@
+import threading
+from typing import Any, Optional, Tuple
+
+
+class ResultStore:
+    """Versioned, named results shared between the pipeline and the Flask handlers.
+
+    A channel's version only moves when a different value is published, so clients
+    can ask "anything newer than N?" and block until there is.
+    """
+
+    def __init__(self):
+        self._cond = threading.Condition()
+        self._entries = {}
+
+    def publish(self, name: str, value: Any) -> int:
+        with self._cond:
+            version, current = self._entries.get(name, (0, None))
+            if version and current == value:
+                return version
+            version += 1
+            self._entries[name] = (version, value)
+            self._cond.notify_all()
+            return version
+
+    def get(self, name: str, default: Any = None) -> Tuple[int, Any]:
+        with self._cond:
+            return self._entries.get(name, (0, default))
+
+    def wait(self, name: str, since: int, timeout: Optional[float], default: Any = None) -> Tuple[int, Any]:
+        with self._cond:
+            self._cond.wait_for(lambda: self._entries.get(name, (0,))[0] > since, timeout)
+            return self._entries.get(name, (0, default))
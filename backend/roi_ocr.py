@@ -0,0 +1,106 @@
+import threading
+import time
+from contextlib import contextmanager
+from typing import List, Optional, Tuple
+
+from incremental_ocr import OcrResult, bbox_to_rect
+
+Region = Tuple[int, int, int, int]
+
+
+def parse_region(payload: dict, frame_shape: tuple, window_width: int, window_height: int,
+                 above_fraction: float) -> Tuple[Region, Tuple[int, int]]:
+    # {"x": 0.4, "y": 0.6} (fingertip) or {"roi": [x0, y0, x1, y1]}, normalized to 0-1 of the frame.
+    # Returns the pixel window to OCR and the pointed-at pixel; raises ValueError on bad input.
+    height, width = frame_shape[:2]
+    if payload.get("roi") is not None:
+        roi = payload["roi"]
+        if not isinstance(roi, (list, tuple)) or len(roi) != 4:
+            raise ValueError("'roi' must be [x0, y0, x1, y1].")
+        x0, y0, x1, y1 = (float(v) for v in roi)
+        if not (0.0 <= x0 < x1 <= 1.0 and 0.0 <= y0 < y1 <= 1.0):
+            raise ValueError("'roi' must be a non-empty box within 0-1.")
+        region = (int(x0 * width), int(y0 * height), max(int(x0 * width) + 1, int(x1 * width)),
+                  max(int(y0 * height) + 1, int(y1 * height)))
+        return region, ((region[0] + region[2]) // 2, (region[1] + region[3]) // 2)
+
+    if "x" not in payload or "y" not in payload:
+        raise ValueError("Expected 'x' and 'y' (0-1) or 'roi'.")
+    x, y = float(payload["x"]), float(payload["y"])
+    if not (0.0 <= x <= 1.0 and 0.0 <= y <= 1.0):
+        raise ValueError("'x' and 'y' must be within 0-1.")
+    point = (min(width - 1, int(x * width)), min(height - 1, int(y * height)))
+
+    # A fingertip usually sits just below the line it points at, so most of the window is above it.
+    # The window is shifted, not shrunk, at the frame edges.
+    window_width, window_height = min(window_width, width), min(window_height, height)
+    left = min(max(0, point[0] - window_width // 2), width - window_width)
+    top = min(max(0, point[1] - int(window_height * above_fraction)), height - window_height)
+    return (left, top, left + window_width, top + window_height), point
+
+
+def pointed_result(results: List[OcrResult], point: Tuple[int, int]) -> Optional[OcrResult]:
+    # The box containing the point, else the one whose edge is closest to it
+    def distance(result: OcrResult) -> float:
+        x0, y0, x1, y1 = bbox_to_rect(result[0])
+        dx = max(x0 - point[0], 0, point[0] - x1)
+        dy = max(y0 - point[1], 0, point[1] - y1)
+        return dx * dx + dy * dy
+    return min(results, key=distance) if results else None
+
+
+class RegionOcr:
+    """Runs EasyOCR on a window of the full-resolution frame instead of the whole downscaled frame.
+
+    Region requests take priority over the periodic full-frame pass: while any is in
+    flight, OCR workers hold off starting their next frame (`wait_idle`). A pass that
+    is already running is not interrupted.
+    """
+
+    def __init__(self, batch_size: int = 1, decoder: str = 'greedy'):
+        self.batch_size = batch_size
+        self.decoder = decoder
+
+        self.requests = 0
+        self.total_time = 0.0
+        self.last_time = 0.0
+        self._active = 0
+        self._cond = threading.Condition()
+
+    @contextmanager
+    def priority(self):
+        with self._cond:
+            self._active += 1
+        try:
+            yield
+        finally:
+            with self._cond:
+                self._active -= 1
+                if not self._active:
+                    self._cond.notify_all()
+
+    def wait_idle(self, timeout: Optional[float] = None) -> bool:
+        # False if region requests were still running when the timeout expired
+        with self._cond:
+            return self._cond.wait_for(lambda: not self._active, timeout)
+
+    def read(self, reader, frame, region: Region) -> Tuple[List[OcrResult], float]:
+        # Results are in frame pixel coordinates
+        x0, y0, x1, y1 = region
+        start_time = time.time()
+        results = reader.readtext(frame[y0:y1, x0:x1], detail=1, batch_size=self.batch_size, decoder=self.decoder)
+        latency = time.time() - start_time
+        with self._cond:
+            self.requests += 1
+            self.total_time += latency
+            self.last_time = latency
+        return [([[int(px) + x0, int(py) + y0] for px, py in bbox], text, conf) for bbox, text, conf in results], latency
+
+    def snapshot(self) -> dict:
+        with self._cond:
+            return {
+                "requests": self.requests,
+                "active": self._active,
+                "avg_latency": round(self.total_time / self.requests, 4) if self.requests else 0.0,
+                "last_latency": round(self.last_time, 4),
+            }
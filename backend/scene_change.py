@@ -0,0 +1,115 @@
+import time
+from typing import Optional
+
+import cv2
+import numpy as np
+
+
+def frame_thumbnail(frame, width: int) -> np.ndarray:
+    height, frame_width = frame.shape[:2]
+    thumb_height = max(1, int(height * (width / frame_width)))
+    small = cv2.resize(frame, (width, thumb_height), interpolation=cv2.INTER_AREA)
+    if small.ndim == 3:
+        small = cv2.cvtColor(small, cv2.COLOR_BGR2GRAY)
+    return small
+
+
+def frame_difference(a: np.ndarray, b: np.ndarray) -> float:
+    # Mean absolute grey-level difference, 0-255
+    if a.shape != b.shape:
+        return 255.0
+    return float(cv2.absdiff(a, b).mean())
+
+
+class OcrScheduler:
+    """Decides per frame whether OCR should run, based on cheap thumbnail differencing.
+
+    OCR fires on the first frame, once the scene has held still for `settle_frames`
+    after its content drifted away from the last OCR'd frame, or when `max_interval`
+    has passed. It never fires sooner than `min_interval` after the previous run.
+
+    `scene_version` moves whenever a fired frame differs from the reference, whatever
+    triggered it, so a page turn that lands on the periodic refresh is still a new
+    scene. A refresh taken mid-motion does not become the reference: once the new page
+    settles, it still fires "changed" and is read from a still frame.
+    """
+
+    def __init__(self, min_interval: float = 0.5, max_interval: Optional[float] = 10.0,
+                 change_threshold: float = 6.0, motion_threshold: float = 3.0,
+                 settle_frames: int = 3, thumb_width: int = 64):
+        self.min_interval = min_interval
+        self.max_interval = max_interval
+        self.change_threshold = change_threshold
+        self.motion_threshold = motion_threshold
+        self.settle_frames = settle_frames
+        self.thumb_width = thumb_width
+
+        self.checked = 0
+        self.fired = 0
+        # Bumped only when OCR fires on content that changed, not on refreshes of the same scene
+        self.scene_version = 0
+        self.last_motion = 0.0
+        self.last_reason = ""
+
+        self._previous = None
+        self._reference = None
+        self._still_frames = 0
+        self._last_fire = 0.0
+
+    def should_run(self, frame, now: Optional[float] = None) -> bool:
+        now = time.time() if now is None else now
+        thumb = frame_thumbnail(frame, self.thumb_width)
+        self.checked += 1
+
+        self.last_motion = 0.0 if self._previous is None else frame_difference(thumb, self._previous)
+        self._previous = thumb
+        if self.last_motion > self.motion_threshold:
+            self._still_frames = 0
+        else:
+            self._still_frames += 1
+
+        elapsed = now - self._last_fire
+        settled = self._still_frames >= self.settle_frames
+        if self._reference is None:
+            reason, changed = "first", True
+        elif elapsed < self.min_interval:
+            return False
+        else:
+            changed = frame_difference(thumb, self._reference) > self.change_threshold
+            if settled and changed:
+                reason = "changed"
+            elif self.max_interval is not None and elapsed >= self.max_interval:
+                reason = "max_interval"
+            else:
+                return False
+
+        if settled or self._reference is None:
+            self._reference = thumb
+        self._last_fire = now
+        self.last_reason = reason
+        self.fired += 1
+        if changed:
+            self.scene_version += 1
+        return True
+
+    def snapshot(self) -> dict:
+        return {
+            "checked": self.checked,
+            "fired": self.fired,
+            "scene_version": self.scene_version,
+            "last_motion": round(self.last_motion, 2),
+            "last_reason": self.last_reason,
+        }
+
+
+def perceptual_hash(frame, hash_size: int = 16) -> int:
+    # Difference hash: one bit per horizontally adjacent pixel pair of a tiny greyscale image
+    small = cv2.resize(frame, (hash_size + 1, hash_size), interpolation=cv2.INTER_AREA)
+    if small.ndim == 3:
+        small = cv2.cvtColor(small, cv2.COLOR_BGR2GRAY)
+    bits = (small[:, 1:] > small[:, :-1]).flatten()
+    return int.from_bytes(np.packbits(bits).tobytes(), "big")
+
+
+def hash_distance(a: int, b: int) -> int:
+    return (a ^ b).bit_count()
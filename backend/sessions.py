@@ -0,0 +1,170 @@
+import queue
+import threading
+from typing import Callable, Dict, List, Optional, Tuple, Union
+
+from events import EventHub
+from frame_ring import FrameRing
+from mjpeg import MjpegBroadcaster
+from pipeline import LatestQueue, StageStats
+from result_store import ResultStore
+from scene_change import OcrScheduler
+
+CaptureSource = Union[int, str]
+
+
+def parse_camera_sources(spec: str, default_name: str, default_source: CaptureSource) -> Dict[str, CaptureSource]:
+    # "desk=0,door=rtsp://cam/stream" -> {"desk": 0, "door": "rtsp://cam/stream"}; empty -> the default camera
+    sources = {}
+    for entry in filter(None, (part.strip() for part in spec.split(","))):
+        name, _, source = entry.partition("=")
+        if not source:
+            name, source = default_name if not sources else f"camera{len(sources)}", name
+        sources[name.strip()] = int(source) if source.strip().isdigit() else source.strip()
+    return sources or {default_name: default_source}
+
+
+class Session:
+    """One reading station: its capture source plus every piece of per-user pipeline state.
+
+    Sessions share the OCR reader, spell checker, Gemini client and cache; everything a
+    user can observe or change (frames, OCR and Gemini results, focus, commands, event
+    and video subscribers) lives here.
+    """
+
+    def __init__(self, name: str, source: CaptureSource, queue_size: int, scheduler: OcrScheduler,
+                 event_queue_size: int, mjpeg_quality: int, mjpeg_min_quality: int, command_queue_size: int = 32,
+                 frame_slots: int = 8, on_encode: Optional[Callable[[float], None]] = None):
+        self.name = name
+        self.source = source
+        self.cap = None
+
+        self.ocr_queue = LatestQueue(queue_size)
+        self.render_queue = LatestQueue(queue_size)
+        self.capture_stats = StageStats("capture")
+        self.ocr_stats = StageStats("ocr")
+        self.render_stats = StageStats("render")
+        self.ocr_scheduler = scheduler
+        # Pooled buffers: camera frames (shared read-only by every stage), drawn display frames
+        # and OCR-sized frames
+        self.frames = FrameRing(frame_slots)
+        self.display_frames = FrameRing(4)
+        self.ocr_frames = FrameRing(2)
+        # IncrementalOcr cache and TextTracker for this camera's frames, created by the OCR worker
+        self.incremental = None
+        self.text_tracker = None
+
+        # Replaced wholesale by the OCR worker so readers can grab a consistent snapshot. "version" is
+        # the fused transcript's and only moves when its text does; "pass" moves on every OCR pass.
+        # "results" holds the emitted tracks, "detected" every box of the last pass (confident or not)
+        self.ocr_results = {"version": 0, "pass": 0, "frame_index": -1, "scene_version": 0, "results": [], "track_ids": [],
+                            "detected": [], "text": [], "corrected": [], "latency": 0.0}
+        self.ocr_lock = threading.Lock()
+
+        # Newest raw camera frame as (frame_index, frame, scene_version); frames are never drawn on
+        self.latest_capture = None
+        self.capture_lock = threading.Lock()
+
+        # Gemini word/sentence results served by /data/words and /data/sentences
+        self.result_store = ResultStore()
+        self.result_refreshes = {}
+        self.result_scene_versions = {}
+        self.refresh_lock = threading.Lock()
+
+        self.mjpeg_broadcaster = MjpegBroadcaster(mjpeg_quality, mjpeg_min_quality, on_encode=on_encode)
+        self.event_hub = EventHub(event_queue_size)
+
+        # Commands ('c', 'v', 'n', 'p') from this session's clients, applied by the render loop in order
+        self.commands = queue.Queue(command_queue_size)
+        self.commands_rejected = 0
+        # Render-loop state: the OCR results on screen and the focused box within them. Focus follows
+        # the tracked line (id, last box) rather than an index, which shifts as boxes come and go
+        self.focused_box_index = -1
+        self.focused_track_id = None
+        self.focused_bbox = None
+        self.shown_results = []
+        self.shown_track_ids = []
+        self.shown_pass = 0
+        self.pending_gemini = None
+
+    def pop_commands(self) -> List[str]:
+        commands = []
+        while True:
+            try:
+                commands.append(self.commands.get_nowait())
+            except queue.Empty:
+                return commands
+
+    def snapshot(self) -> dict:
+        return {
+            "source": str(self.source),
+            "capture": self.capture_stats.snapshot(),
+            "ocr": self.ocr_stats.snapshot(self.ocr_queue),
+            "render": self.render_stats.snapshot(self.render_queue),
+            "scheduler": self.ocr_scheduler.snapshot(),
+            "tracker": self.text_tracker.snapshot() if self.text_tracker is not None else None,
+            "events": self.event_hub.snapshot(),
+            "mjpeg": self.mjpeg_broadcaster.snapshot(),
+            "frames": self.frames.snapshot(),
+            "display_frames": self.display_frames.snapshot(),
+            "pending_commands": self.commands.qsize(),
+            "rejected_commands": self.commands_rejected,
+            "focused_box_index": self.focused_box_index,
+        }
+
+
+class FairOcrQueue:
+    """Hands the newest frame of each session to shared OCR workers in round-robin order.
+
+    A session is skipped while one of its frames is being processed, so a busy camera
+    cannot occupy several workers and its IncrementalOcr cache is only used by one
+    thread at a time. Workers call `release(session)` when done.
+    """
+
+    def __init__(self):
+        self._sessions = []
+        self._busy = set()
+        self._next = 0
+        self._cond = threading.Condition()
+        self.served = {}
+
+    def add(self, session: Session) -> None:
+        with self._cond:
+            self._sessions.append(session)
+            self.served.setdefault(session.name, 0)
+
+    def notify(self) -> None:
+        # Called after a capture loop queued a frame
+        with self._cond:
+            self._cond.notify()
+
+    def _take(self) -> Optional[Tuple[Session, tuple]]:
+        count = len(self._sessions)
+        for offset in range(count):
+            index = (self._next + offset) % count
+            session = self._sessions[index]
+            if session.name in self._busy:
+                continue
+            item = session.ocr_queue.get(timeout=0)
+            if item is not None:
+                self._next = index + 1
+                self._busy.add(session.name)
+                self.served[session.name] += 1
+                return session, item
+        return None
+
+    def get(self, timeout: Optional[float] = None) -> Optional[Tuple[Session, tuple]]:
+        with self._cond:
+            taken = self._take()
+            if taken is None and self._cond.wait(timeout):
+                taken = self._take()
+            return taken
+
+    def release(self, session: Session) -> None:
+        with self._cond:
+            self._busy.discard(session.name)
+            # The session may have queued a frame while it was busy
+            self._cond.notify()
+
+    def snapshot(self) -> dict:
+        with self._cond:
+            return {"served": dict(self.served), "busy": sorted(self._busy)}
@@ -0,0 +1,108 @@
+import re
+import threading
+import time
+from collections import OrderedDict
+from typing import List
+
+PATTERN_STRIP = re.compile(r'[^a-zA-Z0-9]+')
+
+
+class SpellCorrector:
+    """Memoized SymSpell word segmentation for batches of OCR phrases.
+
+    Phrases are cleaned (non-alphanumerics stripped, lower-cased) and corrected once per
+    distinct cleaned text: duplicates within a batch share one result, earlier results come
+    from a bounded LRU, and a phrase that is already a dictionary word skips segmentation.
+
+    That fast path changes output for a few words that segmentation would split into more
+    frequent ones: 'tome' stays 'Tome' rather than becoming 'To me', and 'insecurity'
+    rather than 'In security'.
+    """
+
+    def __init__(self, sym_spell, max_entries: int = 4096, max_edit_distance: int = 2,
+                 max_segmentation_word_length: int = 25):
+        self.sym_spell = sym_spell
+        self.max_entries = max_entries
+        self.max_edit_distance = max_edit_distance
+        self.max_segmentation_word_length = max_segmentation_word_length
+
+        self.phrases = 0
+        self.hits = 0
+        self.misses = 0
+        self.deduped = 0
+        self.dictionary_hits = 0
+        self.segment_time = 0.0
+        self.total_time = 0.0
+        self.last_batch_time = 0.0
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def _segment(self, cleaned: str) -> str:
+        if cleaned in self.sym_spell.words:
+            self.dictionary_hits += 1
+            return cleaned.capitalize()
+        start_time = time.perf_counter()
+        result = self.sym_spell.word_segmentation(
+            cleaned,
+            max_edit_distance=self.max_edit_distance,
+            max_segmentation_word_length=self.max_segmentation_word_length,
+        )
+        self.segment_time += time.perf_counter() - start_time
+        return result.corrected_string.capitalize()
+
+    def correct(self, text_list: List[str]) -> List[str]:
+        start_time = time.perf_counter()
+        cleaned_list = [PATTERN_STRIP.sub('', phrase).lower() for phrase in text_list]
+        cleaned_list = [cleaned for cleaned in cleaned_list if cleaned]
+
+        batch = {}
+        with self._lock:
+            for cleaned in cleaned_list:
+                if cleaned in batch:
+                    self.deduped += 1
+                    continue
+                corrected = self._entries.get(cleaned)
+                if corrected is not None:
+                    self._entries.move_to_end(cleaned)
+                    self.hits += 1
+                else:
+                    self.misses += 1
+                batch[cleaned] = corrected
+
+        # Segmentation runs outside the lock; two threads racing on the same phrase just both compute it
+        for cleaned, corrected in batch.items():
+            if corrected is None:
+                batch[cleaned] = self._segment(cleaned)
+
+        with self._lock:
+            for cleaned, corrected in batch.items():
+                self._entries[cleaned] = corrected
+                self._entries.move_to_end(cleaned)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+            self.phrases += len(cleaned_list)
+            self.last_batch_time = time.perf_counter() - start_time
+            self.total_time += self.last_batch_time
+
+        return [batch[cleaned] for cleaned in cleaned_list]
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "entries": len(self._entries),
+                "phrases": self.phrases,
+                "hits": self.hits,
+                "misses": self.misses,
+                "deduped": self.deduped,
+                "dictionary_hits": self.dictionary_hits,
+                "hit_rate": round(self.hits / lookups, 3) if lookups else 0.0,
+                "ms_per_phrase": round(self.total_time * 1000 / self.phrases, 3) if self.phrases else 0.0,
+                "ms_per_segmentation": round(
+                    self.segment_time * 1000 / max(1, self.misses - self.dictionary_hits), 3),
+                "last_batch_ms": round(self.last_batch_time * 1000, 3),
+            }
@@ -0,0 +1,90 @@
+import threading
+import time
+from concurrent.futures import Future, TimeoutError as FutureTimeoutError
+from typing import Any, Callable, Optional
+
+
+class ComponentLoader:
+    """Loads named components (models, dictionaries) on background threads.
+
+    Each component goes pending -> loading -> warming -> ready, or ends in failed. A
+    loader that returns None counts as failed. The optional warm-up runs on the loaded
+    value before it is handed out, so the first real call doesn't pay one-off costs.
+    """
+
+    def __init__(self):
+        self._components = {}
+        self._lock = threading.Lock()
+
+    def start(self, name: str, load: Callable[[], Any],
+              warm_up: Optional[Callable[[Any], None]] = None) -> Future:
+        future = Future()
+        with self._lock:
+            self._components[name] = {"state": "pending", "future": future, "load_time": None,
+                                      "warmup_time": None, "error": None}
+        thread = threading.Thread(target=self._run, args=(name, load, warm_up, future),
+                                  name=f"load-{name}", daemon=True)
+        thread.start()
+        return future
+
+    def _set(self, name: str, **fields) -> None:
+        with self._lock:
+            self._components[name].update(fields)
+
+    def _run(self, name: str, load: Callable[[], Any], warm_up: Optional[Callable[[Any], None]],
+             future: Future) -> None:
+        try:
+            self._set(name, state="loading")
+            start_time = time.time()
+            value = load()
+            self._set(name, load_time=time.time() - start_time)
+            if value is None:
+                raise RuntimeError(f"{name} failed to load.")
+
+            if warm_up is not None:
+                self._set(name, state="warming")
+                start_time = time.time()
+                try:
+                    warm_up(value)
+                except Exception as e:
+                    # A failed warm-up only costs the first real call some latency
+                    print(f"Warning: warm-up of {name} failed: {e}")
+                self._set(name, warmup_time=time.time() - start_time)
+        except Exception as e:
+            self._set(name, state="failed", error=str(e))
+            future.set_result(None)
+            return
+        self._set(name, state="ready")
+        future.set_result(value)
+
+    def get(self, name: str, timeout: Optional[float] = None) -> Any:
+        # Blocks until the component finished loading; None if it failed or timed out
+        with self._lock:
+            component = self._components.get(name)
+        if component is None:
+            return None
+        try:
+            return component["future"].result(timeout=timeout)
+        except FutureTimeoutError:
+            return None
+
+    def is_ready(self, name: str) -> bool:
+        with self._lock:
+            component = self._components.get(name)
+            return component is not None and component["state"] == "ready"
+
+    def all_ready(self) -> bool:
+        with self._lock:
+            return bool(self._components) and all(c["state"] == "ready" for c in self._components.values())
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            return {
+                name: {
+                    "state": c["state"],
+                    "load_time": round(c["load_time"], 3) if c["load_time"] is not None else None,
+                    "warmup_time": round(c["warmup_time"], 3) if c["warmup_time"] is not None else None,
+                    "error": c["error"],
+                }
+                for name, c in self._components.items()
+            }
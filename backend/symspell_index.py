@@ -0,0 +1,340 @@
+import argparse
+import hashlib
+import json
+import os
+import struct
+import subprocess
+import sys
+import time
+from collections.abc import Mapping
+from importlib import metadata
+from typing import List
+
+import numpy as np
+from symspellpy.symspellpy import SymSpell
+
+# Precompiled SymSpell delete index. Build once:
+#   python symspell_index.py --dictionary frequency_dictionary_en_82_765.txt --output symspell_index.bin
+# then every process memory-maps the same read-only file instead of rebuilding the index.
+# Compare startup and memory with the dictionary path:
+#   python symspell_index.py --bench
+
+INDEX_MAGIC = b"SYMIDX01"
+INDEX_VERSION = 1
+# Data sections start on this boundary so every array view is aligned
+INDEX_ALIGN = 8
+
+# Private SymSpell attributes load_index replaces (checked against symspellpy 6.10.0, the pinned
+# version); a release without them gets a ValueError and callers load the dictionary instead
+MAPPED_ATTRIBUTES = ("_words", "_deletes", "_max_length")
+
+# Phrases for --bench; outputs must match between the two loading paths
+BENCH_PHRASES = [
+    "thequickbrownfoxjumpsoverthelazydog",
+    "itwasabrightcolddayinaprilandtheclockswerestrikingthirteen",
+    "projecttitankickoff",
+    "reviewq3budget",
+    "remindergetsignoffbyeod",
+    "hellomynameisjohn",
+]
+
+
+def key_hash(key: str) -> int:
+    # Stable across processes, unlike hash(); signed so it fits an int64 array
+    return int.from_bytes(hashlib.blake2b(key.encode('utf-8'), digest_size=8).digest(), 'little', signed=True)
+
+
+class MappedWords(Mapping):
+    """Read-only word -> count mapping over the arrays of a mapped index."""
+
+    def __init__(self, blob: np.ndarray, offsets: np.ndarray, counts: np.ndarray,
+                 hashes: np.ndarray, by_hash: np.ndarray):
+        self.blob = blob
+        self.offsets = offsets
+        self.counts = counts
+        self.hashes = hashes
+        self.by_hash = by_hash
+        # Words are decoded on first use; a lookup touches the same few hundred candidates over and over
+        self._decoded = [None] * len(counts)
+        self._last_key, self._last_index = None, -1
+
+    def word(self, index: int) -> str:
+        word = self._decoded[index]
+        if word is None:
+            word = self.blob[self.offsets[index]:self.offsets[index + 1]].tobytes().decode('utf-8')
+            self._decoded[index] = word
+        return word
+
+    def find(self, key: str) -> int:
+        # SymSpell tests `key in words` and then reads words[key]; the second call reuses the first
+        if key == self._last_key:
+            return self._last_index
+        index = -1
+        h = key_hash(key)
+        pos = int(self.hashes.searchsorted(h))
+        if pos < len(self.hashes) and self.hashes[pos] == h:
+            candidate = int(self.by_hash[pos])
+            if self.word(candidate) == key:
+                index = candidate
+        self._last_key, self._last_index = key, index
+        return index
+
+    def __getitem__(self, key: str) -> int:
+        index = self.find(key)
+        if index < 0:
+            raise KeyError(key)
+        return int(self.counts[index])
+
+    def __contains__(self, key) -> bool:
+        return isinstance(key, str) and self.find(key) >= 0
+
+    def __len__(self) -> int:
+        return len(self.counts)
+
+    def __iter__(self):
+        return (self.word(i) for i in range(len(self.counts)))
+
+
+class MappedDeletes(Mapping):
+    """Read-only delete -> [words] mapping. Keys are stored as hashes only, so it cannot be iterated."""
+
+    def __init__(self, words: MappedWords, hashes: np.ndarray, offsets: np.ndarray, postings: np.ndarray):
+        self.words = words
+        self.hashes = hashes
+        self.offsets = offsets
+        self.postings = postings
+        self._last_key, self._last_pos = None, -1
+
+    def find(self, key: str) -> int:
+        # Same `in` then [] pattern as MappedWords.find
+        if key == self._last_key:
+            return self._last_pos
+        h = key_hash(key)
+        pos = int(self.hashes.searchsorted(h))
+        if not (pos < len(self.hashes) and self.hashes[pos] == h):
+            pos = -1
+        self._last_key, self._last_pos = key, pos
+        return pos
+
+    def __getitem__(self, key: str) -> List[str]:
+        pos = self.find(key)
+        if pos < 0:
+            raise KeyError(key)
+        word = self.words.word
+        return [word(i) for i in self.postings[self.offsets[pos]:self.offsets[pos + 1]].tolist()]
+
+    def __contains__(self, key) -> bool:
+        return isinstance(key, str) and self.find(key) >= 0
+
+    def __len__(self) -> int:
+        return len(self.hashes)
+
+    def __iter__(self):
+        raise TypeError("MappedDeletes stores hashed keys and cannot be iterated.")
+
+
+def build_index(sym_spell: SymSpell, output_path: str, source: str = "") -> dict:
+    words = list(sym_spell.words)
+    word_index = {word: i for i, word in enumerate(words)}
+    encoded = [word.encode('utf-8') for word in words]
+    word_offsets = np.zeros(len(words) + 1, dtype=np.int64)
+    np.cumsum(np.fromiter(map(len, encoded), dtype=np.int64, count=len(words)), out=word_offsets[1:])
+    word_hashes = np.fromiter(map(key_hash, words), dtype=np.int64, count=len(words))
+    if len(np.unique(word_hashes)) != len(words):
+        raise ValueError("Word hash collision; the index format needs unique word hashes.")
+    word_sort = np.argsort(word_hashes, kind='stable')
+
+    deletes = sym_spell.deletes
+    delete_keys = list(deletes)
+    delete_hashes = np.fromiter(map(key_hash, delete_keys), dtype=np.int64, count=len(delete_keys))
+    delete_sort = np.argsort(delete_hashes, kind='stable')
+    sorted_keys = [delete_keys[i] for i in delete_sort.tolist()]
+    lengths = np.fromiter((len(deletes[key]) for key in sorted_keys), dtype=np.int64, count=len(sorted_keys))
+    postings = np.fromiter((word_index[w] for key in sorted_keys for w in deletes[key]),
+                           dtype=np.uint32, count=int(lengths.sum()))
+    # Colliding delete hashes are adjacent after sorting and simply share one posting range;
+    # lookup() checks the edit distance of every candidate anyway
+    sorted_hashes = delete_hashes[delete_sort]
+    unique_hashes, group_starts = np.unique(sorted_hashes, return_index=True)
+    entry_offsets = np.concatenate([[0], np.cumsum(lengths)])
+    delete_offsets = np.append(entry_offsets[group_starts], entry_offsets[-1])
+
+    arrays = {
+        "word_blob": np.frombuffer(b"".join(encoded), dtype=np.uint8),
+        "word_offsets": word_offsets,
+        "word_counts": np.fromiter(sym_spell.words.values(), dtype=np.int64, count=len(words)),
+        "word_hashes": word_hashes[word_sort],
+        "word_by_hash": word_sort.astype(np.uint32),
+        "delete_hashes": unique_hashes,
+        "delete_offsets": delete_offsets.astype(np.int64),
+        "delete_postings": postings,
+    }
+
+    sections = {}
+    position = 0
+    for name, array in arrays.items():
+        sections[name] = [position, array.dtype.str, len(array)]
+        position += -(-array.nbytes // INDEX_ALIGN) * INDEX_ALIGN
+    header = json.dumps({
+        "version": INDEX_VERSION,
+        "max_dictionary_edit_distance": sym_spell._max_dictionary_edit_distance,
+        "prefix_length": sym_spell._prefix_length,
+        "max_length": sym_spell._max_length,
+        "source": source,
+        "sections": sections,
+    }).encode('utf-8')
+
+    data_start = -(-(len(INDEX_MAGIC) + 4 + len(header)) // INDEX_ALIGN) * INDEX_ALIGN
+    with open(output_path, 'wb') as f:
+        f.write(INDEX_MAGIC + struct.pack('<I', len(header)) + header)
+        for name, array in arrays.items():
+            f.seek(data_start + sections[name][0])
+            f.write(array.tobytes())
+        f.truncate(data_start + position)
+    return {"words": len(words), "deletes": len(unique_hashes), "bytes": data_start + position}
+
+
+def read_header(path: str) -> tuple:
+    with open(path, 'rb') as f:
+        if f.read(len(INDEX_MAGIC)) != INDEX_MAGIC:
+            raise ValueError(f"{path} is not a SymSpell index.")
+        (header_length,) = struct.unpack('<I', f.read(4))
+        header = json.loads(f.read(header_length))
+    if header["version"] != INDEX_VERSION:
+        raise ValueError(f"{path} has index version {header['version']}, expected {INDEX_VERSION}.")
+    data_start = -(-(len(INDEX_MAGIC) + 4 + header_length) // INDEX_ALIGN) * INDEX_ALIGN
+    return header, data_start
+
+
+def load_index(path: str) -> SymSpell:
+    """Returns a SymSpell whose word and delete tables are views into a read-only mmap of `path`.
+
+    The OS shares the mapped pages between every process that loads the same file, and
+    nothing is parsed up front, so loading is near-instant. The result supports lookup(),
+    lookup_compound() and word_segmentation() but not adding or removing entries. Each
+    key costs a hash and a binary search instead of a dict probe, so word_segmentation
+    runs about 1.5x slower than on a dictionary-loaded SymSpell.
+
+    Raises ValueError if the installed symspellpy no longer has the attributes replaced
+    here (`MAPPED_ATTRIBUTES`).
+    """
+    header, data_start = read_header(path)
+    sym_spell = SymSpell(max_dictionary_edit_distance=header["max_dictionary_edit_distance"],
+                         prefix_length=header["prefix_length"])
+    missing = [name for name in MAPPED_ATTRIBUTES if not hasattr(sym_spell, name)]
+    if missing:
+        raise ValueError(f"symspellpy {metadata.version('symspellpy')} has no {', '.join(missing)}; "
+                         f"the mapped index needs a compatible version.")
+
+    raw = np.memmap(path, dtype=np.uint8, mode='r')
+    arrays = {}
+    for name, (offset, dtype, length) in header["sections"].items():
+        start = data_start + offset
+        # Plain ndarray views: memmap's subclass overhead shows up in per-key lookups
+        arrays[name] = raw[start:start + length * np.dtype(dtype).itemsize].view(np.ndarray).view(dtype)
+
+    words = MappedWords(arrays["word_blob"], arrays["word_offsets"], arrays["word_counts"],
+                        arrays["word_hashes"], arrays["word_by_hash"])
+    # lookup() only does `in`, [] and len() on these, so read-only mappings can stand in for the dicts
+    sym_spell._words = words
+    sym_spell._deletes = MappedDeletes(words, arrays["delete_hashes"], arrays["delete_offsets"],
+                                       arrays["delete_postings"])
+    sym_spell._max_length = header["max_length"]
+    return sym_spell
+
+
+def default_dictionary_path() -> str:
+    local_path = "frequency_dictionary_en_82_765.txt"
+    if os.path.exists(local_path):
+        return local_path
+    # symspellpy ships the same frequency dictionary
+    import symspellpy
+    return os.path.join(os.path.dirname(symspellpy.__file__), local_path)
+
+
+def memory_usage() -> dict:
+    # Linux only: RssAnon is private to the process, RssFile is page cache that other processes share
+    usage = {}
+    try:
+        with open("/proc/self/status") as f:
+            for line in f:
+                key, _, value = line.partition(":")
+                if key in ("VmRSS", "RssAnon", "RssFile"):
+                    usage[key] = int(value.split()[0]) / 1024
+    except OSError:
+        pass
+    return usage
+
+
+def measure_child(mode: str, dictionary_path: str, index_path: str) -> dict:
+    before = memory_usage()
+    start_time = time.perf_counter()
+    if mode == "dictionary":
+        sym_spell = SymSpell(max_dictionary_edit_distance=2, prefix_length=7)
+        sym_spell.load_dictionary(dictionary_path, term_index=0, count_index=1)
+    else:
+        sym_spell = load_index(index_path)
+    load_time = time.perf_counter() - start_time
+
+    start_time = time.perf_counter()
+    outputs = [sym_spell.word_segmentation(phrase, max_edit_distance=2, max_segmentation_word_length=25).corrected_string
+               for phrase in BENCH_PHRASES]
+    segment_time = time.perf_counter() - start_time
+    after = memory_usage()
+    return {
+        "mode": mode,
+        "load_s": load_time,
+        "segment_s": segment_time,
+        "memory_mb": {key: after[key] - before.get(key, 0.0) for key in after},
+        "outputs": outputs,
+    }
+
+
+def run_bench(dictionary_path: str, index_path: str) -> None:
+    results = []
+    for mode in ("dictionary", "index"):
+        # Fresh interpreter per mode so neither run sees the other's memory or warm caches in-process
+        output = subprocess.run(
+            [sys.executable, __file__, "--measure", mode, "--dictionary", dictionary_path, "--output", index_path],
+            check=True, capture_output=True, text=True,
+        ).stdout
+        results.append(json.loads(output.splitlines()[-1]))
+
+    print(f"{'mode':>10} | {'load s':>8} | {'segment ms':>10} | {'RSS MB':>8} {'private':>8} {'shared':>8}")
+    for result in results:
+        memory = result["memory_mb"]
+        print(f"{result['mode']:>10} | {result['load_s']:>8.3f} | {result['segment_s'] * 1000:>10.1f} | "
+              f"{memory.get('VmRSS', 0):>8.1f} {memory.get('RssAnon', 0):>8.1f} {memory.get('RssFile', 0):>8.1f}")
+    same = results[0]["outputs"] == results[1]["outputs"]
+    print(f"\nSegmentation output identical: {same}")
+    if not same:
+        for phrase, a, b in zip(BENCH_PHRASES, results[0]["outputs"], results[1]["outputs"]):
+            if a != b:
+                print(f"  {phrase}: {a!r} vs {b!r}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Build or benchmark the memory-mapped SymSpell index.")
+    parser.add_argument("--dictionary", default=None, help="Frequency dictionary (term count per line).")
+    parser.add_argument("--output", "-o", default="symspell_index.bin", help="Index file to write or benchmark.")
+    parser.add_argument("--bench", action="store_true", help="Compare startup and memory with the dictionary path.")
+    parser.add_argument("--measure", choices=["dictionary", "index"], help=argparse.SUPPRESS)
+    args = parser.parse_args()
+    dictionary = args.dictionary or default_dictionary_path()
+
+    if args.measure:
+        print(json.dumps(measure_child(args.measure, dictionary, args.output)))
+    elif args.bench:
+        if not os.path.exists(args.output):
+            print(f"No index at {args.output}; build it first.")
+            sys.exit(1)
+        run_bench(dictionary, args.output)
+    else:
+        start = time.perf_counter()
+        source = SymSpell(max_dictionary_edit_distance=2, prefix_length=7)
+        if not source.load_dictionary(dictionary, term_index=0, count_index=1):
+            print(f"Could not read dictionary '{dictionary}'.")
+            sys.exit(1)
+        info = build_index(source, args.output, source=os.path.basename(dictionary))
+        print(f"Wrote {args.output}: {info['words']} words, {info['deletes']} deletes, "
+              f"{info['bytes'] / 1e6:.1f} MB in {time.perf_counter() - start:.1f}s.")
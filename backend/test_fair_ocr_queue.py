@@ -0,0 +1,52 @@
+from types import SimpleNamespace
+
+from pipeline import LatestQueue
+from sessions import FairOcrQueue
+
+
+def camera(name: str) -> SimpleNamespace:
+    # FairOcrQueue only touches a session's name and OCR queue
+    return SimpleNamespace(name=name, ocr_queue=LatestQueue(2))
+
+
+def test_sessions_are_served_round_robin():
+    work = FairOcrQueue()
+    cameras = [camera("a"), camera("b"), camera("c")]
+    for session in cameras:
+        work.add(session)
+        session.ocr_queue.put(1)
+        session.ocr_queue.put(2)
+    order = []
+    for _ in range(6):
+        session, _ = work.get(timeout=0)
+        order.append(session.name)
+        work.release(session)
+    assert order == ["a", "b", "c", "a", "b", "c"]
+    assert work.snapshot()["served"] == {"a": 2, "b": 2, "c": 2}
+
+
+def test_busy_session_is_skipped_until_released():
+    work = FairOcrQueue()
+    busy, idle = camera("busy"), camera("idle")
+    work.add(busy)
+    work.add(idle)
+    busy.ocr_queue.put(1)
+    busy.ocr_queue.put(2)
+    session, _ = work.get(timeout=0)
+    assert session is busy
+    # busy still has a frame queued, but another worker must not take it
+    assert work.get(timeout=0) is None
+    idle.ocr_queue.put(1)
+    assert work.get(timeout=0)[0] is idle
+    work.release(busy)
+    assert work.get(timeout=0)[0] is busy
+
+
+def test_old_frames_are_dropped_not_queued():
+    work = FairOcrQueue()
+    session = camera("a")
+    work.add(session)
+    for frame in range(5):
+        session.ocr_queue.put(frame)
+    assert work.get(timeout=0)[1] == 3
+    assert session.ocr_queue.dropped == 3
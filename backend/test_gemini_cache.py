@@ -0,0 +1,50 @@
+from gemini_cache import GeminiCache
+
+PROMPT = "read the text"
+
+
+def test_exact_and_near_hashes_hit():
+    cache = GeminiCache(max_distance=2)
+    cache.put(0b1010_1010, PROMPT, True, ["hello"])
+    assert cache.get(0b1010_1010, PROMPT, True) == ["hello"]
+    # Two bits off: still the same page
+    assert cache.get(0b1010_1001, PROMPT, True) == ["hello"]
+    # Three bits off: a different page
+    assert cache.get(0b1010_0101, PROMPT, True) is None
+    assert (cache.hits, cache.misses) == (2, 1)
+
+
+def test_nearest_entry_wins():
+    cache = GeminiCache(max_distance=4)
+    cache.put(0b0000, PROMPT, True, ["far"])
+    cache.put(0b0111, PROMPT, True, ["near"])
+    assert cache.get(0b1111, PROMPT, True) == ["near"]
+
+
+def test_prompt_and_structured_flag_must_match():
+    cache = GeminiCache()
+    cache.put(42, PROMPT, True, ["words"])
+    assert cache.get(42, "describe the scene", True) is None
+    assert cache.get(42, PROMPT, False) is None
+
+
+def test_lru_eviction_and_returned_lists_are_copies():
+    cache = GeminiCache(max_entries=2, max_distance=0)
+    cache.put(1, PROMPT, True, ["one"])
+    cache.put(2, PROMPT, True, ["two"])
+    cache.get(1, PROMPT, True)
+    cache.put(4, PROMPT, True, ["four"])
+    assert cache.get(2, PROMPT, True) is None
+    assert cache.evictions == 1
+    cache.get(1, PROMPT, True).append("changed")
+    assert cache.get(1, PROMPT, True) == ["one"]
+
+
+def test_entries_expire(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr("gemini_cache.time.time", lambda: now[0])
+    cache = GeminiCache(ttl=10.0)
+    cache.put(7, PROMPT, True, ["old"])
+    now[0] += 11.0
+    assert cache.get(7, PROMPT, True) is None
+    assert cache.snapshot()["size"] == 0
@@ -0,0 +1,62 @@
+import cv2
+import numpy as np
+
+from gemini_payload import PayloadShaper
+
+
+def page(width: int = 1280, height: int = 720, noise: int = 0, seed: int = 0) -> np.ndarray:
+    # White page with dark "lines" of text-like blocks; noise makes it expensive to encode
+    frame = np.full((height, width, 3), 235, dtype=np.uint8)
+    for y in range(60, height - 60, 40):
+        for x in range(60, width - 200, 90):
+            frame[y:y + 20, x:x + 70] = 30
+    if noise:
+        rng = np.random.default_rng(seed)
+        frame = np.clip(frame.astype(np.int16) + rng.integers(-noise, noise, frame.shape), 0, 255).astype(np.uint8)
+    return frame
+
+
+def box(x0: int, y0: int, x1: int, y1: int):
+    return [[x0, y0], [x1, y0], [x1, y1], [x0, y1]]
+
+
+def test_fits_budget_at_highest_quality_that_fits():
+    shaper = PayloadShaper(byte_budget=20_000)
+    frame = page(noise=20)
+    jpeg, info = shaper.shape(frame)
+    assert info["bytes"] == jpeg.size <= 20_000
+    if info["quality"] < shaper.max_quality:
+        grey = cv2.resize(cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY), (info["width"], info["height"]),
+                          interpolation=cv2.INTER_AREA)
+        above = cv2.imencode('.jpg', grey, [int(cv2.IMWRITE_JPEG_QUALITY), info["quality"] + 1])[1]
+        assert above.size > 20_000
+
+
+def test_shrinks_when_lowest_quality_is_over_budget():
+    jpeg, info = PayloadShaper(byte_budget=5_000).shape(page(noise=60))
+    assert jpeg.size <= 5_000
+    assert info["width"] < 1280
+
+
+def test_whole_frame_sent_when_it_fits():
+    shaper = PayloadShaper(byte_budget=200_000)
+    jpeg, info = shaper.shape(page(), [box(60, 60, 130, 80)])
+    assert info["source"] == "full_frame"
+    assert info["region"] == [0, 0, 1280, 720]
+    assert shaper.snapshot()["text_region_calls"] == 0
+
+
+def test_crop_only_when_budget_requires_it():
+    shaper = PayloadShaper(byte_budget=30_000)
+    boxes = [box(60, 60, 130, 80), box(150, 100, 220, 120)]
+    jpeg, info = shaper.shape(page(noise=40), boxes)
+    assert info["source"] == "text_regions"
+    assert jpeg.size <= 30_000
+    # Padded by two line heights (20 px each) around the boxes
+    assert info["region"] == [20, 20, 260, 160]
+    assert shaper.snapshot()["text_region_calls"] == 1
+
+
+def test_text_scaled_to_target_height():
+    _, info = PayloadShaper(byte_budget=500_000, target_text_height=10).shape(page(), [box(60, 60, 130, 80)])
+    assert (info["width"], info["height"]) == (640, 360)
@@ -0,0 +1,91 @@
+import math
+
+import numpy as np
+
+from layout import analyze_boxes, analyze_layout, reading_order
+
+
+def word(x0: float, y0: float, x1: float, y1: float, text: str, tilt_degrees: float = 0.0):
+    # An EasyOCR-style result: the axis-aligned bounds of the box rotated about the page origin
+    cos, sin = math.cos(math.radians(tilt_degrees)), math.sin(math.radians(tilt_degrees))
+    corners = ((x0, y0), (x1, y0), (x1, y1), (x0, y1))
+    xs = [x * cos - y * sin for x, y in corners]
+    ys = [x * sin + y * cos for x, y in corners]
+    left, top, right, bottom = int(min(xs)), int(min(ys)), int(max(xs)), int(max(ys))
+    return [[left, top], [right, top], [right, bottom], [left, bottom]], text, 1.0
+
+
+def column_page(columns: int = 1, lines: int = 12, words: int = 6, tilt_degrees: float = 0.0,
+                top: float = 20, name: str = "c"):
+    results = []
+    for column in range(columns):
+        for line in range(lines):
+            for k in range(words):
+                x = column * 500 + k * 70
+                y = top + line * 26
+                results.append(word(x, y, x + 60, y + 16, f"{name}{column}l{line}w{k}", tilt_degrees))
+    return results
+
+
+def texts(results) -> list:
+    return [text for _, text, _ in results]
+
+
+def shuffled(results: list, seed: int = 0) -> list:
+    return [results[i] for i in np.random.default_rng(seed).permutation(len(results))]
+
+
+def test_empty_input():
+    layout = analyze_layout([])
+    assert len(layout["order"]) == 0
+    assert layout["skew"] == 0.0
+
+
+def test_single_column_reads_lines_left_to_right():
+    page = column_page()
+    assert texts(reading_order(shuffled(page))) == texts(page)
+    assert analyze_layout(page)["skew"] == 0.0
+
+
+def test_two_columns_read_one_after_the_other():
+    page = column_page(columns=2)
+    layout = analyze_layout(page)
+    assert texts(reading_order(shuffled(page))) == texts(page)
+    assert sorted(set(layout["column"].tolist())) == [0, 1]
+
+
+def test_spanning_title_starts_its_own_band():
+    title = word(0, 0, 900, 14, "title")
+    page = column_page(columns=2)
+    layout = analyze_layout([title] + page)
+    assert texts(reading_order(shuffled([title] + page))) == ["title"] + texts(page)
+    assert layout["band"][0] != layout["band"][1]
+
+
+def test_paragraph_breaks_at_large_gap():
+    upper = column_page(lines=3)
+    lower = column_page(lines=3, top=200, name="p")
+    paragraph = analyze_layout(upper + lower)["paragraph"]
+    assert len(set(paragraph[:len(upper)].tolist())) == 1
+    assert len(set(paragraph[len(upper):].tolist())) == 1
+    assert paragraph[0] != paragraph[-1]
+
+
+def test_tilted_page_is_read_in_order():
+    for tilt in (-5.0, 3.0, 5.0):
+        page = column_page(columns=2, tilt_degrees=tilt)
+        layout = analyze_layout(page)
+        assert abs(math.degrees(layout["skew"]) - tilt) < 0.5
+        assert texts(reading_order(shuffled(page))) == texts(page)
+
+
+def test_small_tilt_is_left_alone():
+    page = column_page(tilt_degrees=0.1)
+    assert analyze_layout(page)["skew"] == 0.0
+
+
+def test_analyze_boxes_indexes_like_input():
+    boxes = np.array([[100, 0, 150, 10], [0, 0, 50, 10], [0, 30, 50, 40]], dtype=np.float64)
+    layout = analyze_boxes(boxes)
+    assert layout["order"].tolist() == [1, 0, 2]
+    assert layout["line"][0] == layout["line"][1] != layout["line"][2]
@@ -0,0 +1,41 @@
+from metrics import MetricsRegistry
+
+
+def collected(registry: MetricsRegistry) -> dict:
+    # {series: value} of the rendered text, comments skipped
+    lines = [line for line in registry.render().splitlines() if line and not line.startswith("#")]
+    return dict(line.rsplit(" ", 1) for line in lines)
+
+
+def test_collected_counters_get_total_suffix():
+    registry = MetricsRegistry(prefix="test")
+    registry.add_collector(lambda: {"cache": {"hits": 3, "size": 10, "calls_total": 2}},
+                           counters=["cache_hits", "cache_calls_total"])
+    text = registry.render()
+    series = collected(registry)
+    assert series["test_cache_hits_total"] == "3"
+    assert series["test_cache_size"] == "10"
+    assert series["test_cache_calls_total"] == "2"
+    assert "# TYPE test_cache_hits_total counter" in text
+    assert "# TYPE test_cache_size gauge" in text
+
+
+def test_labelled_collector_values():
+    registry = MetricsRegistry(prefix="test")
+    registry.add_collector(lambda: {"sessions": {"desk": {"capture": {"count": 5, "fps": 30.0}}}},
+                           labels={"sessions": "session"}, counters=["sessions_capture_count"])
+    series = collected(registry)
+    assert series['test_sessions_capture_count_total{session="desk"}'] == "5"
+    assert series['test_sessions_capture_fps{session="desk"}'] == "30.0"
+
+
+def test_histogram_buckets_are_cumulative():
+    registry = MetricsRegistry(prefix="test")
+    registry.describe("size", "Sizes.", buckets=(1, 10))
+    for value in (0.5, 5, 50):
+        registry.observe("size", value)
+    series = collected(registry)
+    assert series['test_size_bucket{le="1"}'] == "1"
+    assert series['test_size_bucket{le="10"}'] == "2"
+    assert series['test_size_bucket{le="+Inf"}'] == "3"
+    assert series["test_size_count"] == "3"
@@ -0,0 +1,51 @@
+import threading
+
+from result_store import ResultStore
+
+
+def test_version_moves_only_on_new_values():
+    store = ResultStore()
+    assert store.get("words", []) == (0, [])
+    assert store.publish("words", ["a"]) == 1
+    assert store.publish("words", ["a"]) == 1
+    assert store.publish("words", ["b"]) == 2
+    assert store.get("words") == (2, ["b"])
+    assert store.get("sentences", []) == (0, [])
+
+
+def test_wait_returns_on_publish():
+    store = ResultStore()
+    store.publish("words", ["a"])
+    timer = threading.Timer(0.05, store.publish, args=("words", ["b"]))
+    timer.start()
+    assert store.wait("words", since=1, timeout=5.0) == (2, ["b"])
+    timer.join()
+
+
+def test_wait_times_out_with_current_value():
+    store = ResultStore()
+    store.publish("words", ["a"])
+    assert store.wait("words", since=1, timeout=0.01) == (1, ["a"])
+
+
+def test_words_endpoint_versions_and_304():
+    # app.py only builds its sessions and routes at import; nothing starts until __main__
+    import app
+
+    session = next(iter(app.sessions.values()))
+    version = session.result_store.publish("words", [{"text": "hello", "type": "sentence"}])
+    client = app.app.test_client()
+
+    response = client.get('/data/words')
+    assert response.status_code == 200
+    assert response.get_json() == {"words": [{"text": "hello", "type": "sentence"}], "version": version}
+    assert response.headers['ETag'] == f'"words-{version}"'
+
+    assert client.get('/data/words', headers={'If-None-Match': f'"words-{version}"'}).status_code == 304
+    assert client.get(f'/data/words?since={version}').status_code == 304
+    assert client.get(f'/data/words?since={version - 1}').status_code == 200
+
+    session.result_store.publish("words", [{"text": "bye", "type": "sentence"}])
+    response = client.get('/data/words', headers={'If-None-Match': f'W/"words-{version}"'})
+    assert response.status_code == 200
+    assert response.headers['ETag'] == f'"words-{version + 1}"'
@@ -0,0 +1,68 @@
+import numpy as np
+
+from scene_change import OcrScheduler
+
+FPS = 30
+
+
+def page(seed: int) -> np.ndarray:
+    # Large blocks, so the content survives the scheduler's 64 px thumbnail
+    blocks = np.random.default_rng(seed).integers(0, 256, (6, 8), dtype=np.uint8)
+    return np.repeat(np.repeat(blocks, 60, axis=0), 60, axis=1)
+
+
+def run(scheduler: OcrScheduler, frame_at, duration: float) -> list:
+    fires = []
+    for i in range(int(duration * FPS)):
+        now = i / FPS
+        if scheduler.should_run(frame_at(now), now=now):
+            fires.append((round(now, 2), scheduler.last_reason, scheduler.scene_version))
+    return fires
+
+
+def page_turn(start: float, length: float = 0.5):
+    old, new = page(1).astype(np.float32), page(2).astype(np.float32)
+
+    def frame_at(now: float) -> np.ndarray:
+        progress = min(1.0, max(0.0, (now - start) / length))
+        return (old * (1 - progress) + new * progress).astype(np.uint8)
+    return frame_at
+
+
+def test_still_scene_fires_first_then_refreshes_without_new_scene():
+    fires = run(OcrScheduler(), lambda now: page(1), 21.0)
+    assert [reason for _, reason, _ in fires] == ["first", "max_interval", "max_interval"]
+    assert [version for _, _, version in fires] == [1, 1, 1]
+
+
+def test_page_turn_fires_changed_once_settled():
+    fires = run(OcrScheduler(), page_turn(start=3.0), 6.0)
+    assert [reason for _, reason, _ in fires] == ["first", "changed"]
+    assert fires[-1][0] > 3.5
+    assert fires[-1][2] == 2
+
+
+def test_page_turn_at_max_interval_tick_is_a_new_scene():
+    # The page starts moving 0.3 s before the periodic refresh, which fires mid-motion
+    scheduler = OcrScheduler()
+    fires = run(scheduler, page_turn(start=9.7), 12.0)
+    refresh = [fire for fire in fires if fire[1] == "max_interval"]
+    assert refresh and refresh[0][2] == 2
+    # The settled new page is still read, as a scene of its own
+    assert fires[-1][1] == "changed"
+    assert fires[-1][0] > 10.2
+    assert scheduler.scene_version == 3
+
+
+def test_refresh_during_motion_keeps_reference_for_settled_page():
+    # The page barely moved at the tick, so the refresh is not a new scene; the settled page is
+    fires = run(OcrScheduler(), page_turn(start=9.98, length=0.6), 12.0)
+    assert fires[1][1:] == ("max_interval", 1)
+    assert fires[-1][1:] == ("changed", 2)
+
+
+def test_min_interval_limits_rapid_changes():
+    scheduler = OcrScheduler(min_interval=2.0, settle_frames=1)
+    fires = run(scheduler, lambda now: page(int(now * 4)), 3.0)
+    times = [time for time, _, _ in fires]
+    assert all(later - earlier >= 2.0 for earlier, later in zip(times, times[1:]))
@@ -0,0 +1,53 @@
+import pytest
+from symspellpy.symspellpy import SymSpell, Verbosity
+
+import symspell_index
+from symspell_index import build_index, load_index
+
+WORDS = {"the": 500, "quick": 40, "brown": 30, "fox": 20, "jumps": 10, "over": 60, "lazy": 5, "dog": 25}
+
+
+@pytest.fixture
+def dictionary() -> SymSpell:
+    sym_spell = SymSpell(max_dictionary_edit_distance=2, prefix_length=7)
+    for word, count in WORDS.items():
+        sym_spell.create_dictionary_entry(word, count)
+    return sym_spell
+
+
+@pytest.fixture
+def index_path(dictionary, tmp_path) -> str:
+    path = str(tmp_path / "index.bin")
+    build_index(dictionary, path)
+    return path
+
+
+def test_mapped_index_matches_dictionary(dictionary, index_path):
+    mapped = load_index(index_path)
+    for phrase in ["quik", "brwn", "teh", "dgo", "zzzz"]:
+        expected = [(s.term, s.distance) for s in dictionary.lookup(phrase, Verbosity.CLOSEST, 2)]
+        assert [(s.term, s.distance) for s in mapped.lookup(phrase, Verbosity.CLOSEST, 2)] == expected
+    expected = dictionary.word_segmentation("thequickbrownfox").corrected_string
+    assert mapped.word_segmentation("thequickbrownfox").corrected_string == expected
+
+
+def test_mapped_words_lookups(index_path):
+    words = load_index(index_path)._words
+    assert "fox" in words and words["fox"] == 20
+    assert "cat" not in words
+    with pytest.raises(KeyError):
+        words["cat"]
+    assert sorted(words) == sorted(WORDS)
+
+
+def test_incompatible_symspellpy_is_rejected(index_path, monkeypatch):
+    monkeypatch.setattr(symspell_index, "MAPPED_ATTRIBUTES", ("_words", "_no_such_table"))
+    with pytest.raises(ValueError, match="_no_such_table"):
+        load_index(index_path)
+
+
+def test_not_an_index(tmp_path):
+    path = tmp_path / "other.bin"
+    path.write_bytes(b"not an index at all")
+    with pytest.raises(ValueError):
+        load_index(str(path))
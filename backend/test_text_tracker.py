@@ -0,0 +1,73 @@
+from text_tracker import TextTracker, locate
+
+
+def box(x: int, y: int, width: int = 100, height: int = 20):
+    return [[x, y], [x + width, y], [x + width, y + height], [x, y + height]]
+
+
+def texts(tracks) -> list:
+    return [track.text for track in tracks]
+
+
+def test_confident_line_is_emitted_at_once():
+    tracker = TextTracker()
+    assert texts(tracker.update([(box(0, 0), "hello", 0.95)], scene_version=1)) == ["hello"]
+    assert tracker.emitted_early == 1
+
+
+def test_unsure_line_on_a_new_scene_waits_for_confirmation():
+    tracker = TextTracker()
+    results = [(box(0, 0), "hello", 0.95), (box(0, 40), "wor1d", 0.3)]
+    assert texts(tracker.update(results, scene_version=1)) == ["hello"]
+    # The second reading confirms it
+    assert texts(tracker.update(results, scene_version=1)) == ["hello", "wor1d"]
+
+
+def test_votes_fuse_readings_of_one_line():
+    tracker = TextTracker()
+    tracker.update([(box(0, 0), "world", 0.9)], scene_version=1)
+    tracks = tracker.update([(box(2, 1), "wor1d", 0.4)], scene_version=1)
+    assert texts(tracks) == ["world"]
+    assert tracker.refined == 0
+
+
+def test_new_scene_resets_old_votes():
+    tracker = TextTracker()
+    for _ in range(3):
+        tracker.update([(box(0, 0), "old page", 0.9)], scene_version=1)
+    tracks = tracker.update([(box(0, 0), "new page", 0.85)], scene_version=2)
+    assert texts(tracks) == ["new page"]
+    assert tracker.scenes == 2
+
+
+def test_shifted_page_keeps_its_tracks():
+    tracker = TextTracker()
+    results = [(box(0, y), f"line {y}", 0.9) for y in range(0, 200, 40)]
+    first_ids = [track.id for track in tracker.update(results, scene_version=1)]
+    shifted = [(box(60, y + 15), text, confidence) for (_, text, confidence), y in zip(results, range(0, 200, 40))]
+    assert [track.id for track in tracker.update(shifted, scene_version=1)] == first_ids
+
+
+def test_version_moves_only_with_the_transcript():
+    tracker = TextTracker()
+    results = [(box(0, 0), "hello", 0.95)]
+    tracker.update(results, scene_version=1)
+    version = tracker.version
+    tracker.update(results, scene_version=1)
+    assert tracker.version == version
+    tracker.update([(box(0, 0), "other", 0.95)], scene_version=2)
+    assert tracker.version == version + 1
+
+
+def test_missed_track_survives_a_bad_frame():
+    tracker = TextTracker(max_missed=1)
+    tracker.update([(box(0, 0), "hello", 0.95)], scene_version=1)
+    assert texts(tracker.update([], scene_version=1)) == ["hello"]
+    assert texts(tracker.update([], scene_version=1)) == []
+
+
+def test_locate_falls_back_to_nearest_box():
+    results = [(box(0, 0), "a", 0.9), (box(0, 100), "b", 0.9)]
+    assert locate(7, box(0, 90), [3, 4], results) == 1
+    assert locate(4, None, [3, 4], results) == 1
+    assert locate(7, None, [3, 4], results) == -1
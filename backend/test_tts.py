@@ -0,0 +1,11 @@
+from tts import VOICE_PATTERN
+
+
+def test_voice_pattern_accepts_espeak_voices():
+    for voice in ["en", "en-us", "en+f3", "mb-en1", "a" * 40]:
+        assert VOICE_PATTERN.match(voice), voice
+
+
+def test_voice_pattern_rejects_options_and_junk():
+    for voice in ["", "-", "--stdout", "-w/tmp/x", "+f3", "en\n", "en us", "en;rm", "a" * 41]:
+        assert not VOICE_PATTERN.match(voice), voice
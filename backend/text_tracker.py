@@ -0,0 +1,205 @@
+from statistics import median
+from typing import Dict, List, Optional, Tuple
+
+from incremental_ocr import OcrResult, bbox_to_rect, rect_iou
+
+
+def locate(track_id: Optional[int], bbox, track_ids: List[int], results: List[OcrResult]) -> int:
+    # Index of the track in the current results; if it is gone, the box nearest to where it
+    # was last seen (so focus stays on the same spot of the page); -1 with nothing to focus
+    if track_id in track_ids:
+        return track_ids.index(track_id)
+    if bbox is None or not results:
+        return -1
+    x0, y0, x1, y1 = bbox_to_rect(bbox)
+    cx, cy = (x0 + x1) / 2, (y0 + y1) / 2
+
+    def distance(result: OcrResult) -> float:
+        rx0, ry0, rx1, ry1 = bbox_to_rect(result[0])
+        return ((rx0 + rx1) / 2 - cx) ** 2 + ((ry0 + ry1) / 2 - cy) ** 2
+    return min(range(len(results)), key=lambda i: distance(results[i]))
+
+
+class TextTrack:
+    """One physical piece of text followed across OCR passes.
+
+    Every reading of the box adds its confidence to a vote for that string; older
+    votes decay each pass, so a page that really changed wins within a pass or two
+    while a single blurry read cannot outvote text seen clearly before.
+    """
+
+    def __init__(self, track_id: int, bbox, text: str, confidence: float):
+        self.id = track_id
+        self.bbox = bbox
+        self.votes: Dict[str, float] = {}
+        self.best_confidence: Dict[str, float] = {}
+        self.hits = 0
+        self.missed = 0
+        self.emitted = False
+        self.vote(text, confidence, 1.0)
+
+    def vote(self, text: str, confidence: float, decay: float) -> None:
+        for key in self.votes:
+            self.votes[key] *= decay
+        self.votes[text] = self.votes.get(text, 0.0) + confidence
+        self.best_confidence[text] = max(self.best_confidence.get(text, 0.0), confidence)
+        self.hits += 1
+
+    @property
+    def text(self) -> str:
+        return max(self.votes, key=self.votes.get)
+
+    @property
+    def confidence(self) -> float:
+        # Share of the votes behind the winning text, times its best single reading
+        text = self.text
+        total = sum(self.votes.values())
+        return (self.votes[text] / total if total else 0.0) * self.best_confidence[text]
+
+    def result(self) -> OcrResult:
+        return self.bbox, self.text, self.confidence
+
+
+class TextTracker:
+    """Links OCR boxes across passes by IoU and fuses their text into a stable transcript.
+
+    Before matching, the page's movement since the last pass is estimated from lines
+    whose text is unchanged, so a shifted page or camera keeps its tracks. A box that
+    matches no track starts one; a track not seen this pass is dropped at once if
+    another box now covers its spot. It is emitted right away when its reading
+    is at least `early_confidence`, otherwise once it was seen `confirm_hits` times.
+    Tracks survive `max_missed` passes without a match, so text does not vanish for one
+    bad frame. `version` changes only when the emitted transcript (ids and texts) does.
+
+    All of this only holds within one scene: when the pass's scene version moves on, the
+    tracks are reset, so the old page's votes cannot hold back the new one. The first
+    pass of a scene follows the same rule as any other: its confident lines are emitted
+    at once and the rest wait for a second reading, which may be the next periodic
+    refresh.
+    """
+
+    def __init__(self, iou_threshold: float = 0.4, vote_decay: float = 0.6, early_confidence: float = 0.8,
+                 confirm_hits: int = 2, max_missed: int = 2):
+        self.iou_threshold = iou_threshold
+        self.vote_decay = vote_decay
+        self.early_confidence = early_confidence
+        self.confirm_hits = confirm_hits
+        self.max_missed = max_missed
+
+        self.version = 0
+        self.scene_version = 0
+        self.passes = 0
+        self.scenes = 0
+        self.emitted_early = 0
+        self.refined = 0
+        self.dropped = 0
+
+        self._tracks: List[TextTrack] = []
+        self._next_id = 1
+        self._transcript: Tuple[Tuple[int, str], ...] = ()
+
+    def reset(self) -> None:
+        self._tracks = []
+        self._transcript = ()
+
+    def _shift(self, results: List[OcrResult]) -> Tuple[int, int]:
+        # Median offset between boxes and the tracks that read the same text, where that text is unique
+        tracks_by_text = {}
+        for track in self._tracks:
+            tracks_by_text.setdefault(track.text.lower(), []).append(track)
+        dx, dy = [], []
+        for bbox, text, _ in results:
+            candidates = tracks_by_text.get(text.lower(), [])
+            if len(candidates) == 1:
+                x0, y0, _, _ = bbox_to_rect(bbox)
+                tx0, ty0, _, _ = bbox_to_rect(candidates[0].bbox)
+                dx.append(x0 - tx0)
+                dy.append(y0 - ty0)
+        return (int(median(dx)), int(median(dy))) if dx else (0, 0)
+
+    def _match(self, rects: List[Tuple[int, int, int, int]], shift: Tuple[int, int]) -> Dict[int, TextTrack]:
+        # Greedy, best overlap first; each box and each track is used at most once
+        candidates = []
+        for track in self._tracks:
+            x0, y0, x1, y1 = bbox_to_rect(track.bbox)
+            track_rect = (x0 + shift[0], y0 + shift[1], x1 + shift[0], y1 + shift[1])
+            for i, rect in enumerate(rects):
+                iou = rect_iou(rect, track_rect)
+                if iou >= self.iou_threshold:
+                    candidates.append((iou, i, track))
+        candidates.sort(key=lambda candidate: candidate[0], reverse=True)
+
+        matches = {}
+        used_tracks = set()
+        for _, i, track in candidates:
+            if i in matches or track.id in used_tracks:
+                continue
+            matches[i] = track
+            used_tracks.add(track.id)
+        return matches
+
+    def update(self, results: List[OcrResult], scene_version: Optional[int] = None) -> List[TextTrack]:
+        # Returns the emitted tracks, in track-creation order. scene_version is the scheduler's for the
+        # frame; None keeps tracking across whatever changed
+        self.passes += 1
+        new_scene = scene_version is not None and scene_version > self.scene_version
+        if new_scene:
+            self.scene_version = scene_version
+            self.scenes += 1
+            self.reset()
+        rects = [bbox_to_rect(bbox) for bbox, _, _ in results]
+        matches = self._match(rects, self._shift(results))
+
+        seen = set()
+        for i, (bbox, text, confidence) in enumerate(results):
+            track = matches.get(i)
+            if track is None:
+                track = TextTrack(self._next_id, bbox, text, confidence)
+                self._next_id += 1
+                self._tracks.append(track)
+            else:
+                previous_text = track.text
+                track.vote(text, confidence, self.vote_decay)
+                track.bbox = bbox
+                track.missed = 0
+                if track.emitted and track.text != previous_text:
+                    self.refined += 1
+            seen.add(track.id)
+
+        kept = []
+        for track in self._tracks:
+            if track.id not in seen:
+                track.missed += 1
+                track_rect = bbox_to_rect(track.bbox)
+                covered = any(rect_iou(track_rect, rect) > 0.1 for rect in rects)
+                if covered or track.missed > self.max_missed:
+                    self.dropped += 1
+                    continue
+            if not track.emitted:
+                if track.hits >= self.confirm_hits:
+                    track.emitted = True
+                elif track.confidence >= self.early_confidence:
+                    track.emitted = True
+                    self.emitted_early += 1
+            kept.append(track)
+        self._tracks = kept
+
+        emitted = [track for track in self._tracks if track.emitted]
+        transcript = tuple((track.id, track.text) for track in emitted)
+        if transcript != self._transcript:
+            self._transcript = transcript
+            self.version += 1
+        return emitted
+
+    def snapshot(self) -> dict:
+        tracks = list(self._tracks)
+        return {
+            "version": self.version,
+            "passes": self.passes,
+            "scenes": self.scenes,
+            "tracks": len(tracks),
+            "emitted": sum(track.emitted for track in tracks),
+            "emitted_early": self.emitted_early,
+            "refined": self.refined,
+            "dropped": self.dropped,
+        }
@@ -0,0 +1,209 @@
+import io
+import re
+import shutil
+import struct
+import subprocess
+import threading
+import time
+import wave
+from collections import OrderedDict
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Callable, Iterator, List, Optional, Tuple
+
+# (channels, sample width in bytes, frame rate)
+AudioFormat = Tuple[int, int, int]
+Audio = Tuple[AudioFormat, bytes]
+
+# Passed to espeak as the -v argument: a leading '-' would be parsed as an option, and \Z (not $)
+# keeps a trailing newline out
+VOICE_PATTERN = re.compile(r'^[A-Za-z0-9][A-Za-z0-9_+\-]{0,39}\Z')
+
+
+def read_wav(data: bytes) -> Audio:
+    # espeak writes a streaming header with a placeholder length, so read whatever frames there are
+    with wave.open(io.BytesIO(data)) as wav:
+        audio_format = (wav.getnchannels(), wav.getsampwidth(), wav.getframerate())
+        return audio_format, wav.readframes(max(wav.getnframes(), len(data)))
+
+
+def wav_stream_header(audio_format: AudioFormat) -> bytes:
+    # PCM WAV header for a stream of unknown length; players read data until the connection ends
+    channels, sample_width, frame_rate = audio_format
+    return b''.join((
+        b'RIFF', struct.pack('<I', 0xFFFFFFFF), b'WAVE',
+        b'fmt ', struct.pack('<IHHIIHH', 16, 1, channels, frame_rate, frame_rate * channels * sample_width,
+                             channels * sample_width, sample_width * 8),
+        b'data', struct.pack('<I', 0xFFFFFFFF - 36),
+    ))
+
+
+class EspeakEngine:
+    """Offline synthesis through the espeak-ng (or espeak) command line, one process per phrase.
+
+    Separate processes render phrases in parallel without sharing engine state. The
+    text goes in on stdin, so it is never parsed as options.
+    """
+
+    def __init__(self, binary: Optional[str] = None, timeout: float = 30.0):
+        self.binary = binary or shutil.which("espeak-ng") or shutil.which("espeak")
+        self.timeout = timeout
+
+    def available(self) -> bool:
+        return self.binary is not None
+
+    def synthesize(self, text: str, voice: str, rate: int) -> Audio:
+        completed = subprocess.run(
+            [self.binary, "--stdout", "-v", voice, "-s", str(rate)],
+            input=text.encode('utf-8'), capture_output=True, timeout=self.timeout, check=True,
+        )
+        return read_wav(completed.stdout)
+
+
+class AudioCache:
+    """LRU of rendered phrases keyed by (phrase, voice, rate), bounded by total PCM bytes."""
+
+    def __init__(self, max_bytes: int = 32_000_000):
+        self.max_bytes = max_bytes
+        self.bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: tuple) -> Optional[Audio]:
+        with self._lock:
+            audio = self._entries.get(key)
+            if audio is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return audio
+
+    def put(self, key: tuple, audio: Audio) -> None:
+        size = len(audio[1])
+        if size > self.max_bytes:
+            return
+        with self._lock:
+            if key in self._entries:
+                self.bytes -= len(self._entries.pop(key)[1])
+            self._entries[key] = audio
+            self.bytes += size
+            while self.bytes > self.max_bytes:
+                _, evicted = self._entries.popitem(last=False)
+                self.bytes -= len(evicted[1])
+                self.evictions += 1
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "entries": len(self._entries),
+                "mb": round(self.bytes / 1e6, 2),
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "hit_rate": round(self.hits / lookups, 3) if lookups else 0.0,
+            }
+
+
+class SpeechRenderer:
+    """Renders phrases to audio on a small pool, through the phrase cache.
+
+    `stream` submits every phrase of a page at once, in reading order, and returns one
+    WAV stream once the first phrase has rendered (or None if no phrase renders); its
+    audio goes out while the pool is still working on the rest. Concurrent requests
+    for the same phrase share one render.
+    """
+
+    def __init__(self, engine, cache: AudioCache, workers: int = 2, pause: float = 0.15,
+                 on_render: Optional[Callable[[float], None]] = None):
+        self.engine = engine
+        self.cache = cache
+        self.pause = pause
+        # Called with the seconds each phrase took to synthesize
+        self.on_render = on_render
+        self.rendered = 0
+        self.failed = 0
+
+        self._executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="tts")
+        self._inflight = {}
+        self._lock = threading.Lock()
+
+    def _render(self, key: tuple) -> Audio:
+        text, voice, rate = key
+        start_time = time.perf_counter()
+        try:
+            audio = self.engine.synthesize(text, voice, rate)
+        except Exception:
+            with self._lock:
+                self.failed += 1
+            raise
+        if self.on_render is not None:
+            self.on_render(time.perf_counter() - start_time)
+        self.cache.put(key, audio)
+        with self._lock:
+            self.rendered += 1
+        return audio
+
+    def _release(self, key: tuple, future: Future) -> None:
+        with self._lock:
+            if self._inflight.get(key) is future:
+                del self._inflight[key]
+
+    def submit(self, text: str, voice: str, rate: int) -> Future:
+        key = (" ".join(text.split()), voice, rate)
+        audio = self.cache.get(key)
+        if audio is not None:
+            future = Future()
+            future.set_result(audio)
+            return future
+        with self._lock:
+            future = self._inflight.get(key)
+            if future is not None:
+                return future
+            future = self._executor.submit(self._render, key)
+            self._inflight[key] = future
+        future.add_done_callback(lambda _: self._release(key, future))
+        return future
+
+    def stream(self, phrases: List[str], voice: str, rate: int) -> Optional[Iterator[bytes]]:
+        futures = [self.submit(phrase, voice, rate) for phrase in phrases if phrase.strip()]
+        # Renders are not cancelled when the client hangs up: other streams may share them,
+        # and a finished render still lands in the cache
+        for index, future in enumerate(futures):
+            audio = self._result(future)
+            if audio is not None:
+                return self._chunks(audio, futures[index + 1:])
+        return None
+
+    def _result(self, future: Future) -> Optional[Audio]:
+        try:
+            return future.result()
+        except Exception as e:
+            print(f"Warning: speech synthesis failed: {e}")
+            return None
+
+    def _chunks(self, first: Audio, rest: List[Future]) -> Iterator[bytes]:
+        audio_format, pcm = first
+        channels, sample_width, frame_rate = audio_format
+        silence = bytes(int(frame_rate * self.pause) * channels * sample_width)
+        yield wav_stream_header(audio_format) + pcm + silence
+        for future in rest:
+            audio = self._result(future)
+            if audio is not None and audio[0] == audio_format:
+                yield audio[1] + silence
+
+    def close(self) -> None:
+        self._executor.shutdown(wait=False, cancel_futures=True)
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            inflight = len(self._inflight)
+        return {
+            "rendered": self.rendered,
+            "failed": self.failed,
+            "inflight": inflight,
+            "cache": self.cache.snapshot(),
+        }
@@ -1,43 +1,89 @@
 "use client";
-import React, { useEffect, useState } from "react";
+import React, { useEffect, useRef, useState } from "react";
 import { useTTS } from "./TTSprovider";
 import SentenceWordToggle from "./SentenceWordToggle";
+import { onEvent, sendMessage } from "../lib/events";
 
 const Reader = ({ gesture, command }) => {
   const [useSentences, setUseSentences] = useState(false); // "words" | "sentences"
   const [items, setItems] = useState([]);
   const [currentIndex, setCurrentIndex] = useState(0);
+  // last result version seen per endpoint, so unchanged pages come back as 304
+  const versions = useRef({ words: 0, sentences: 0 });
+  // set when Open_Palm asked for a refresh, so the pushed result is spoken
+  const awaitingSpeech = useRef(false);
+  const kind = !useSentences ? "words" : "sentences";
+  // event listeners outlive renders, so they read state through this ref
+  const latest = useRef({ items, currentIndex, kind });
+  latest.current = { items, currentIndex, kind };
   const { speakText } = useTTS();
 
+  // items belong to the previous mode after a toggle, so force a full fetch
+  useEffect(() => {
+    versions.current = { words: 0, sentences: 0 };
+  }, [useSentences]);
+
+  const applyWords = (words, version, speak) => {
+    const { items, currentIndex, kind } = latest.current;
+    versions.current[kind] = version || 0;
+    const withBlank = ["", ...words, ""];
+
+    // try to preserve position
+    const oldItem = items[currentIndex];
+    let newIndex = 0;
+    if (oldItem) {
+      const foundIdx = withBlank.indexOf(oldItem);
+      if (foundIdx !== -1) {
+        newIndex = foundIdx;
+      }
+    }
+
+    setItems(withBlank);
+    setCurrentIndex(newIndex);
+    if (speak) speakText(withBlank[newIndex] || "");
+  };
+
+  // text around the fingertip, read on request and spoken right away
+  useEffect(() => onEvent((event) => {
+    if (event.type !== "roi") return;
+    if (event.status === "error") {
+      console.error("Pointer OCR failed:", event.message);
+      return;
+    }
+    speakText(event.text || "No text here");
+  }), [speakText]);
+
+  // results pushed by the backend over the event socket
+  useEffect(() => onEvent((event) => {
+    if (event.type !== "result" || event.kind !== latest.current.kind) return;
+    const speak = awaitingSpeech.current;
+    awaitingSpeech.current = false;
+
+    if (event.version <= versions.current[event.kind]) {
+      const { items, currentIndex } = latest.current;
+      if (speak) speakText(items[currentIndex] || "");
+      return;
+    }
+    applyWords(event.words, event.version, speak);
+  }), [speakText]);
+
   useEffect(() => {
     if (!gesture) return;
 
+    // fallback when the event socket is down
     const fetchItems = async () => {
   try {
-    const endpoint =
-      !useSentences
-        ? "http://localhost:5000/data/words"
-        : "http://localhost:5000/data/sentences";
+    const endpoint = `http://localhost:5000/data/${kind}?since=${versions.current[kind]}`;
 
-    const res = await fetch(endpoint);
+    const res = await fetch(endpoint, { cache: "no-store" });
+    if (res.status === 304) {
+      speakText(items[currentIndex] || "");
+      return;
+    }
     const data = await res.json();
 
     if (Array.isArray(data.words)) {
-      const withBlank = ["", ...data.words, ""];
-
-      // try to preserve position
-      const oldItem = items[currentIndex];
-      let newIndex = 0;
-      if (oldItem) {
-        const foundIdx = withBlank.indexOf(oldItem);
-        if (foundIdx !== -1) {
-          newIndex = foundIdx;
-        }
-      }
-
-      setItems(withBlank);
-      setCurrentIndex(newIndex);
-      speakText(withBlank[newIndex] || "");
+      applyWords(data.words, data.version, true);
     }
   } catch (err) {
     console.error("Failed to fetch items:", err);
@@ -47,7 +93,11 @@ const Reader = ({ gesture, command }) => {
 
 
     if (gesture === "Open_Palm") {
-      fetchItems();
+      awaitingSpeech.current = true;
+      if (!sendMessage({ type: "refresh", kind })) {
+        awaitingSpeech.current = false;
+        fetchItems();
+      }
     }
   }, [gesture, useSentences, speakText]);
 
@@ -2,6 +2,7 @@
 import React, { useRef, useEffect, useState } from "react";
 import { GestureRecognizer, FilesetResolver } from "@mediapipe/tasks-vision";
 import Reader from "./components/Reader";
+import { readAtPoint, sendCommand } from "./lib/commands";
 
 // Distance between two landmarks
 const distance = (a, b) => Math.hypot(a.x - b.x, a.y - b.y);
@@ -11,27 +12,6 @@ const isFingerExtended = (landmarks, tipIndex, baseIndex = 0) => {
   return distance(landmarks[tipIndex], landmarks[0]) > distance(landmarks[baseIndex], landmarks[0]);
 };
 
-const FLASK_API_URL = "http://localhost:5000/data";
-
-function sendCommand(commandKey) {
-  fetch(FLASK_API_URL, {
-    method: "POST",
-    headers: {
-      "Content-Type": "application/json",
-    },
-    body: JSON.stringify({
-      key: commandKey,
-    }),
-  })
-    .then((response) => response.json())
-    .then((data) => {
-      console.log("Command sent successfully. Server response:", data);
-    })
-    .catch((error) => {
-      console.error("Error connecting to Flask API:", error);
-    });
-}
-
 // Example: Call this function when the user presses a button
 // sendCommand('c');
 
@@ -154,6 +134,8 @@ const GestureCamera = ({ speechCommand }) => {
   const [stableGesture, setStableGesture] = useState("No Gesture");
   const gestureBuffer = useRef([]);
   const BUFFER_SIZE = 100;
+  // latest index fingertip, in the un-mirrored camera frame (0 to 1)
+  const fingertip = useRef(null);
 
   // Initialize GestureRecognizer Model
   useEffect(() => {
@@ -233,6 +215,8 @@ const GestureCamera = ({ speechCommand }) => {
           results.landmarks.forEach((landmarks, index) => {
             drawConnectors(ctx, landmarks, HAND_CONNECTIONS, "#000000");
             drawLandmarks(ctx, landmarks);
+            // recognition ran on the mirrored frame, so flip x back
+            fingertip.current = { x: 1 - landmarks[8].x, y: landmarks[8].y };
 
             // Display the recognized gesture label
             let detectedGesture = results.gestures[index][0]?.categoryName || "No Gesture";
@@ -329,6 +313,10 @@ const GestureCamera = ({ speechCommand }) => {
       setBlink(true);
       setTimeout(() => setBlink(false), 300);
     }
+    // read what the fingertip points at
+    else if (stableGesture === "O_Shape" && fingertip.current) {
+      readAtPoint(fingertip.current.x, fingertip.current.y);
+    }
     else {
       sendCommand(key);
     }
@@ -1,7 +1,11 @@
+import { sendMessage } from "./events"
 
 const FLASK_API_URL = "http://localhost:5000/data"
 
 export function sendCommand(commandKey) {
+  // the ack comes back as an event on the same socket
+  if (sendMessage({ type: "command", key: commandKey })) return
+
   fetch(FLASK_API_URL, {
     method: "POST",
     headers: {
@@ -19,3 +23,23 @@ export function sendCommand(commandKey) {
       console.error("Error connecting to Flask API:", error);
     });
 }
+
+// Asks the backend to read the text around a point of the camera frame (x, y from 0 to 1).
+// The text comes back as a "roi" event on the event socket, or as the HTTP response.
+export function readAtPoint(x, y) {
+  const point = { x: Math.min(1, Math.max(0, x)), y: Math.min(1, Math.max(0, y)) }
+  if (sendMessage({ type: "roi", ...point })) return Promise.resolve(null)
+
+  return fetch(`${FLASK_API_URL}/roi`, {
+    method: "POST",
+    headers: {
+      "Content-Type": "application/json",
+    },
+    body: JSON.stringify(point),
+  })
+    .then((response) => response.json())
+    .catch((error) => {
+      console.error("Error connecting to Flask API:", error);
+      return null
+    });
+}
@@ -0,0 +1,41 @@
+const EVENTS_WS_URL = "ws://localhost:5000/ws"
+const RECONNECT_DELAY_MS = 2000
+
+let socket = null
+const listeners = new Set()
+
+function connect() {
+  if (typeof window === "undefined" || socket) return
+
+  socket = new WebSocket(EVENTS_WS_URL)
+  socket.onmessage = (message) => {
+    let event
+    try {
+      event = JSON.parse(message.data)
+    } catch (error) {
+      console.error("Invalid event from Flask API:", error)
+      return
+    }
+    listeners.forEach((listener) => listener(event))
+  }
+  socket.onclose = () => {
+    socket = null
+    if (listeners.size > 0) setTimeout(connect, RECONNECT_DELAY_MS)
+  }
+  socket.onerror = () => socket && socket.close()
+}
+
+// Subscribe to backend events (result, ocr, focus, ack). Returns an unsubscribe function.
+export function onEvent(listener) {
+  listeners.add(listener)
+  connect()
+  return () => listeners.delete(listener)
+}
+
+// Sends a message over the event socket. Returns false if it is not connected.
+export function sendMessage(message) {
+  connect()
+  if (!socket || socket.readyState !== WebSocket.OPEN) return false
+  socket.send(JSON.stringify(message))
+  return true
+}
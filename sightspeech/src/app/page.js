@@ -72,7 +72,7 @@ export default function Page() {
           <div/>
             <div className="mx-auto w-[45%] h-[40%] border-10 rounded-3xl m-5 items-center">
                 <img
-                  src="http://localhost:5000/video_feed"
+                  src="http://localhost:5000/video_feed?quality=auto"
                   alt="MJPEG stream"
                   style={{ width: '100%', height: 'auto' }}
                 />